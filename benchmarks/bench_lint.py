@@ -0,0 +1,35 @@
+"""
+Benchmark of the 'lint' navigation tree validation on a large synthetic tree.
+
+Usage:
+  python -m benchmarks.bench_lint [<fan-out>] [<depth>]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from handbook_tools.lib.navigation_tree_linter import NavigationTreeLinter
+from handbook_tools.lib.yaml_backend import YamlBackend
+from benchmarks.synthetic_site import create_site
+
+def run(fan_out=46, depth=3):
+    """"""
+    with tempfile.TemporaryDirectory() as site_root:
+        nodes_count = create_site(site_root, fan_out, depth, with_metadata=False)
+        root_config_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+        start = time.perf_counter()
+        tree = YamlBackend.default().load_file(root_config_filename)
+        load_elapsed = time.perf_counter() - start
+
+    linter = NavigationTreeLinter(tree)
+    start = time.perf_counter()
+    errors = linter.lint()
+    lint_elapsed = time.perf_counter() - start
+
+    print('nodes: {}, errors: {}'.format(nodes_count, len(errors)))
+    print('  load {:8.3f} s'.format(load_elapsed))
+    print('  lint {:8.3f} s'.format(lint_elapsed))
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,40 @@
+"""
+Benchmark of the navigation template rendering throughput, through Jinja2 and
+through the specialized string builder of FastTemplate.
+
+Usage:
+  python -m benchmarks.bench_templates [<renders>]
+"""
+
+import os
+import sys
+import time
+from handbook_tools.lib.fast_template import FastTemplate
+from benchmarks.synthetic_site import FIXTURE_SITE
+
+def run(renders=100000):
+    """"""
+    template_filename = os.path.join(FIXTURE_SITE, 'config', 'templates',
+                                     'navigation-file-template.j2')
+    with open(template_filename) as template_file:
+        fast_template = FastTemplate(template_file.read())
+
+    # a mix of index files with and without metadata
+    contexts = [{'title': 'Node {}'.format(i), 'intro': 'Introduction to node {}.\n'.format(i),
+                 'contents': ['[Child {}](/Handbook/Child%20{})'.format(j, j)
+                              for j in range(i % 8)],
+                 'guides': ['[Guide {}](/Guides/Guide%20{})'.format(i, i)] if i % 2 else [],
+                 'topics': ['[Topic {}](/Topics/Topic%20{})'.format(i, i)] if i % 3 else []}
+                for i in range(100)]
+
+    print('renders: {}, compiled: {}'.format(renders, fast_template.is_compiled))
+    for name, render in [('jinja2', fast_template.template.render),
+                         ('fast', fast_template.render)]:
+        start = time.perf_counter()
+        for i in range(renders):
+            render(**contexts[i % len(contexts)])
+        elapsed = time.perf_counter() - start
+        print('  {:<7} {:8.3f} s {:10.0f} renders/s'.format(name, elapsed, renders / elapsed))
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]])
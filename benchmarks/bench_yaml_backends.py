@@ -0,0 +1,41 @@
+"""
+Benchmark of the YAML backends loading a large synthetic navigation tree and
+its metadata files.
+
+Usage:
+  python -m benchmarks.bench_yaml_backends [<fan-out>] [<depth>]
+"""
+
+import os
+import sys
+import time
+import tempfile
+from handbook_tools.lib.yaml_backend import YamlBackend
+from benchmarks.synthetic_site import create_site
+
+def run(fan_out=20, depth=3):
+    """"""
+    with tempfile.TemporaryDirectory() as site_root:
+        nodes_count = create_site(site_root, fan_out, depth)
+        root_config_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+        metadata_path = os.path.join(site_root, 'config', 'metadata')
+        metadata_filenames = [os.path.join(metadata_path, filename)
+                              for filename in sorted(os.listdir(metadata_path))]
+
+        print('nodes: {}, metadata files: {}'.format(nodes_count, len(metadata_filenames)))
+        print('  {:<8} {:>10} {:>10}'.format('backend', 'root.yml', 'metadata'))
+        for name in YamlBackend.available_names():
+            yaml_backend = YamlBackend(name)
+            start = time.perf_counter()
+            yaml_backend.load_file(root_config_filename)
+            tree_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for metadata_filename in metadata_filenames:
+                yaml_backend.load_file(metadata_filename)
+            metadata_elapsed = time.perf_counter() - start
+
+            print('  {:<8} {:8.3f} s {:8.3f} s'.format(name, tree_elapsed, metadata_elapsed))
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,57 @@
+"""
+Generates synthetic handbook sites for the benchmarks.
+"""
+
+import os
+import shutil
+
+FIXTURE_SITE = os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'site')
+
+def create_site(site_root, fan_out=10, depth=3, with_metadata=True):
+    """
+    Create a synthetic site with a complete navigation tree under site_root.
+
+    The tree has fan_out children per node and the given depth below the root
+    node. Return the number of nodes in the navigation tree.
+    """
+    for dirname in ['Guides', 'Topics', 'config/navigation', 'config/metadata']:
+        os.makedirs(os.path.join(site_root, dirname), exist_ok=True)
+    templates_path = os.path.join(site_root, 'config', 'templates')
+    shutil.rmtree(templates_path, ignore_errors=True)
+    shutil.copytree(os.path.join(FIXTURE_SITE, 'config', 'templates'), templates_path)
+
+    lines = ['Handbook:']
+    nodes_count = 1 + _append_children(lines, 'Node', fan_out, depth, 1)
+    with open(os.path.join(site_root, 'config', 'navigation', 'root.yml'), 'w') as root_file:
+        root_file.write('\n'.join(lines) + '\n')
+
+    if with_metadata:
+        _create_metadata(site_root, lines)
+
+    return nodes_count
+
+def _append_children(lines, prefix, fan_out, depth, level):
+    """"""
+    count = 0
+    for i in range(fan_out):
+        name = '{} {}'.format(prefix, i + 1)
+        indent = '  ' * level
+        if level < depth:
+            lines.append('{}- {}:'.format(indent, name))
+            count += _append_children(lines, name, fan_out, depth, level + 1)
+        else:
+            lines.append('{}- {}'.format(indent, name))
+        count += 1
+
+    return count
+
+def _create_metadata(site_root, lines):
+    """Create a metadata file for every other node"""
+    for i, line in enumerate(lines[1::2]):
+        name = line.strip(' -:')
+        node_id = name.lower().replace(' ', '-')
+        metadata_filename = os.path.join(site_root, 'config', 'metadata', node_id + '.yml')
+        with open(metadata_filename, 'w') as metadata_file:
+            metadata_file.write('intro: |\n  Introduction to {}.\n'.format(name))
+            metadata_file.write('guides:\n  - Group {}/Guide {}\n'.format(i % 7, i))
+            metadata_file.write('topics:\n  - Topic {}\n'.format(i % 13))
@@ -5,14 +5,32 @@ This module builds the Handbook from configuration files.
 """
 
 import os
+import re
+import sys
+import shutil
+from collections import OrderedDict
 from urllib.request import pathname2url
-from jinja2 import Template
-import yaml
 from handbook_tools.lib.command_base import CommandBase
+from handbook_tools.lib.file_writer import FileWriter
+from handbook_tools.lib.async_file_writer import AsyncFileWriter
+from handbook_tools.lib.archive_writer import ArchiveWriter
+from handbook_tools.lib.memory_writer import MemoryWriter
+from handbook_tools.lib.fragment_cache import FragmentCache
+from handbook_tools.lib.build_state import BuildState
+from handbook_tools.lib.build_manifest import BuildManifest
+from handbook_tools.lib.build_lock import BuildLock
+from handbook_tools.lib.null_context import NullContext
+from handbook_tools.lib.staged_output import StagedOutput
+from handbook_tools.lib.content_extractor import ContentExtractor
+from handbook_tools.lib.fast_template import FastTemplate
+from handbook_tools.lib.file_cache import FileCache
+from handbook_tools.lib.yaml_backend import YamlBackend
+from handbook_tools.lib.handbook_validation import HandbookValidation
 from handbook_tools.lib.navigation_tree import NavigationTree
 from handbook_tools.lib.navigation_tree_node import NavigationTreeNode
+from handbook_tools.lib.navigation_tree_diff import NavigationTreeDiff
 
-__version__ = '1.1.8'
+__version__ = '1.13.4'
 
 class Build(CommandBase):
     """
@@ -26,6 +44,21 @@ class Build(CommandBase):
       --version         Show the version and exit
       --no-stop         Ignore 'stop' tags to scan the entire tree
       -f, --force       Overwrite existing target directory
+      --io=MODE         Output I/O backend: 'sync' or 'async' [default: sync]
+      --output-format=FORMAT
+                        Output format: 'dir', 'tar', 'zip' or 'memory' [default: dir]
+      -o, --output=FILE
+                        Output archive file relative to site root
+      --cache=DIR       Cache rendered fragments in DIR relative to site root
+      --incremental     Only update what changed since the last build (requires --cache)
+      --titles          Use the titles of guides and topics as their link text
+      --subtree=NODE    Only build the subtree of the node of id or path NODE
+      --plan            Plan a sharded build, writing its work manifest
+      --shards=COUNT    Number of shards of a planned build [default: 2]
+      --shard=I/N       Build shard I of N of the planned build into its staging directory
+      --merge           Merge the built shards into the Handbook
+      --manifest=FILE   Work manifest of a sharded build relative to site root
+                        [default: .shards/manifest.json]
 
     Examples:
       handbook build -h
@@ -33,8 +66,25 @@ class Build(CommandBase):
       handbook build
       handbook --root=tests/fixtures/site build
       handbook build --no-stop
+      handbook build --io=async
+      handbook build --output-format=tar -o handbook.tar
+      handbook build -f --cache=.cache
+      handbook build --incremental --cache=.cache
+      handbook build -f --titles
+      handbook build -f --subtree=development
+      handbook build -f --subtree=Handbook/Development
+      handbook build --plan --shards=4
+      handbook build --shard=1/4
+      handbook build -f --merge
     """
 
+    # output I/O backends selectable with the '--io' option
+    writers = {'sync': FileWriter, 'async': AsyncFileWriter}
+    # output formats selectable with the '--output-format' option
+    output_formats = ['dir', 'memory'] + ArchiveWriter.formats
+    # loaded template and metadata files, shared by all the instances
+    file_cache = FileCache()
+
     def __init__(self, command_args=None, global_args=None):
         """"""
         super().__init__(command_args, global_args, version=__version__)
@@ -45,20 +95,144 @@ class Build(CommandBase):
         self.metadata_path = 'config/metadata/'
         # path to template files
         self.templates_path = 'config/templates/'
+        # persisted rendered fragments, under the optional cache directory
+        self.fragment_cache_filename = 'fragments.json'
+        # persisted state of the last build, under the optional cache directory
+        self.build_state_filename = 'navigation.json'
+        # persisted contents of guides and topics, under the optional cache directory
+        self.content_cache_filename = 'content.json'
+        # advisory lock file serializing the builds of the site
+        self.lock_filename = '.handbook.lock'
+        # optional authored guide and topic files, by link path
+        self.linked_paths = {'/Guides': 'Guides/', '/Topics': 'Topics/'}
         # Jinja2 template file for the navigation files
         self.navigation_file_template = 'navigation-file-template.j2'
         self._process_args()
         self.navigation_tree = None
+        # located subtree of the built node, when building a single subtree
+        self.subtree = None
+        self.writer = None
+        # output directory built in a staging directory, for the dir output format
+        self.staged_output = None
+        self.fragment_cache = None
+        self.build_state = None
+        # titles of guides and topics by link path, when used as link text
+        self.item_titles = None
+        # compiled navigation tree (see NavigationTreeDiff) of the visited nodes
+        self.compiled_nodes = OrderedDict()
+        # node performer arguments of the visited nodes by node path
+        self.visited_nodes = {}
 
     def execute(self):
         """Entry point for the execution of this sub-command"""
+        with self.metrics.phase('load'):
+            self.navigation_tree = NavigationTree(self.site_root, self.verbose, self.no_stop)
+
+        if self.plan:
+            with self.metrics.phase('plan'):
+                self._plan_shards()
+        elif self.merge:
+            with self._build_lock(), self.metrics.phase('merge'):
+                self._merge_shards()
+        else:
+            with self._build_lock():
+                self._execute_build()
+
+        self.metrics.count('nodes_visited', self.navigation_tree.visited_nodes_count)
+        self.metrics.count('stopped_subtrees_skipped',
+                           self.navigation_tree.stopped_subtrees_count)
+
+    def _execute_build(self):
+        """Build the whole tree, a subtree or a shard"""
+        with self.metrics.phase('load'):
+            self.subtree = self._init_subtree()
+            self.fragment_cache = self._init_fragment_cache()
+            self.build_state = self._init_build_state()
+            self.item_titles = self._init_item_titles()
+
+        with self.metrics.phase('build'):
+            if self.shard is not None:
+                self._build_shard()
+            elif not (self.incremental and self._execute_incremental()):
+                self.writer = self._init_writer()
+                self.navigation_tree.scan(self.node_performer, self.subtree)
+                self.writer.close()
+                if self.staged_output is not None:
+                    self.staged_output.commit()
+
+        with self.metrics.phase('save'):
+            if self.build_state is not None:
+                self._save_build_state()
+
+            if self.fragment_cache is not None:
+                self.fragment_cache.save()
+                print('Fragment cache: {} hits, {} misses'.format(self.fragment_cache.hits,
+                                                                 self.fragment_cache.misses))
+                self.metrics.count('fragment_cache_hits', self.fragment_cache.hits)
+                self.metrics.count('fragment_cache_misses', self.fragment_cache.misses)
+
+    def _build_lock(self):
+        """Return the lock serializing the builds changing the site, but for shards"""
+        if self.shard is not None:
+            return NullContext()
+
+        return BuildLock(os.path.join(self.site_root, self.lock_filename))
+
+    def render_node(self, key):
+        """
+        Return the index file contents of a single node, without writing it.
+
+        key (str): the node id, or the node path relative to the site root
+        (e.g., 'Handbook/Development')
+
+        Return None if no node of the built tree matches key.
+        """
+        node = self.find_node(key)
+        if node is None:
+            return None
+
+        return self.render_index(node)
+
+    def find_node(self, key):
+        """
+        Return the node performer arguments of the built node matching key, or None.
+
+        The navigation tree is loaded again if its configuration file changed.
+        """
         self.navigation_tree = NavigationTree(self.site_root, self.verbose, self.no_stop)
-        self.navigation_tree.fail_on_existing_root_node_dir(self.force)
-        self.navigation_tree.scan(self.node_performer)
+        subtree = self.navigation_tree.find_subtree(key)
+        if subtree is None:
+            return None
+
+        visited_nodes = []
+        self.navigation_tree.visit(lambda *args: visited_nodes.append(args), subtree)
+
+        return visited_nodes[0]
+
+    def root_node_name(self):
+        """Return the name of the root node of the navigation tree"""
+        return NavigationTree(self.site_root, self.verbose, self.no_stop).root_node_name()
+
+    def render_index(self, node):
+        """Return the index file contents of a node returned by find_node()"""
+        root_path, root_options, root_children_nodes = node
+        root_name = os.path.basename(root_path)
+
+        return self._render_index_file(root_path, root_options, root_name, root_children_nodes)
+
+    def index_dependencies(self, node):
+        """Return the files the index file of a node returned by find_node() is rendered from"""
+        _, root_options, _ = node
+
+        return [self.navigation_tree.tree_config_full_filename(),
+                os.path.join(self.site_root, self.templates_path, self.navigation_file_template),
+                self._metadata_full_filename(root_options)]
 
     def node_performer(self, root_path, root_options, root_children_nodes):
         """Custom performer executed for each visited node"""
-        os.mkdir(root_path)
+        if self.build_state is not None:
+            self._compile_node(root_path, root_options, root_children_nodes)
+        self.writer.make_dir(os.path.relpath(root_path, self.site_root))
         root_name = os.path.basename(root_path)
         self._create_index_file(root_path, root_options, root_name, root_children_nodes)
 
@@ -67,60 +241,447 @@ class Build(CommandBase):
         # default values not set by docopt were set in CommandBase
         self.no_stop = self.args['--no-stop']
         self.force = self.args['--force']
+        self.io_mode = self.args['--io']
+        if self.io_mode not in self.writers:
+            print('Error: Unknown I/O backend: {}'.format(self.io_mode))
+            sys.exit()
+        self.output_format = self.args['--output-format']
+        if self.output_format not in self.output_formats:
+            print('Error: Unknown output format: {}'.format(self.output_format))
+            sys.exit()
+        self.output_filename = self.args['--output']
+        self.cache_path = self.args['--cache']
+        self.titles = self.args['--titles']
+        self.incremental = self.args['--incremental']
+        if self.incremental and (self.cache_path is None or self.output_format != 'dir'):
+            print('Error: Incremental builds require --cache and the dir output format')
+            sys.exit()
+        self.subtree_key = self.args['--subtree']
+        if self.incremental and self.subtree_key is not None:
+            print('Error: Incremental builds of a subtree are not supported')
+            sys.exit()
+        self._process_sharding_args()
+
+    def _process_sharding_args(self):
+        """Process the command_args of sharded builds"""
+        self.plan = self.args['--plan']
+        self.merge = self.args['--merge']
+        self.manifest_filename = self.args['--manifest']
+        self.shard = None
+        if self.args['--shard'] is not None:
+            match = re.match(r'^(\d+)/(\d+)$', self.args['--shard'])
+            if match is None or not 1 <= int(match.group(1)) <= int(match.group(2)):
+                print('Error: Invalid shard: {}'.format(self.args['--shard']))
+                sys.exit()
+            self.shard = (int(match.group(1)), int(match.group(2)))
+        try:
+            self.shards_count = int(self.args['--shards'])
+        except ValueError:
+            self.shards_count = 0
+        if self.shards_count < 1:
+            print('Error: Invalid number of shards: {}'.format(self.args['--shards']))
+            sys.exit()
+
+        is_sharded = self.plan or self.merge or self.shard is not None
+        if [self.plan, self.merge, self.shard is not None].count(True) > 1 or \
+           (is_sharded and (self.incremental or self.subtree_key is not None or
+                            self.output_format != 'dir')):
+            print('Error: Sharded builds support a single step and the dir output format')
+            sys.exit()
+
+    def _execute_incremental(self):
+        """
+        Update the output of the last build in place.
+
+        Return False if a full build is required instead.
+        """
+        previous_nodes = self.build_state.load(self._environment_signature())
+        root_path = os.path.join(self.site_root, self.navigation_tree.root_node_name())
+        if previous_nodes is None or not os.path.isdir(root_path):
+            return False
+
+        self.navigation_tree.scan(self._compile_node)
+        diff = NavigationTreeDiff(previous_nodes, self.compiled_nodes)
+        if diff.conflict:
+            self.compiled_nodes = OrderedDict()
+            return False
+
+        for action, path, target in diff.changes:
+            full_path = os.path.join(self.site_root, path)
+            if action == 'create':
+                os.mkdir(full_path)
+            elif action == 'rename':
+                os.rename(full_path, os.path.join(self.site_root, target))
+            else:
+                shutil.rmtree(full_path)
+
+        self.writer = self.writers[self.io_mode](self.site_root)
+        for path in diff.renders:
+            root_path, root_options, root_children_nodes = self.visited_nodes[path]
+            root_name = os.path.basename(root_path)
+            self._create_index_file(root_path, root_options, root_name, root_children_nodes)
+        self.writer.close()
+        self.metrics.count('files_skipped', len(self.compiled_nodes) - len(diff.renders))
+
+        print('Incremental build: {} created, {} renamed, {} deleted, {} rendered'. \
+              format(diff.count('create'), diff.count('rename'), diff.count('delete'),
+                     len(diff.renders)))
+
+        return True
+
+    def _plan_shards(self):
+        """Split the built nodes into balanced shards and write the work manifest"""
+        nodes = self._built_node_paths()
+        manifest_full_filename = os.path.join(self.site_root, self.manifest_filename)
+        os.makedirs(os.path.dirname(manifest_full_filename), exist_ok=True)
+        manifest = BuildManifest(manifest_full_filename)
+        manifest.plan(nodes, self.shards_count, self._tree_signature(nodes))
+        manifest.save()
+
+        print('Planned {} nodes in {} shards: {} nodes'. \
+              format(len(nodes), self.shards_count,
+                     ', '.join(str(len(shard['nodes'])) for shard in manifest.shards)))
+
+    def _build_shard(self):
+        """Build the nodes of a single shard into its staging directory"""
+        manifest = self._load_manifest()
+        shard_index, shards_count = self.shard
+        if shards_count != len(manifest.shards):
+            print('Error: The build was planned in {} shards'.format(len(manifest.shards)))
+            sys.exit()
+
+        staging_full_path = self._staging_full_path(shard_index)
+        shutil.rmtree(staging_full_path, ignore_errors=True)
+        os.makedirs(staging_full_path)
+
+        shard = manifest.shards[shard_index - 1]
+        shard_nodes = set(shard['nodes'])
+        self.writer = self.writers[self.io_mode](staging_full_path)
+        for path, is_subtree in shard['units']:
+            # parents of the unit built by other shards are merged from their staging directories
+            parent_path = os.path.dirname(path)
+            if parent_path and parent_path not in shard_nodes:
+                os.makedirs(os.path.join(staging_full_path, parent_path), exist_ok=True)
+            subtree = self.navigation_tree.find_subtree(path)
+            if is_subtree:
+                self.navigation_tree.scan(self.node_performer, subtree)
+            else:
+                self.navigation_tree.visit(self.node_performer, subtree)
+        self.writer.close()
+
+    def _merge_shards(self):
+        """Move the index files of all the built shards into the Handbook"""
+        manifest = self._load_manifest()
+        for shard_index, shard in enumerate(manifest.shards, 1):
+            staging_full_path = self._staging_full_path(shard_index)
+            missing_nodes = [path for path in shard['nodes']
+                             if not os.path.isfile(os.path.join(staging_full_path, path,
+                                                                self.navigation_filename))]
+            if missing_nodes:
+                print('Error: Shard {} is incomplete: {} of {} nodes missing'. \
+                      format(shard_index, len(missing_nodes), len(shard['nodes'])))
+                sys.exit()
+
+        self.staged_output = self._init_staged_output(self.navigation_tree.root_node_name())
+        staging_root = self.staged_output.staging_root
+        for shard_index, shard in enumerate(manifest.shards, 1):
+            staging_full_path = self._staging_full_path(shard_index)
+            for path in shard['nodes']:
+                os.makedirs(os.path.join(staging_root, path), exist_ok=True)
+                os.replace(os.path.join(staging_full_path, path, self.navigation_filename),
+                           os.path.join(staging_root, path, self.navigation_filename))
+                self.metrics.count('files_merged')
+        self.staged_output.commit()
+        for shard_index in range(1, len(manifest.shards) + 1):
+            shutil.rmtree(self._staging_full_path(shard_index))
+
+    def _load_manifest(self):
+        """Load the work manifest, making sure it matches the current navigation tree"""
+        manifest_full_filename = os.path.join(self.site_root, self.manifest_filename)
+        HandbookValidation.fail_on_nonexisting_path(manifest_full_filename,
+                                                    'Manifest file does not exist')
+        manifest = BuildManifest(manifest_full_filename)
+        if not manifest.load():
+            print('Error: Invalid manifest file: {}'.format(manifest_full_filename))
+            sys.exit()
+        if manifest.signature != self._tree_signature(self._built_node_paths()):
+            print('Error: The navigation tree changed since the build was planned')
+            sys.exit()
+
+        return manifest
+
+    def _built_node_paths(self):
+        """Return the paths of all the built nodes relative to the site root, in pre-order"""
+        nodes = []
+        self.navigation_tree.scan(lambda root_path, *_: \
+                                  nodes.append(os.path.relpath(root_path, self.site_root)))
+
+        return nodes
+
+    def _tree_signature(self, nodes):
+        """"""
+        return BuildState.signature(self.no_stop, nodes)
+
+    def _staging_full_path(self, shard_index):
+        """"""
+        manifest_full_filename = os.path.join(self.site_root, self.manifest_filename)
+
+        return os.path.join(os.path.dirname(manifest_full_filename),
+                            'shard-{}'.format(shard_index))
+
+    def _compile_node(self, root_path, root_options, root_children_nodes):
+        """Add the visited node to the compiled navigation tree"""
+        path = os.path.relpath(root_path, self.site_root)
+        metadata_stamp = BuildState.file_stamp(self._metadata_full_filename(root_options))
+        signature = BuildState.signature(path, root_options['id'], root_children_nodes,
+                                         metadata_stamp)
+        self.compiled_nodes[path] = {'id': root_options['id'], 'signature': signature}
+        self.visited_nodes[path] = (root_path, root_options, root_children_nodes)
+
+    def _environment_signature(self):
+        """Return a signature of everything all the index files depend on"""
+        template_full_filename = os.path.join(self.site_root, self.templates_path,
+                                              self.navigation_file_template)
+
+        return BuildState.signature(BuildState.file_stamp(template_full_filename), self.no_stop,
+                                    self.item_titles)
+
+    def _init_writer(self):
+        """Create the writer of the build output for the selected output format"""
+        if self.output_format == 'dir':
+            output_path = self.navigation_tree.root_node_name()
+            if self.subtree is not None:
+                output_path = os.path.relpath(self.navigation_tree.subtree_path(self.subtree),
+                                              self.site_root)
+            self.staged_output = self._init_staged_output(output_path)
+            return self.writers[self.io_mode](self.staged_output.staging_root)
+
+        if self.output_format == 'memory':
+            return MemoryWriter()
+
+        output_filename = self.output_filename
+        if output_filename is None:
+            root_name = self.navigation_tree.root_node_name()
+            output_filename = '{}.{}'.format(root_name, self.output_format)
+        output_full_filename = os.path.join(self.site_root, output_filename)
+        if not self.force:
+            warning_message = 'Target archive already exists'
+            HandbookValidation.confirm_or_fail_on_existing_path(output_full_filename,
+                                                                warning_message)
+
+        return ArchiveWriter(output_full_filename, self.output_format)
+
+    def _init_staged_output(self, path):
+        """Create the staging directory of the output directory at path (relative to site root)"""
+        if not self.force:
+            warning_message = 'Target directory already exists'
+            HandbookValidation.confirm_or_fail_on_existing_path(os.path.join(self.site_root, path),
+                                                                warning_message)
+
+        staged_output = StagedOutput(self.site_root, path)
+        staged_output.create()
+
+        return staged_output
+
+    def _init_subtree(self):
+        """Locate the subtree of the built node, when building a single subtree"""
+        if self.subtree_key is None:
+            return None
+
+        subtree = self.navigation_tree.find_subtree(self.subtree_key)
+        if subtree is None:
+            print('Error: Unknown node: {}'.format(self.subtree_key))
+            sys.exit()
+
+        # the rest of the tree is left untouched, so the parent directory must exist
+        parent_path, _ = subtree
+        if self.output_format == 'dir' and not os.path.isdir(parent_path):
+            print('Error: Parent directory does not exist: {}'.format(parent_path))
+            sys.exit()
+
+        return subtree
+
+    def _init_fragment_cache(self):
+        """Create the optional cache of rendered fragments"""
+        if self.cache_path is None:
+            return None
+
+        cache_full_path = os.path.join(self.site_root, self.cache_path)
+        os.makedirs(cache_full_path, exist_ok=True)
+
+        return FragmentCache(os.path.join(cache_full_path, self.fragment_cache_filename))
+
+    def _init_item_titles(self):
+        """Extract the titles of all the guides and topics, if used as link text"""
+        if not self.titles:
+            return None
+
+        cache_filename = None
+        if self.cache_path is not None:
+            cache_full_path = os.path.join(self.site_root, self.cache_path)
+            os.makedirs(cache_full_path, exist_ok=True)
+            cache_filename = os.path.join(cache_full_path, self.content_cache_filename)
+        content_extractor = ContentExtractor(cache_filename)
+
+        link_paths = {}
+        for link_root, authored_path in self.linked_paths.items():
+            authored_full_path = os.path.join(self.site_root, authored_path)
+            for path, _, filenames in os.walk(authored_full_path):
+                for filename in filenames:
+                    name, extension = os.path.splitext(filename)
+                    if extension != '.md':
+                        continue
+                    # a directory is linked through its index file
+                    link_path = path if name == 'index' else os.path.join(path, name)
+                    link_path = os.path.join(link_root, os.path.relpath(link_path,
+                                                                        authored_full_path))
+                    link_paths[os.path.join(path, filename)] = os.path.normpath(link_path)
+
+        contents = content_extractor.extract_many(sorted(link_paths))
+        content_extractor.save()
+
+        return {link_path: contents[filename]['title']
+                for filename, link_path in link_paths.items()
+                if contents[filename]['title'] is not None}
+
+    def _init_build_state(self):
+        """Create the optional persisted state of the last build"""
+        if self.cache_path is None or self.output_format != 'dir' or self.shard is not None:
+            return None
+
+        cache_full_path = os.path.join(self.site_root, self.cache_path)
+
+        return BuildState(os.path.join(cache_full_path, self.build_state_filename))
+
+    def _save_build_state(self):
+        """Persist the compiled navigation tree, merging a built subtree into the last one"""
+        environment = self._environment_signature()
+        if self.subtree is None:
+            self.build_state.save(environment, self.compiled_nodes)
+            return
+
+        previous_nodes = self.build_state.load(environment)
+        if previous_nodes is None:
+            # nothing to merge into, the next incremental build will be a full build
+            return
+
+        self.build_state.save(environment, self._merge_subtree_nodes(previous_nodes))
+
+    def _merge_subtree_nodes(self, previous_nodes):
+        """Return previous_nodes with the built subtree replaced, in pre-order"""
+        # the nodes of a subtree are contiguous in pre-order, and follow the nodes
+        # of its parent and of the subtrees of its preceding siblings
+        subtree_path = os.path.relpath(self.navigation_tree.subtree_path(self.subtree),
+                                       self.site_root)
+        parent_path = os.path.dirname(subtree_path)
+        sibling_names = self.navigation_tree.sibling_names(self.subtree)
+        following_names = set(sibling_names[sibling_names.index(
+            os.path.basename(subtree_path)) + 1:])
+
+        nodes = OrderedDict()
+        is_parent_visited = False
+        is_subtree_merged = False
+        for path, node in previous_nodes.items():
+            if path == subtree_path or path.startswith(subtree_path + os.sep):
+                continue
+            if is_parent_visited and not is_subtree_merged:
+                if path.startswith(parent_path + os.sep):
+                    child_name = path[len(parent_path) + 1:].split(os.sep)[0]
+                    is_following = child_name in following_names
+                else:
+                    is_following = True
+                if is_following:
+                    nodes.update(self.compiled_nodes)
+                    is_subtree_merged = True
+            is_parent_visited = is_parent_visited or path == parent_path
+            nodes[path] = node
+        if not is_subtree_merged:
+            nodes.update(self.compiled_nodes)
+
+        return nodes
 
     def _create_index_file(self, path, options, title, children_nodes):
+        """"""
+        index_file_contents = self._render_index_file(path, options, title, children_nodes)
+        self._write_index_file(path, index_file_contents)
+
+    def _render_index_file(self, path, options, title, children_nodes):
         """"""
         template = self._load_template(self.templates_path, self.navigation_file_template)
-        metadata_filename = options['id'] + '.yml'
-        metadata_full_filename = os.path.join(self.site_root,
-                                              *[self.metadata_path, metadata_filename])
+        metadata_full_filename = self._metadata_full_filename(options)
 
         intro = []
         raw_guides = []
         raw_topics = []
 
         if os.path.exists(metadata_full_filename):
-            metadata = self._load_metadata(metadata_full_filename)
+            self.metrics.count('metadata_hits')
+            # an empty metadata file holds no document
+            metadata = self._load_metadata(metadata_full_filename) or {}
             intro = metadata.get('intro', [])
             raw_guides = metadata.get('guides', [])
             raw_topics = metadata.get('topics', [])
+        else:
+            self.metrics.count('metadata_misses')
 
-        contents = self._format_contents(path, children_nodes)
-        guides = self._format_metadata_list_items('/Guides', raw_guides)
-        topics = self._format_metadata_list_items('/Topics', raw_topics)
+        link_path = path.replace(self.site_root, '')
+        contents = self._format_fragment(self._format_contents, link_path, children_nodes)
+        guides = self._format_fragment(self._format_metadata_list_items, '/Guides', raw_guides,
+                                       self._item_titles('/Guides', raw_guides))
+        topics = self._format_fragment(self._format_metadata_list_items, '/Topics', raw_topics,
+                                       self._item_titles('/Topics', raw_topics))
 
-        index_file_contents = template.render(title=title, intro=intro, contents=contents,
-                                              guides=guides, topics=topics)
-        self._write_index_file(path, index_file_contents)
+        return template.render(title=title, intro=intro, contents=contents,
+                               guides=guides, topics=topics)
+
+    def _metadata_full_filename(self, options):
+        """"""
+        metadata_filename = options['id'] + '.yml'
+
+        return os.path.join(self.site_root, *[self.metadata_path, metadata_filename])
 
     def _load_template(self, template_path, template_name):
         """"""
         try:
             template_full_filename = os.path.join(self.site_root, *[template_path, template_name])
-            with open(template_full_filename) as template_file:
-                return Template(template_file.read())
+            return self.file_cache.load(template_full_filename, self._read_template)
         except IOError as err:
             print('Error: operation failed: {}'.format(err.strerror))
 
     @staticmethod
-    def _load_metadata(filename):
+    def _read_template(filename):
+        """"""
+        with open(filename) as template_file:
+            return FastTemplate(template_file.read())
+
+    def _load_metadata(self, filename):
         """"""
         try:
-            with open(filename, 'r') as metadata_file:
-                metadata = yaml.load(metadata_file)
+            metadata = self.file_cache.load(filename, self._read_metadata)
         except IOError as err:
             print('Error: operation failed: {}'.format(err.strerror))
 
         return metadata
 
-    def _format_contents(self, path, children_nodes):
+    @staticmethod
+    def _read_metadata(filename):
+        """"""
+        return YamlBackend.default().load_file(filename)
+
+    def _format_fragment(self, format_function, *args):
+        """Format a fragment of the index file, through the fragment cache if enabled"""
+        if self.fragment_cache is None:
+            return format_function(*args)
+
+        return self.fragment_cache.render(format_function.__name__, args, format_function)
+
+    def _format_contents(self, link_path, children_nodes):
         """"""
         contents = []
         for node in children_nodes:
             child_node = NavigationTreeNode(node)
             if not child_node.options['stop']:
-                path = path.replace(self.site_root, '')
-                link = os.path.join(path, child_node.name)
+                link = os.path.join(link_path, child_node.name)
                 item = self._format_markdown_linked_item(child_node.name, link)
             else:
                 item = child_node.name
@@ -129,11 +690,21 @@ class Build(CommandBase):
 
         return contents
 
-    def _format_metadata_list_items(self, path, raw_items):
+    def _item_titles(self, path, raw_items):
+        """Return the titles of the items linked from path, if used as link text"""
+        if self.item_titles is None:
+            return None
+
+        return [self.item_titles.get(os.path.normpath(os.path.join(path, item)))
+                for item in raw_items]
+
+    def _format_metadata_list_items(self, path, raw_items, titles=None):
         """"""
         items = []
-        for item in raw_items:
+        for i, item in enumerate(raw_items):
             item_text = os.path.basename(item)
+            if titles is not None and titles[i] is not None:
+                item_text = titles[i]
             link = os.path.join(path, item)
             formated_item = self._format_markdown_linked_item(item_text, link)
             items.append(formated_item)
@@ -151,8 +722,7 @@ class Build(CommandBase):
     def _write_index_file(self, path, content):
         """"""
         index_full_filename = os.path.join(path, self.navigation_filename)
-        try:
-            with open(index_full_filename, 'a') as index_file:
-                index_file.write(content)
-        except IOError as err:
-            print('Error: Operation failed: {}'.format(err.strerror))
+        self.writer.write_file(os.path.relpath(index_full_filename, self.site_root), content)
+        if self.metrics.enabled:
+            self.metrics.count('files_written')
+            self.metrics.count('bytes_written', len(content.encode('utf-8')))
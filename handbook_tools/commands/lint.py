@@ -0,0 +1,65 @@
+"""
+'lint' sub-command of the 'handbook' command.
+
+This module validates the navigation configuration of the Handbook.
+"""
+
+import sys
+from handbook_tools.lib.command_base import CommandBase
+from handbook_tools.lib.navigation_tree import NavigationTree
+from handbook_tools.lib.navigation_tree_linter import NavigationTreeLinter
+
+__version__ = '0.2.1'
+
+class Lint(CommandBase):
+    """
+    Validate the navigation configuration of the Handbook.
+
+    Usage:
+      lint [options]
+
+    Options:
+      -h, --help        Show this help message and exit
+      --version         Show the version and exit
+      --no-stop         Validate the tree built when ignoring 'stop' tags
+
+    Examples:
+      handbook lint -h
+      handbook lint --version
+      handbook lint
+      handbook --root=tests/fixtures/site lint
+      handbook lint --no-stop
+
+    Exits with a non-zero status when errors are found, so it may be used as a
+    pre-commit hook.
+    """
+
+    def __init__(self, command_args=None, global_args=None):
+        """"""
+        super().__init__(command_args, global_args, version=__version__)
+        self._process_args()
+        self.navigation_tree = None
+
+    def execute(self):
+        """Entry point for the execution of this sub-command"""
+        with self.metrics.phase('load'):
+            self.navigation_tree = NavigationTree(self.site_root, self.verbose, self.no_stop)
+        with self.metrics.phase('lint'):
+            linter = NavigationTreeLinter(self.navigation_tree.tree, self.no_stop)
+            errors = linter.lint()
+        self.metrics.count('nodes_validated', linter.nodes_count)
+        self.metrics.count('errors_found', len(errors))
+
+        for error in errors:
+            print('Error: {}'.format(error))
+
+        if self.verbose or errors:
+            print('{} nodes validated, {} errors found'.format(linter.nodes_count, len(errors)))
+
+        if errors:
+            sys.exit(1)
+
+    def _process_args(self):
+        """Process command_args"""
+        # default values not set by docopt were set in CommandBase
+        self.no_stop = self.args['--no-stop']
@@ -0,0 +1,68 @@
+"""
+'preview' sub-command of the 'handbook' command.
+
+This module runs a local HTTP server rendering the navigation files on demand.
+"""
+
+import sys
+from handbook_tools.lib.command_base import CommandBase
+
+__version__ = '0.1.0'
+
+class Preview(CommandBase):
+    """
+    Preview the handbook over HTTP, rendering each navigation file on first request.
+
+    Usage:
+      preview [options]
+
+    Options:
+      -h, --help        Show this help message and exit
+      --version         Show the version and exit
+      --no-stop         Ignore 'stop' tags to scan the entire tree
+      --bind=ADDRESS    Address to listen on [default: 127.0.0.1]
+      --port=PORT       Port to listen on, 0 for a free one [default: 8000]
+
+    Examples:
+      handbook preview -h
+      handbook preview --version
+      handbook preview
+      handbook --root=tests/fixtures/site preview --port=8080
+
+    Nothing is built when the server starts: the navigation file of a node is
+    rendered when first requested (e.g., http://127.0.0.1:8000/Handbook/Development),
+    and rendered again only after its metadata, the template or 'root.yml' changed.
+    """
+
+    def __init__(self, command_args=None, global_args=None):
+        """"""
+        super().__init__(command_args, global_args, version=__version__)
+        self.no_stop = self.args['--no-stop']
+        self.bind = self.args['--bind']
+        try:
+            self.port = int(self.args['--port'])
+        except ValueError:
+            print('Error: Invalid port: {}'.format(self.args['--port']))
+            sys.exit()
+        self.server = None
+
+    def execute(self):
+        """Entry point for the execution of this sub-command"""
+        # deferred import, as it imports the 'build' command
+        from handbook_tools.lib.preview_server import PreviewServer
+
+        try:
+            self.server = PreviewServer(self.site_root, (self.bind, self.port),
+                                        self.verbose, self.no_stop)
+        except OSError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+            sys.exit()
+
+        host, port = self.server.address
+        print('Previewing {} on http://{}:{}/'.format(self.site_root, host, port))
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.close()
@@ -0,0 +1,63 @@
+"""
+'serve' sub-command of the 'handbook' command.
+
+This module runs a daemon answering handbook requests over a local socket.
+"""
+
+import sys
+import socket
+from handbook_tools.lib.command_base import CommandBase
+from handbook_tools.lib.handbook_client import HandbookClient
+
+__version__ = '0.1.0'
+
+class Serve(CommandBase):
+    """
+    Run a daemon answering toc, status and render requests.
+
+    Usage:
+      serve [options]
+
+    Options:
+      -h, --help        Show this help message and exit
+      --version         Show the version and exit
+
+    Examples:
+      handbook serve -h
+      handbook serve --version
+      handbook serve
+      handbook --root=tests/fixtures/site serve
+
+    The daemon listens on the Unix domain socket '.handbook.sock' under the site
+    root. While it is running, the 'toc' and 'status' commands are forwarded to
+    it, unless the '--no-daemon' option of 'handbook' is given.
+    """
+
+    def __init__(self, command_args=None, global_args=None):
+        """"""
+        super().__init__(command_args, global_args, version=__version__)
+        self.server = None
+
+    def execute(self):
+        """Entry point for the execution of this sub-command"""
+        if not hasattr(socket, 'AF_UNIX'):
+            print('Error: Unix domain sockets are not supported on this platform')
+            sys.exit()
+
+        # deferred import, as it imports the commands served by the daemon
+        from handbook_tools.lib.handbook_server import HandbookServer
+
+        client = HandbookClient(self.site_root)
+        if client.is_available():
+            print('Error: Daemon is already running: {}'.format(client.socket_filename))
+            sys.exit()
+
+        HandbookServer.remove_stale_socket(client.socket_filename)
+        self.server = HandbookServer(self.site_root, client.socket_filename, self.verbose)
+        print('Serving {} on {}'.format(self.site_root, client.socket_filename))
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.close()
@@ -7,8 +7,10 @@ import os
 import sys
 from handbook_tools.lib.command_base import CommandBase
 from handbook_tools.lib.directory_tree import DirectoryTree
+from handbook_tools.lib.content_extractor import ContentExtractor
+from handbook_tools.lib.file_snapshot import FileSnapshot
 
-__version__ = '0.1.8'
+__version__ = '0.5.0'
 
 class Status(CommandBase):
     """
@@ -21,6 +23,12 @@ class Status(CommandBase):
       -h, --help            Show this help message and exit
       --version             Show the version and exit
       -o, --output=FILE     Specify output report file relative to site root
+      --stats               Include the title and words count of each file
+      --cache=DIR           Cache listings and file contents in DIR relative to site root
+      --snapshot=FILE       Save a snapshot of the authored files to FILE relative to site root
+      --hash                Include the content hash of each file in the saved snapshot
+      --since=FILE          Report the files added, removed or modified since the snapshot
+                            FILE relative to site root, instead of all the files
 
     Examples:
       handbook status -h
@@ -28,6 +36,9 @@ class Status(CommandBase):
       handbook status
       handbook --root=tests/fixtures/site status
       handbook status -o report.md
+      handbook status --stats --cache=.cache
+      handbook status --snapshot=status.snapshot --hash
+      handbook status --since=status.snapshot --snapshot=status.snapshot
     """
 
     def __init__(self, command_args=None, global_args=None):
@@ -44,6 +55,10 @@ class Status(CommandBase):
         # file names to ignore
         self.black_list = []
         self.report_title = '# Status Report\n'
+        # persisted file contents, under the optional cache directory
+        self.content_cache_filename = 'content.json'
+        # persisted directory listings, under the optional cache directory
+        self.listing_cache_filename = 'listing.json'
         self._process_args()
         self.report = self._init_output_file(self.output_filename)
 
@@ -54,31 +69,69 @@ class Status(CommandBase):
 
         self.group_title = ''
         self.authored_files_count = 0
+        self.authored_words_count = 0
         self.directory_tree = None
+        self.content_extractor = None
+        # snapshot taken by this run, and the snapshot to report the changes since
+        self.snapshot = None
+        self.since_snapshot = None
 
     def execute(self):
         """Entry point for the execution of this sub-command"""
-        self.directory_tree = DirectoryTree(self.site_root)
+        self.directory_tree = DirectoryTree(self.site_root,
+                                            self._cache_full_filename(self.listing_cache_filename))
+        if self.snapshot_filename is not None or self.since_filename is not None:
+            self._init_snapshots()
+        if self.stats:
+            self.content_extractor = ContentExtractor(
+                self._cache_full_filename(self.content_cache_filename))
         tasks_queue = [{'group_title': 'Metadata Files', 'root_path': self.metadata_path},
                        {'group_title': 'Guides Files', 'root_path': self.guides_path},
                        {'group_title': 'Topics Files', 'root_path': self.topics_path}]
-        for task in tasks_queue:
-            root_path = os.path.join(self.site_root, task['root_path'])
-            self.directory_tree.scan(root_path, task['group_title'], self.node_performer)
+        with self.metrics.phase('scan'):
+            for task in tasks_queue:
+                root_path = os.path.join(self.site_root, task['root_path'])
+                self.directory_tree.scan(root_path, task['group_title'], self.node_performer)
 
+        if self.since_snapshot is not None:
+            self._write_changes()
         try:
             self.report.write('\n\n  **Total Authored Files Count: {}**'. \
                           format(self.authored_files_count))
+            if self.stats:
+                self.report.write('\n\n  **Total Authored Words Count: {}**'. \
+                              format(self.authored_words_count))
         except IOError as err:
             print('Error: Operation failed: {}'.format(err.strerror))
 
+        with self.metrics.phase('save'):
+            self.directory_tree.save_snapshot()
+            if self.content_extractor is not None:
+                self.content_extractor.save()
+            if self.snapshot_filename is not None:
+                self._save_snapshot()
+
         if self.report is not sys.stdout:
             self.report.close()
 
+        self.metrics.count('directories_listed', self.directory_tree.listed_dirs_count)
+        self.metrics.count('listings_reused', self.directory_tree.reused_listings_count)
+        self.metrics.count('files_listed', self.authored_files_count)
+        if self.content_extractor is not None:
+            self.metrics.count('content_cache_hits', self.content_extractor.hits)
+            self.metrics.count('content_cache_misses', self.content_extractor.misses)
+
     def node_performer(self, path, group_title, file_list):
         """Custom performer executed for each visited node"""
         file_list = self._filter_files(path, file_list)
         short_path = path.replace(self.site_root, '')
+        if self.snapshot is not None:
+            self._add_to_snapshot(path, file_list)
+        if self.since_snapshot is not None:
+            # changes are reported at the end of the scan
+            self.authored_files_count += len(file_list)
+            return
+        file_stats = self._file_stats(path, file_list)
 
         try:
             if group_title != self.group_title:
@@ -86,7 +139,7 @@ class Status(CommandBase):
                 self.group_title = group_title
             for file in file_list:
                 file_path = os.path.join(short_path, file)
-                self.report.write('  - {}  \n'.format(file_path))
+                self.report.write('  - {}{}  \n'.format(file_path, file_stats.get(file, '')))
                 self.authored_files_count += 1
         except IOError as err:
             print('Error: Operation failed: {}'.format(err.strerror))
@@ -95,17 +148,93 @@ class Status(CommandBase):
         """Process command_args"""
         # default values not set by docopt were set in CommandBase
         self.output_filename = self.args['--output']
+        self.stats = self.args['--stats']
+        self.cache_path = self.args['--cache']
+        self.snapshot_filename = self.args['--snapshot']
+        self.with_hashes = self.args['--hash']
+        self.since_filename = self.args['--since']
+
+    def _cache_full_filename(self, cache_filename):
+        """"""
+        if self.cache_path is None:
+            return None
+
+        cache_full_path = os.path.join(self.site_root, self.cache_path)
+        os.makedirs(cache_full_path, exist_ok=True)
+
+        return os.path.join(cache_full_path, cache_filename)
+
+    def _init_snapshots(self):
+        """Load the snapshot to report the changes since, and start a new snapshot"""
+        if self.since_filename is not None:
+            since_full_filename = os.path.join(self.site_root, self.since_filename)
+            self.since_snapshot = FileSnapshot.load(since_full_filename)
+            if self.since_snapshot is None:
+                print('Error: Invalid snapshot file: {}'.format(since_full_filename))
+                sys.exit()
+            # unchanged directories are not listed again
+            self.directory_tree.reuse_listings(self.since_snapshot.dirs)
+
+        with_hashes = self.with_hashes or \
+                      (self.since_snapshot is not None and self.since_snapshot.with_hashes)
+        self.snapshot = FileSnapshot(with_hashes)
+
+    def _add_to_snapshot(self, path, file_list):
+        """"""
+        relpath = os.path.relpath(path, self.site_root)
+        self.snapshot.add_dir(relpath, *self.directory_tree.listings[relpath])
+        for filename in file_list:
+            self.snapshot.add_file(os.path.join(relpath, filename), os.path.join(path, filename),
+                                   self.since_snapshot)
+
+    def _save_snapshot(self):
+        """"""
+        snapshot_full_filename = os.path.join(self.site_root, self.snapshot_filename)
+        self.snapshot.save(snapshot_full_filename, self.directory_tree.racy_period)
+
+    def _write_changes(self):
+        """Write the files added, removed or modified since the loaded snapshot"""
+        changes = zip(['Added', 'Removed', 'Modified'], self.since_snapshot.diff(self.snapshot))
+        try:
+            self.report.write('\n## Changes Since {}\n\n'.format(self.since_filename))
+            changes_count = 0
+            for change, paths in changes:
+                for path in paths:
+                    self.report.write('  - {}: {}  \n'.format(change, os.path.join(os.sep, path)))
+                    changes_count += 1
+            self.report.write('\n\n  **Total Changed Files Count: {}**'.format(changes_count))
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
+    def _file_stats(self, path, file_list):
+        """Return the formatted title and words count of each file, if requested"""
+        if not self.stats:
+            return {}
+
+        full_filenames = [os.path.join(path, filename) for filename in file_list]
+        contents = self.content_extractor.extract_many(full_filenames, count_words=True)
+
+        file_stats = {}
+        for filename, full_filename in zip(file_list, full_filenames):
+            file_contents = contents[full_filename]
+            self.authored_words_count += file_contents['words']
+            title = ''
+            if file_contents['title'] is not None:
+                title = ' "{}"'.format(file_contents['title'])
+            file_stats[filename] = '{} ({} words)'.format(title, file_contents['words'])
+
+        return file_stats
 
     def _filter_files(self, path, file_list):
         """"""
-        ignore_list = []
+        ignore_list = set(self.black_list)
         for filename in file_list:
-            file_path = os.path.join(path, filename)
-            if os.path.isdir(file_path):
-                ignore_list.append(filename)
+            if self.directory_tree.is_dir(path, filename):
+                ignore_list.add(filename)
             else:
                 extension = os.path.splitext(filename)[1]
                 if extension not in self.white_list:
-                    ignore_list.append(filename)
+                    ignore_list.add(filename)
 
-        return list(set(file_list) - set(ignore_list + self.black_list))
+        # keep the sorted order of file_list
+        return [filename for filename in file_list if filename not in ignore_list]
@@ -10,7 +10,7 @@ from urllib.request import pathname2url
 from handbook_tools.lib.command_base import CommandBase
 from handbook_tools.lib.navigation_tree import NavigationTree
 
-__version__ = '0.6.8'
+__version__ = '0.8.0'
 
 class Toc(CommandBase):
     """
@@ -29,6 +29,7 @@ class Toc(CommandBase):
       --no-index            Do not include index numbers for the TOC items
       --no-link             Do not include links for the TOC items
       --header              Include HTML header for the TOC file
+      --subtree=NODE        Only compose the TOC of the subtree of the node of id or path NODE
 
     Examples:
       handbook toc -h
@@ -39,6 +40,7 @@ class Toc(CommandBase):
       handbook toc --depth=3 --no-index
       handbook toc --d 2 --no-index --no-link -o toc2.md
       handbook toc --no-stop -o toc.md
+      handbook toc --subtree=development
     """
 
     def __init__(self, command_args=None, global_args=None):
@@ -60,16 +62,32 @@ class Toc(CommandBase):
 
         self.depth = 0
         self.index = []
+        # depth of the parent of the scanned tree root, when scanning a single subtree
+        self.depth_offset = 0
         self.navigation_tree = None
 
     def execute(self):
         """Entry point for the execution of this sub-command"""
-        self.navigation_tree = NavigationTree(self.site_root, self.verbose, self.no_stop)
-        self.navigation_tree.scan(self.node_performer)
+        with self.metrics.phase('load'):
+            self.navigation_tree = NavigationTree(self.site_root, self.verbose, self.no_stop)
+        subtree = None
+        if self.subtree_key is not None:
+            subtree = self.navigation_tree.find_subtree(self.subtree_key)
+            if subtree is None:
+                print('Error: Unknown node: {}'.format(self.subtree_key))
+                sys.exit()
+            parent_path, _ = subtree
+            self.depth_offset = len(parent_path.replace(self.site_root, '').split(os.sep)) - 1
+        with self.metrics.phase('scan'):
+            self.navigation_tree.scan(self.node_performer, subtree)
 
         if self.toc_file is not sys.stdout:
             self.toc_file.close()
 
+        self.metrics.count('nodes_visited', self.navigation_tree.visited_nodes_count)
+        self.metrics.count('stopped_subtrees_skipped',
+                           self.navigation_tree.stopped_subtrees_count)
+
     def node_performer(self, root_path, *_):
         """Custom performer executed for each visited node"""
         name = os.path.basename(root_path)
@@ -78,7 +96,13 @@ class Toc(CommandBase):
 
         # skip handbook root and too deep TOC items
         if self.depth > 1 and (self.depth - 1) <= self.max_depth:
-            self.toc_file.write(self._format_toc(name, link))
+            toc_item = self._format_toc(name, link)
+            self.toc_file.write(toc_item)
+            self.metrics.count('items_written')
+            if self.metrics.enabled:
+                self.metrics.count('bytes_written', len(toc_item.encode('utf-8')))
+        else:
+            self.metrics.count('items_skipped')
 
     def _process_args(self):
         """Process command_args"""
@@ -90,10 +114,11 @@ class Toc(CommandBase):
         self.include_index = not self.args['--no-index']
         self.include_link = not self.args['--no-link']
         self.include_toc_header = self.args['--header']
+        self.subtree_key = self.args['--subtree']
 
     def _update_index_counter(self, link):
         """"""
-        depth = len(link.split(os.sep)) - 1
+        depth = len(link.split(os.sep)) - 1 - self.depth_offset
         if depth > len(self.index):
             self.index += [1]
         if depth <= self.depth:
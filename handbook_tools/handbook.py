@@ -14,6 +14,11 @@ Options:
   --verbose         Print warning messages
   --root=PATH       Site root. When not provided, current directory will be used.
                     May also be specified using HANDBOOK_ROOT environment variable.
+  --no-daemon       Do not forward commands to a running 'serve' daemon
+  --metrics-file=FILE
+                    Write the run metrics of the command to FILE relative to site root
+  --metrics-format=FORMAT
+                    Format of the metrics file: 'json' or 'prometheus' [default: json]
 
 Commands:
 {commands}
@@ -24,6 +29,7 @@ Examples:
   handbook some-command --version
   handbook some-command
   handbook --root=tests/fixtures/site some-command
+  handbook --metrics-file=metrics.prom --metrics-format=prometheus some-command
 
 Environment Variables:
   HANDBOOK_ROOT     Optionally set this variable to define the handbook root
@@ -35,12 +41,23 @@ import pkgutil
 from docopt import docopt
 from docopt import DocoptExit
 from handbook_tools import __version__ as VERSION
+from handbook_tools.lib.command_base import CommandBase
+from handbook_tools.lib.handbook_client import HandbookClient
+from handbook_tools.lib.yaml_backend import YamlBackend
+
+# commands forwarded to a running 'serve' daemon
+FORWARDED_COMMANDS = ['status', 'toc']
 
 def main():
     """Program entry point"""
     this_dir = os.path.abspath(os.path.dirname(__file__))
-    commands = _load_commands(os.path.join(this_dir, 'commands'))
-    command_name, command_args, global_args = _process_args(commands)
+    commands_dirname = os.path.join(this_dir, 'commands')
+    command_name, command_args, global_args = _process_args(commands_dirname)
+
+    if _forward_to_daemon(command_name, command_args, global_args):
+        return
+
+    commands = _load_commands(commands_dirname)
 
     try:
         command_class = getattr(commands[command_name], command_name.capitalize())
@@ -49,7 +66,11 @@ def main():
         raise DocoptExit()
 
     command = command_class(command_args, global_args)
-    command.execute()
+    try:
+        command.execute()
+    finally:
+        # commands may exit on errors, which are worth measuring too
+        command.metrics.save()
 
 def _load_commands(dirname):
     """"""
@@ -61,10 +82,42 @@ def _load_commands(dirname):
 
     return commands
 
-def _process_args(commands):
+def _forward_to_daemon(command_name, command_args, global_args):
+    """Forward the command to a running 'serve' daemon. Return True if forwarded."""
+    if global_args['--no-daemon'] or command_name not in FORWARDED_COMMANDS:
+        return False
+    # metrics are collected by local runs only
+    if global_args['--metrics-file'] is not None:
+        return False
+    # usage and version information are printed locally, and output files
+    # are written relative to the local working directory
+    if any(arg in ('-h', '--help', '--version') or arg.startswith(('-o', '--output'))
+           for arg in command_args):
+        return False
+
+    client = HandbookClient(CommandBase.resolve_site_root(global_args['--root']))
+    response = client.request({'command': command_name, 'args': command_args})
+    if response is None:
+        # no daemon is running, the command is executed locally
+        return False
+
+    sys.stdout.write(response['output'])
+    if not response['ok']:
+        sys.exit()
+
+    return True
+
+def _process_args(commands_dirname):
     """"""
-    usage = _append_commands_and_summaries_to_usage(__doc__, commands)
-    args = docopt(usage, version=VERSION, options_first=True)
+    # the commands are loaded for the usage only when the usage is printed,
+    # so commands forwarded to a daemon do not pay for importing them all
+    usage = __doc__.format(commands='')
+    version = _version()
+    args = docopt(usage, version=version, options_first=True, help=False)
+    if args['--help']:
+        commands = _load_commands(commands_dirname)
+        usage = _append_commands_and_summaries_to_usage(__doc__, commands)
+        args = docopt(usage, version=version, options_first=True)
 
     command_name = args.pop('<command>')
     command_args = args.pop('<args>')
@@ -76,6 +129,10 @@ def _process_args(commands):
 
     return command_name, command_args, global_args
 
+def _version():
+    """"""
+    return '{} (YAML backend: {})'.format(VERSION, YamlBackend.default().name)
+
 def _append_commands_and_summaries_to_usage(usage, commands):
     """"""
     sorted_commands = sorted(commands.items())
@@ -0,0 +1,78 @@
+"""
+Writes the build output as entries streamed into a tar or zip archive.
+
+All paths given to the writer are relative to the archive root. Nothing but
+the archive file itself is written to the filesystem.
+"""
+
+import io
+import os
+import time
+import tarfile
+import zipfile
+
+class ArchiveWriter:
+    """Writer of the build output into a tar or zip archive"""
+
+    # supported archive formats
+    formats = ['tar', 'zip']
+
+    def __init__(self, archive_filename, archive_format):
+        """
+        Initialize the writer.
+
+        archive_filename (str): the archive file to create
+        archive_format (str): one of the supported archive formats
+        """
+        self.archive_format = archive_format
+        self.mtime = time.time()
+        if archive_format == 'tar':
+            self.archive = tarfile.open(archive_filename, 'w')
+        else:
+            self.archive = zipfile.ZipFile(archive_filename, 'w', zipfile.ZIP_DEFLATED)
+
+    def make_dir(self, path):
+        """Add a directory entry for path"""
+        name = self._entry_name(path)
+        if self.archive_format == 'tar':
+            entry = self._tar_entry(name, tarfile.DIRTYPE, 0o755)
+            self.archive.addfile(entry)
+        else:
+            self.archive.writestr(self._zip_entry(name + '/', 0o40755), '')
+
+    def write_file(self, path, content):
+        """Add a file entry for path with the given content"""
+        name = self._entry_name(path)
+        data = content.encode('utf-8')
+        if self.archive_format == 'tar':
+            entry = self._tar_entry(name, tarfile.REGTYPE, 0o644)
+            entry.size = len(data)
+            self.archive.addfile(entry, io.BytesIO(data))
+        else:
+            self.archive.writestr(self._zip_entry(name, 0o100644), data)
+
+    def close(self):
+        """Complete the archive"""
+        self.archive.close()
+
+    @staticmethod
+    def _entry_name(path):
+        """"""
+        return path.replace(os.sep, '/')
+
+    def _tar_entry(self, name, entry_type, mode):
+        """"""
+        entry = tarfile.TarInfo(name)
+        entry.type = entry_type
+        entry.mode = mode
+        entry.mtime = self.mtime
+
+        return entry
+
+    def _zip_entry(self, name, mode):
+        """"""
+        entry = zipfile.ZipInfo(name, time.localtime(self.mtime)[:6])
+        entry.external_attr = mode << 16
+        entry.compress_type = zipfile.ZIP_DEFLATED
+
+        return entry
@@ -0,0 +1,181 @@
+"""
+Writes the build output to the local filesystem concurrently.
+
+Directory creations are collected and submitted in batches, one per tree
+level, and file writes are queued to a bounded pool of writer threads driven
+by an asyncio event loop. A file write only waits for the batch creating its
+directory, and is held back while that directory is still being collected.
+The caller is blocked once too many operations are pending (back-pressure).
+Errors are collected and reported in the order the operations were requested,
+and close() ends with an fsync barrier over everything that was written.
+"""
+
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from handbook_tools.lib.file_writer import FileWriter
+
+class AsyncFileWriter(FileWriter):
+    """Concurrent writer of the build output to the local filesystem"""
+
+    def __init__(self, root, max_workers=8, max_pending=64):
+        """
+        Initialize the writer.
+
+        root (str): directory all the written paths are relative to
+        max_workers (int): number of concurrent writer threads
+        max_pending (int): number of queued operations before the caller blocks
+        """
+        super().__init__(root)
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+        self.pending_slots = threading.BoundedSemaphore(max_pending)
+        self.sequence = 0
+        self.futures = []
+        self.errors = []
+        self.max_pending = max_pending
+        # (sequence, path) of the collected directory creations and writes to them
+        self.pending_dirs = []
+        self.pending_dir_paths = set()
+        self.pending_writes = []
+        # batch creating each of the submitted directories
+        self.dir_batches = {}
+        self.written_paths = []
+
+    def make_dir(self, path):
+        """Queue the creation of the directory at path"""
+        full_path = self._full_path(path)
+        self.pending_dirs.append((self._next_sequence(), full_path))
+        self.pending_dir_paths.add(full_path)
+        if len(self.pending_dirs) >= self.max_pending:
+            self._flush_dirs()
+
+    def write_file(self, path, content):
+        """Queue writing content to the file at path"""
+        full_path = self._full_path(path)
+        if os.path.dirname(full_path) in self.pending_dir_paths:
+            self.pending_writes.append((self._next_sequence(), full_path, content))
+        else:
+            self._submit_write(self._next_sequence(), full_path, content)
+
+    def close(self):
+        """Wait for all the pending operations, fsync the output and report errors"""
+        self._flush_dirs()
+        wait(self.futures)
+        self.futures = []
+
+        # fsync barrier over the written files and the directories holding them
+        written_paths = sorted(self.written_paths)
+        synced_paths = written_paths + sorted(set(map(os.path.dirname, written_paths)))
+        for synced_path in synced_paths:
+            self._submit(self._fsync(self._next_sequence(), synced_path))
+        wait(self.futures)
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join()
+        self.loop.close()
+        self.executor.shutdown()
+
+        for _, err in sorted(self.errors, key=lambda error: error[0]):
+            print('Error: Operation failed: {}: {}'.format(err.strerror, err.filename))
+
+    def _flush_dirs(self):
+        """Submit the collected directory creations as one batch per tree level, then the writes"""
+        levels = {}
+        for sequence, path in self.pending_dirs:
+            levels.setdefault(path.count(os.sep), []).append((sequence, path))
+        for level in sorted(levels):
+            dirs = levels[level]
+            # parents are part of a previous level or of a previous flush
+            parent_batches = {self.dir_batches.get(os.path.dirname(path)) for _, path in dirs}
+            batch = self._submit(self._make_dirs(parent_batches - {None}, dirs))
+            self.dir_batches.update((path, batch) for _, path in dirs)
+
+        for sequence, path, content in self.pending_writes:
+            self._submit_write(sequence, path, content)
+        self.pending_dirs = []
+        self.pending_dir_paths = set()
+        self.pending_writes = []
+
+    def _submit_write(self, sequence, path, content):
+        """"""
+        self._submit(self._write_file(sequence, self.dir_batches.get(os.path.dirname(path)),
+                                      path, content))
+
+    def _submit(self, coroutine):
+        """Schedule coroutine on the event loop, blocking while the queue is full"""
+        self.pending_slots.acquire()
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        future.add_done_callback(lambda _: self.pending_slots.release())
+        self.futures.append(future)
+
+        return future
+
+    def _next_sequence(self):
+        """"""
+        self.sequence += 1
+
+        return self.sequence
+
+    async def _make_dirs(self, parent_batches, dirs):
+        """"""
+        for parent_batch in parent_batches:
+            await self._wait_for(parent_batch)
+        self.errors.extend(await self.loop.run_in_executor(self.executor, self._make_dirs_sync,
+                                                           dirs))
+
+    async def _write_file(self, sequence, dirs_batch, path, content):
+        """"""
+        await self._wait_for(dirs_batch)
+        if await self._run(sequence, self._write_file_sync, path, content):
+            self.written_paths.append(path)
+
+    async def _fsync(self, sequence, path):
+        """"""
+        await self._run(sequence, self._fsync_sync, path)
+
+    @staticmethod
+    async def _wait_for(future):
+        """"""
+        if future is not None:
+            await asyncio.wrap_future(future)
+
+    async def _run(self, sequence, function, *args):
+        """Run function in the executor, recording any failure by its sequence"""
+        try:
+            await self.loop.run_in_executor(self.executor, function, *args)
+        except (IOError, OSError) as err:
+            self.errors.append((sequence, err))
+            return False
+
+        return True
+
+    @staticmethod
+    def _make_dirs_sync(dirs):
+        """Create the (sequence, path) directories and return the (sequence, error) failures"""
+        errors = []
+        for sequence, path in dirs:
+            try:
+                os.mkdir(path)
+            except OSError as err:
+                errors.append((sequence, err))
+
+        return errors
+
+    @staticmethod
+    def _write_file_sync(path, content):
+        """"""
+        with open(path, 'w') as output_file:
+            output_file.write(content)
+
+    @staticmethod
+    def _fsync_sync(path):
+        """"""
+        file_descriptor = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(file_descriptor)
+        finally:
+            os.close(file_descriptor)
@@ -0,0 +1,42 @@
+"""
+Advisory lock serializing the builds of a site.
+
+The lock is an exclusive flock() on a lock file at the site root, so
+concurrent builds queue instead of interleaving their changes to the output.
+It is released by the operating system when the process ends, so it is never
+left stale. Platforms without fcntl build without locking.
+"""
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class BuildLock:
+    """Advisory lock serializing the builds of a site"""
+
+    def __init__(self, lock_filename):
+        """"""
+        self.lock_filename = lock_filename
+        self.lock_file = None
+
+    def __enter__(self):
+        """Wait for the lock"""
+        if fcntl is None:
+            return self
+
+        self.lock_file = open(self.lock_filename, 'a')
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print('Waiting for another build to complete...')
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+
+        return self
+
+    def __exit__(self, *_):
+        """Release the lock"""
+        if self.lock_file is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+            self.lock_file.close()
+            self.lock_file = None
@@ -0,0 +1,103 @@
+"""
+Work manifest of a sharded build.
+
+The built nodes are split into units, each being either a whole subtree or a
+single node whose children are units of their own. Subtrees larger than a
+fraction of a shard are split, so the units can be balanced across the shards,
+which are assigned the largest units first, each to the least loaded shard.
+
+The manifest records, for each shard, its units and the paths (relative to the
+site root) of all the nodes it builds, in pre-order. It also records a
+signature of the planned navigation tree, which must still match when the
+shards are built and merged.
+"""
+
+import os
+import json
+import heapq
+
+class BuildManifest:
+    """Work manifest of a sharded build"""
+
+    # subtrees larger than 1/unit_fraction of a shard are split into smaller units
+    unit_fraction = 4
+
+    def __init__(self, manifest_filename):
+        """"""
+        self.manifest_filename = manifest_filename
+        self.signature = None
+        # list of {'units': [[path, is_subtree], ...], 'nodes': [path, ...]} dicts
+        self.shards = []
+
+    def plan(self, nodes, shards_count, signature):
+        """
+        Split the nodes into balanced shards.
+
+        nodes (list of str): paths of all the built nodes, in pre-order (may be empty)
+        shards_count (int): number of shards
+        signature (str): signature of the planned navigation tree
+        """
+        self.signature = signature
+        children = {path: [] for path in nodes}
+        for path in nodes[1:]:
+            children[os.path.dirname(path)].append(path)
+        sizes = {}
+        for path in reversed(nodes):
+            sizes[path] = 1 + sum(sizes[child] for child in children[path])
+
+        max_unit_size = max(1, len(nodes) // (shards_count * self.unit_fraction))
+        units = []
+        # no root when the tree is empty or its root is stopped
+        stack = nodes[:1]
+        while stack:
+            path = stack.pop()
+            if sizes[path] <= max_unit_size:
+                units.append((path, True, sizes[path]))
+            else:
+                units.append((path, False, 1))
+                stack.extend(reversed(children[path]))
+
+        # largest units first, each to the least loaded shard
+        order = {path: index for index, path in enumerate(nodes)}
+        units.sort(key=lambda unit: (-unit[2], order[unit[0]]))
+        loads = [(0, shard_index) for shard_index in range(shards_count)]
+        assigned_units = [[] for _ in range(shards_count)]
+        for unit in units:
+            load, shard_index = heapq.heappop(loads)
+            assigned_units[shard_index].append(unit)
+            heapq.heappush(loads, (load + unit[2], shard_index))
+
+        self.shards = []
+        for shard_units in assigned_units:
+            shard_units.sort(key=lambda unit: order[unit[0]])
+            shard_nodes = []
+            for path, is_subtree, size in shard_units:
+                start = order[path]
+                shard_nodes.extend(nodes[start:start + size] if is_subtree else [path])
+            self.shards.append({'units': [[path, is_subtree]
+                                          for path, is_subtree, _ in shard_units],
+                                'nodes': shard_nodes})
+
+    def save(self):
+        """Persist the manifest"""
+        manifest = {'signature': self.signature, 'shards': self.shards}
+        temp_filename = self.manifest_filename + '.tmp'
+        try:
+            with open(temp_filename, 'w') as manifest_file:
+                json.dump(manifest, manifest_file, indent=2)
+            os.replace(temp_filename, self.manifest_filename)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
+    def load(self):
+        """Load the persisted manifest. Return False if it could not be read."""
+        try:
+            with open(self.manifest_filename, 'r') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (IOError, ValueError):
+            return False
+
+        self.signature = manifest['signature']
+        self.shards = manifest['shards']
+
+        return True
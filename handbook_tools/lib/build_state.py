@@ -0,0 +1,61 @@
+"""
+Persists the compiled navigation tree of the last build.
+
+The state is used by incremental builds to find what changed since the last
+build. It holds the compiled navigation tree (see NavigationTreeDiff) and a
+signature of the build environment (e.g., template and build options), which
+must match for the state to be usable.
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+class BuildState:
+    """Persisted state of the last build"""
+
+    def __init__(self, state_filename):
+        """"""
+        self.state_filename = state_filename
+
+    def load(self, environment):
+        """Return the compiled navigation tree of the last build in the same environment"""
+        try:
+            with open(self.state_filename, 'r') as state_file:
+                state = json.load(state_file)
+        except (IOError, ValueError):
+            return None
+
+        if state.get('environment') != environment:
+            return None
+
+        return OrderedDict((path, {'id': node_id, 'signature': signature})
+                           for path, node_id, signature in state['nodes'])
+
+    def save(self, environment, nodes):
+        """Persist the compiled navigation tree of this build"""
+        state = {'environment': environment,
+                 'nodes': [[path, node['id'], node['signature']] for path, node in nodes.items()]}
+        temp_filename = self.state_filename + '.tmp'
+        try:
+            with open(temp_filename, 'w') as state_file:
+                json.dump(state, state_file)
+            os.replace(temp_filename, self.state_filename)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
+    @staticmethod
+    def signature(*items):
+        """Return a signature of the given JSON serializable items"""
+        return hashlib.sha1(json.dumps(items, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def file_stamp(filename):
+        """Return the modification time and size of filename, or None if it does not exist"""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+
+        return [stat.st_mtime_ns, stat.st_size]
@@ -6,6 +6,7 @@ import os
 import sys
 from docopt import docopt
 from handbook_tools.lib.handbook_validation import HandbookValidation
+from handbook_tools.lib.run_metrics import RunMetrics
 
 class CommandBase:
     """Base class for the sub-commands of the 'handbook' command"""
@@ -33,6 +34,8 @@ class CommandBase:
         # process global_args
         self.verbose = global_args['--verbose']
         self.site_root = self._set_site_root(global_args['--root'])
+        self.metrics = self._init_metrics(global_args.get('--metrics-file'),
+                                          global_args.get('--metrics-format') or 'json')
 
     def execute(self):
         """Execute the command"""
@@ -49,8 +52,9 @@ class CommandBase:
 
         return summary
 
-    def _set_site_root(self, root_option):
-        """"""
+    @staticmethod
+    def resolve_site_root(root_option):
+        """Return the site root given by the --root option, the environment or the default"""
         site_root = root_option
         environ_variable = 'HANDBOOK_ROOT'
 
@@ -60,7 +64,11 @@ class CommandBase:
             else:
                 site_root = '.'
 
-        site_root = site_root.rstrip('/')
+        return site_root.rstrip('/')
+
+    def _set_site_root(self, root_option):
+        """"""
+        site_root = self.resolve_site_root(root_option)
         self._validate_site_root_or_exit(site_root)
 
         return site_root
@@ -73,6 +81,18 @@ class CommandBase:
 
         HandbookValidation.fail_on_nonexisting_filesystem(site_root, error_message)
 
+    def _init_metrics(self, metrics_filename, metrics_format):
+        """"""
+        if metrics_format not in RunMetrics.formats:
+            print('Error: Unknown metrics format: {}'.format(metrics_format))
+            sys.exit()
+
+        metrics_full_filename = None
+        if metrics_filename is not None:
+            metrics_full_filename = os.path.join(self.site_root, metrics_filename)
+
+        return RunMetrics(self.__class__.__name__.lower(), metrics_full_filename, metrics_format)
+
     def _init_output_file(self, output_filename):
         """"""
         if output_filename is None:
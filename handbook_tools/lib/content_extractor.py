@@ -0,0 +1,245 @@
+"""
+Extracts the title and statistics of authored Markdown files.
+
+Only the head of each Markdown file is read to get the YAML front matter and the
+first heading, using bounded reads. Other files (e.g., YAML metadata files) have
+no title. Word counts require the whole file, which is
+memory-mapped when large. Files are processed by a thread pool and the results
+are cached by file modification time and size, optionally persisted on disk.
+"""
+
+import os
+import re
+import json
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+from handbook_tools.lib.yaml_backend import YamlBackend
+
+class ContentExtractor:
+    """Extracts the title and statistics of authored Markdown files"""
+
+    # size of each bounded read
+    chunk_size = 4096
+    # max size of the file head searched for the front matter and the first heading
+    max_head_size = 64 * 1024
+    # files from this size on are memory-mapped for counting words
+    mmap_threshold = 1024 * 1024
+
+    markdown_extensions = ('.md', '.markdown')
+    # opening and closing lines of the front matter, with LF or CRLF line endings
+    front_matter_start_pattern = re.compile(rb'---\r?\n')
+    front_matter_end_pattern = re.compile(rb'\r?\n---\r?(?:\n|\Z)')
+    heading_pattern = re.compile(rb'^#{1,6}[ \t]+(?P<title>.+?)[ \t#]*$', re.MULTILINE)
+    word_pattern = re.compile(rb'\S+')
+
+    def __init__(self, cache_filename=None, max_workers=8):
+        """
+        Initialize the extractor.
+
+        cache_filename (str): optional file persisting the extracted contents
+        max_workers (int): number of files processed concurrently
+        """
+        self.cache_filename = cache_filename
+        self.max_workers = max_workers
+        # (stamp, contents) by filename
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def extract(self, filename, count_words=False):
+        """
+        Return the contents of filename as a dict.
+
+        The dict has the keys 'title' (None when there is none), 'front_matter'
+        and, if count_words is set, 'words'.
+        """
+        return self.extract_many([filename], count_words)[filename]
+
+    def extract_many(self, filenames, count_words=False):
+        """Return the contents of each of filenames, by filename"""
+        results = {}
+        pending = []
+        for filename in filenames:
+            stamp = self._stamp(filename)
+            cached = self.cache.get(filename)
+            if cached is not None and cached[0] == stamp and \
+               (not count_words or 'words' in cached[1]):
+                results[filename] = cached[1]
+            else:
+                pending.append((filename, stamp))
+
+        if len(pending) > 1:
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                contents = list(executor.map(lambda item: self._read(item[0], count_words),
+                                             pending))
+        else:
+            contents = [self._read(filename, count_words) for filename, _ in pending]
+
+        self.hits += len(results)
+        self.misses += len(pending)
+        for (filename, stamp), file_contents in zip(pending, contents):
+            self.cache[filename] = (stamp, file_contents)
+            results[filename] = file_contents
+
+        return results
+
+    def save(self):
+        """Persist the cache, if a cache file was given"""
+        if self.cache_filename is None:
+            return
+
+        temp_filename = self.cache_filename + '.tmp'
+        try:
+            # front matter values JSON cannot represent (e.g., dates) are cached as strings
+            with open(temp_filename, 'w') as cache_file:
+                json.dump([[filename, stamp, contents]
+                           for filename, (stamp, contents) in self.cache.items()], cache_file,
+                          default=str)
+            os.replace(temp_filename, self.cache_filename)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+        except (TypeError, ValueError) as err:
+            print('Error: Operation failed: {}'.format(err))
+        finally:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+
+    def _load(self):
+        """"""
+        if self.cache_filename is None or not os.path.exists(self.cache_filename):
+            return
+
+        try:
+            with open(self.cache_filename, 'r') as cache_file:
+                entries = json.load(cache_file)
+        except (IOError, ValueError):
+            # a missing or corrupted cache is just an empty cache
+            return
+
+        for filename, stamp, contents in entries:
+            self.cache[filename] = (stamp, contents)
+
+    @staticmethod
+    def _stamp(filename):
+        """"""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _read(self, filename, count_words):
+        """"""
+        contents = {'title': None, 'front_matter': {}}
+        if count_words:
+            contents['words'] = 0
+
+        try:
+            with open(filename, 'rb') as content_file:
+                if not filename.lower().endswith(self.markdown_extensions):
+                    if count_words:
+                        contents['words'] = self._count_words(content_file, b'', 0)
+                    return contents
+                head = self._read_head(content_file)
+                front_matter, body_offset = self._split_front_matter(head)
+                contents['front_matter'] = front_matter
+                contents['title'] = self._title(front_matter, head[body_offset:])
+                if count_words:
+                    contents['words'] = self._count_words(content_file, head, body_offset)
+        except IOError as err:
+            print('Error: Operation failed: {}: {}'.format(err.strerror, filename))
+
+        return contents
+
+    def _read_head(self, content_file):
+        """Read chunks until the head holds a heading, or max_head_size is reached"""
+        head = content_file.read(self.chunk_size)
+        while len(head) < self.max_head_size and not self._head_is_complete(head):
+            chunk = content_file.read(self.chunk_size)
+            if not chunk:
+                break
+            head += chunk
+
+        return head
+
+    def _head_is_complete(self, head):
+        """"""
+        body_offset = self._body_offset(head)
+        if body_offset == 0 and head.startswith(b'---'):
+            # front matter is not closed yet
+            return False
+
+        # the heading line must be complete as well
+        match = self.heading_pattern.search(head, body_offset)
+        return match is not None and head.find(b'\n', match.end()) != -1
+
+    def _body_offset(self, head):
+        """Return the offset of the body in head, 0 if the front matter is missing or not closed"""
+        front_matter_span = self._front_matter_span(head)
+
+        return 0 if front_matter_span is None else front_matter_span[2]
+
+    def _front_matter_span(self, head):
+        """Return the (start, end) of the front matter text and the body offset, or None"""
+        start_match = self.front_matter_start_pattern.match(head)
+        if start_match is None:
+            return None
+
+        # the closing line may immediately follow the opening one
+        end_match = self.front_matter_end_pattern.search(head, start_match.end() - 1)
+        if end_match is None:
+            return None
+
+        return start_match.end(), max(start_match.end(), end_match.start()), end_match.end()
+
+    def _split_front_matter(self, head):
+        """Return the parsed front matter and the offset of the body in head"""
+        front_matter_span = self._front_matter_span(head)
+        if front_matter_span is None:
+            return {}, 0
+
+        start, end, body_offset = front_matter_span
+        yaml_backend = YamlBackend.default()
+        front_matter_text = head[start:end]
+        try:
+            front_matter = yaml_backend.load(front_matter_text.decode('utf-8', errors='replace'))
+        except yaml_backend.errors:
+            front_matter = None
+
+        if not isinstance(front_matter, dict):
+            front_matter = {}
+
+        return front_matter, body_offset
+
+    def _title(self, front_matter, body):
+        """"""
+        title = front_matter.get('title')
+        if title is not None:
+            return str(title)
+
+        match = self.heading_pattern.search(body)
+        if match is None:
+            return None
+
+        return match.group('title').decode('utf-8', errors='replace').strip()
+
+    def _count_words(self, content_file, head, body_offset):
+        """Count the words of the body, memory-mapping large files"""
+        size = os.fstat(content_file.fileno()).st_size
+        if size >= self.mmap_threshold:
+            with mmap.mmap(content_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                return self._count_matches(mapped_file, body_offset)
+
+        body = head[body_offset:] + content_file.read()
+
+        return self._count_matches(body, 0)
+
+    def _count_matches(self, data, offset):
+        """"""
+        count = 0
+        for _ in self.word_pattern.finditer(data, offset):
+            count += 1
+
+        return count
@@ -2,29 +2,113 @@
 Represents the site directory tree.
 
 When scanned, an external performer is executed for each visited node.
+
+Directories are visited and listed in sorted order, so the scan is
+reproducible. Listings may be taken from a snapshot of a previous scan,
+which is reused for every directory whose modification time did not change.
 """
 
 import os
+import json
+import time
 
 class DirectoryTree:
     """Traverse a directory tree"""
 
-    def __init__(self, site_root):
+    # directories modified this recently (in seconds) are not trusted to
+    # change their modification time on the next change, so not snapshotted
+    racy_period = 2
+
+    def __init__(self, site_root, snapshot_filename=None):
         """"""
         self.site_root = site_root
+        self.snapshot_filename = snapshot_filename
         self.node_performer = None
+        # previous and current listings, as (mtime, [(name, is_dir), ...]) by path
+        self.snapshot = self._load_snapshot()
+        self.listings = {}
+        # is_dir flags of the entries of the current listings by path
+        self.entry_types = {}
+        # run statistics of all the scans
+        self.listed_dirs_count = 0
+        self.reused_listings_count = 0
 
     def scan(self, root_path, group_title, node_performer):
         """Entry point for the scan of the directory tree"""
         self.node_performer = node_performer
         self._scan_tree(root_path, group_title)
 
+    def reuse_listings(self, listings):
+        """Reuse the given (mtime, entries) listings by path for the unchanged directories"""
+        self.snapshot.update(listings)
+
+    def is_dir(self, path, filename):
+        """Return True if filename in the scanned directory path is a directory"""
+        return self.entry_types[self._snapshot_key(path)].get(filename, False)
+
+    def save_snapshot(self):
+        """Persist the listings of the scanned directories, if a snapshot file was given"""
+        if self.snapshot_filename is None:
+            return
+
+        racy_mtime = (time.time() - self.racy_period) * 1e9
+        snapshot = {path: listing for path, listing in self.listings.items()
+                    if listing[0] < racy_mtime}
+        temp_filename = self.snapshot_filename + '.tmp'
+        try:
+            with open(temp_filename, 'w') as snapshot_file:
+                json.dump(snapshot, snapshot_file, sort_keys=True)
+            os.replace(temp_filename, self.snapshot_filename)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
     def _scan_tree(self, path, group_title):
         """Scan the provided directory tree recursively"""
-        file_list = os.listdir(path)
-        self.node_performer(path, group_title, file_list)
+        entries = self._list_dir(path)
+        self.node_performer(path, group_title, [filename for filename, _ in entries])
+
+        for filename, is_dir in entries:
+            if is_dir:
+                self._scan_tree(os.path.join(path, filename), group_title)
+
+    def _list_dir(self, path):
+        """Return the sorted (name, is_dir) entries of path, from the snapshot if unchanged"""
+        key = self._snapshot_key(path)
+        mtime = os.stat(path).st_mtime_ns
+        listing = self.snapshot.get(key)
+        self.listed_dirs_count += 1
+        if listing is None or listing[0] != mtime:
+            dir_entries = os.scandir(path)
+            try:
+                entries = sorted((entry.name, entry.is_dir()) for entry in dir_entries)
+            finally:
+                # scandir() iterators are context managers from Python 3.6 only
+                if hasattr(dir_entries, 'close'):
+                    dir_entries.close()
+            listing = (mtime, entries)
+        else:
+            self.reused_listings_count += 1
+
+        self.listings[key] = listing
+        self.entry_types[key] = dict(listing[1])
+
+        return listing[1]
+
+    def _snapshot_key(self, path):
+        """"""
+        return os.path.relpath(path, self.site_root)
+
+    def _load_snapshot(self):
+        """"""
+        if self.snapshot_filename is None or not os.path.exists(self.snapshot_filename):
+            return {}
+
+        try:
+            with open(self.snapshot_filename, 'r') as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except (IOError, ValueError):
+            # a missing or corrupted snapshot is just an empty snapshot
+            return {}
 
-        for filename in file_list:
-            file_path = os.path.join(path, filename)
-            if os.path.isdir(file_path):
-                self._scan_tree(file_path, group_title)
+        return {path: (mtime, [tuple(entry) for entry in entries])
+                for path, (mtime, entries) in snapshot.items()}
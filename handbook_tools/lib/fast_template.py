@@ -0,0 +1,179 @@
+"""
+Renders a Jinja2 template through a specialized string builder when possible.
+
+The template is parsed once by Jinja2 itself, so whitespace control and the
+lexer settings apply exactly as in a regular render. If the syntax tree only
+holds literal text, variable substitutions, 'if' tests on variables (plain,
+'is defined', 'is undefined', 'not', 'and', 'or') and simple 'for' loops over
+variables, it is compiled into a Python function appending the output parts to
+a list. Any other template is rendered by Jinja2.
+"""
+
+from jinja2 import Template
+from jinja2 import nodes
+
+class _Unsupported(Exception):
+    """Raised on the template constructs the string builder does not specialize"""
+
+class _Undefined:
+    """Value of the variables missing from the render context, as rendered by Jinja2"""
+
+    def __bool__(self):
+        """"""
+        return False
+
+    def __iter__(self):
+        """"""
+        return iter(())
+
+    def __str__(self):
+        """"""
+        return ''
+
+class FastTemplate:
+    """Renders a Jinja2 template through a specialized string builder when possible"""
+
+    undefined = _Undefined()
+
+    def __init__(self, source):
+        """"""
+        self.template = Template(source)
+        self.render_function = None
+        # compilation state: Python names of the variables in scope (innermost
+        # scope last), number of loop variables and lines of the function body
+        self.scopes = [{}]
+        self.locals_count = 0
+        self.lines = []
+        try:
+            self.render_function = self._compile(self.template.environment.parse(source))
+        except _Unsupported:
+            # not specialized, rendered by Jinja2
+            pass
+
+    @property
+    def is_compiled(self):
+        """True if the template is rendered by the specialized string builder"""
+        return self.render_function is not None
+
+    def render(self, **context):
+        """Render the template with the given variables"""
+        if self.render_function is None:
+            return self.template.render(**context)
+
+        return self.render_function(context)
+
+    def _compile(self, template_node):
+        """Return the render function compiled from the template syntax tree"""
+        self._compile_nodes(template_node.body, 1)
+
+        # context variables are loaded once, at the beginning of the function
+        loads = ['    {} = context.get({!r}, undefined)'.format(local_name, name)
+                 for name, local_name in self.scopes[0].items()]
+        source = '\n'.join(['def render(context):',
+                            '    parts = []',
+                            '    append = parts.append'] + loads + self.lines +
+                           ["    return ''.join(parts)"])
+        namespace = {'undefined': self.undefined}
+        exec(compile(source, '<fast template>', 'exec'), namespace) # pylint: disable=exec-used
+
+        return namespace['render']
+
+    def _compile_nodes(self, body, depth):
+        """"""
+        for node in body:
+            if isinstance(node, nodes.Output):
+                self._compile_output(node, depth)
+            elif isinstance(node, nodes.If):
+                self._compile_if(node, depth)
+            elif isinstance(node, nodes.For):
+                self._compile_for(node, depth)
+            else:
+                raise _Unsupported
+
+    def _compile_output(self, node, depth):
+        """"""
+        for child in node.nodes:
+            if isinstance(child, nodes.TemplateData):
+                self._emit(depth, 'append({!r})'.format(child.data))
+            elif isinstance(child, nodes.Const):
+                self._emit(depth, 'append({!r})'.format(str(child.value)))
+            else:
+                self._emit(depth, 'append(str({}))'.format(self._compile_expression(child)))
+
+    def _compile_if(self, node, depth):
+        """"""
+        branches = [(node.test, node.body)]
+        branches += [(elif_node.test, elif_node.body) for elif_node in getattr(node, 'elif_', [])]
+        keyword = 'if'
+        for test, body in branches:
+            self._emit(depth, '{} {}:'.format(keyword, self._compile_test(test)))
+            self._compile_block(body, depth + 1)
+            keyword = 'elif'
+        if node.else_:
+            self._emit(depth, 'else:')
+            self._compile_block(node.else_, depth + 1)
+
+    def _compile_for(self, node, depth):
+        """"""
+        if node.else_ or node.test is not None or node.recursive or \
+           not isinstance(node.target, nodes.Name):
+            raise _Unsupported
+
+        iterable = self._compile_expression(node.iter)
+        # the loop variable is only visible inside the loop
+        self.locals_count += 1
+        loop_local_name = 'l{}_{}'.format(self.locals_count, node.target.name)
+        self.scopes.append({node.target.name: loop_local_name, 'loop': None})
+        self._emit(depth, 'for {} in {}:'.format(loop_local_name, iterable))
+        self._compile_block(node.body, depth + 1)
+        self.scopes.pop()
+
+    def _compile_block(self, body, depth):
+        """"""
+        lines_count = len(self.lines)
+        self._compile_nodes(body, depth)
+        if len(self.lines) == lines_count:
+            self._emit(depth, 'pass')
+
+    def _compile_test(self, node):
+        """"""
+        if isinstance(node, nodes.Test) and not (node.args or node.kwargs or
+                                                 node.dyn_args or node.dyn_kwargs):
+            if node.name == 'defined':
+                return '({} is not undefined)'.format(self._compile_expression(node.node))
+            if node.name == 'undefined':
+                return '({} is undefined)'.format(self._compile_expression(node.node))
+        elif isinstance(node, nodes.Not):
+            return '(not {})'.format(self._compile_test(node.node))
+        elif isinstance(node, nodes.And):
+            return '({} and {})'.format(self._compile_test(node.left),
+                                        self._compile_test(node.right))
+        elif isinstance(node, nodes.Or):
+            return '({} or {})'.format(self._compile_test(node.left),
+                                       self._compile_test(node.right))
+        elif isinstance(node, nodes.Name):
+            return self._compile_expression(node)
+
+        raise _Unsupported
+
+    def _compile_expression(self, node):
+        """Return the Python name of the variable referenced by node"""
+        if not isinstance(node, nodes.Name) or node.ctx != 'load' or \
+           node.name in self.template.environment.globals:
+            raise _Unsupported
+
+        for scope in reversed(self.scopes):
+            if node.name in scope:
+                if scope[node.name] is None:
+                    # e.g., the special 'loop' variable
+                    raise _Unsupported
+                return scope[node.name]
+
+        local_name = 'v{}'.format(len(self.scopes[0]))
+        self.scopes[0][node.name] = local_name
+
+        return local_name
+
+    def _emit(self, depth, line):
+        """"""
+        self.lines.append('    ' * depth + line)
@@ -0,0 +1,44 @@
+"""
+Cache of values loaded from files.
+
+A cached value is reused for as long as the modification time and size of its
+file do not change, so a long running process (e.g., the 'serve' daemon) keeps
+a warm model of the site that is invalidated on file changes.
+"""
+
+import os
+
+class FileCache:
+    """Cache of values loaded from files, invalidated on file changes"""
+
+    def __init__(self):
+        """"""
+        # (stamp, value) by (filename, loader name)
+        self.values = {}
+
+    def load(self, filename, load_function):
+        """Return load_function(filename), reusing the cached value if filename is unchanged"""
+        key = (filename, load_function.__name__)
+        stamp = self._stamp(filename)
+        cached = self.values.get(key)
+        if cached is not None and stamp is not None and cached[0] == stamp:
+            return cached[1]
+
+        value = load_function(filename)
+        self.values[key] = (stamp, value)
+
+        return value
+
+    def clear(self):
+        """Drop all the cached values"""
+        self.values = {}
+
+    @staticmethod
+    def _stamp(filename):
+        """"""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+
+        return (stat.st_mtime_ns, stat.st_size)
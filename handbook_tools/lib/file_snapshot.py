@@ -0,0 +1,172 @@
+"""
+Compact binary snapshot of the authored files, for finding what changed since.
+
+A snapshot holds the listing and modification time of every scanned directory
+and the size, modification time and optional SHA-1 content hash of every
+authored file, by path relative to the site root. Directory listings are
+reused by later scans for every directory whose modification time did not
+change (see DirectoryTree), and content hashes are reused for every file whose
+size and modification time did not change, so only what changed is read.
+
+The file format is a magic string followed by zlib-compressed records packed
+with struct, all integers being little-endian:
+- flags (B): 1 if the files have content hashes
+- directories count (I), then for each: path, mtime_ns (q), entries count (I),
+  and for each entry: name, is_dir (B)
+- files count (I), then for each: path, size (Q), mtime_ns (q) and the 20-byte
+  hash, if hashed
+Strings are UTF-8 encoded with a length prefix (H).
+"""
+
+import os
+import time
+import zlib
+import struct
+import hashlib
+
+class FileSnapshot:
+    """Snapshot of the authored files"""
+
+    magic = b'HBSNAP\x01'
+    hash_size = 20
+    # size of each read when hashing files
+    chunk_size = 65536
+
+    def __init__(self, with_hashes=False):
+        """
+        Initialize an empty snapshot.
+
+        with_hashes (bool): record the content hash of each file
+        """
+        self.with_hashes = with_hashes
+        # (mtime_ns, [(name, is_dir), ...]) by directory path
+        self.dirs = {}
+        # (size, mtime_ns, hash or None) by file path
+        self.files = {}
+
+    def add_dir(self, path, mtime, entries):
+        """Record the listing of the directory path"""
+        self.dirs[path] = (mtime, entries)
+
+    def add_file(self, path, full_filename, previous_snapshot=None):
+        """Record the stamp and, if hashed, the content hash of the file path"""
+        stat = os.stat(full_filename)
+        size, mtime = stat.st_size, stat.st_mtime_ns
+        file_hash = None
+        if self.with_hashes:
+            previous_file = previous_snapshot.files.get(path) if previous_snapshot else None
+            if previous_file is not None and previous_file[:2] == (size, mtime) and \
+               previous_file[2] is not None:
+                file_hash = previous_file[2]
+            else:
+                file_hash = self._hash_file(full_filename)
+        self.files[path] = (size, mtime, file_hash)
+
+    def diff(self, new_snapshot):
+        """Return the sorted added, removed and modified file paths in new_snapshot"""
+        added = sorted(set(new_snapshot.files) - set(self.files))
+        removed = sorted(set(self.files) - set(new_snapshot.files))
+        modified = []
+        for path in sorted(set(self.files) & set(new_snapshot.files)):
+            old_file = self.files[path]
+            new_file = new_snapshot.files[path]
+            if old_file[:2] == new_file[:2]:
+                continue
+            # touched files with unchanged contents are not modified
+            if old_file[2] is None or new_file[2] is None or old_file[2] != new_file[2]:
+                modified.append(path)
+
+        return added, removed, modified
+
+    def save(self, snapshot_filename, racy_period=2):
+        """
+        Persist the snapshot.
+
+        Directories modified less than racy_period seconds ago may change again
+        without changing their modification time, so are not trusted by later scans.
+        """
+        racy_mtime = (time.time() - racy_period) * 1e9
+        records = [struct.pack('<BI', int(self.with_hashes), len(self.dirs))]
+        for path, (mtime, entries) in sorted(self.dirs.items()):
+            records.append(self._pack_string(path))
+            records.append(struct.pack('<qI', mtime if mtime < racy_mtime else -1, len(entries)))
+            for name, is_dir in entries:
+                records.append(self._pack_string(name) + struct.pack('<B', is_dir))
+        records.append(struct.pack('<I', len(self.files)))
+        for path, (size, mtime, file_hash) in sorted(self.files.items()):
+            records.append(self._pack_string(path) + struct.pack('<Qq', size, mtime))
+            if self.with_hashes:
+                records.append(file_hash)
+
+        temp_filename = snapshot_filename + '.tmp'
+        try:
+            with open(temp_filename, 'wb') as snapshot_file:
+                snapshot_file.write(self.magic + zlib.compress(b''.join(records)))
+            os.replace(temp_filename, snapshot_filename)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
+    @classmethod
+    def load(cls, snapshot_filename):
+        """Return the persisted snapshot, or None if it could not be read"""
+        try:
+            with open(snapshot_filename, 'rb') as snapshot_file:
+                data = snapshot_file.read()
+            if not data.startswith(cls.magic):
+                return None
+            return cls._unpack(zlib.decompress(data[len(cls.magic):]))
+        except (IOError, zlib.error, struct.error, UnicodeDecodeError):
+            return None
+
+    @classmethod
+    def _unpack(cls, data):
+        """"""
+        offset = 0
+        def unpack(record_format):
+            nonlocal offset
+            values = struct.unpack_from(record_format, data, offset)
+            offset += struct.calcsize(record_format)
+            return values
+        def unpack_string():
+            nonlocal offset
+            length, = unpack('<H')
+            offset += length
+            return data[offset - length:offset].decode('utf-8')
+
+        with_hashes, dirs_count = unpack('<BI')
+        snapshot = cls(bool(with_hashes))
+        for _ in range(dirs_count):
+            path = unpack_string()
+            mtime, entries_count = unpack('<qI')
+            entries = []
+            for _ in range(entries_count):
+                name = unpack_string()
+                entries.append((name, bool(unpack('<B')[0])))
+            snapshot.dirs[path] = (mtime, entries)
+        files_count, = unpack('<I')
+        for _ in range(files_count):
+            path = unpack_string()
+            size, mtime = unpack('<Qq')
+            file_hash = None
+            if with_hashes:
+                offset += cls.hash_size
+                file_hash = data[offset - cls.hash_size:offset]
+            snapshot.files[path] = (size, mtime, file_hash)
+
+        return snapshot
+
+    @staticmethod
+    def _pack_string(string):
+        """"""
+        encoded = string.encode('utf-8')
+
+        return struct.pack('<H', len(encoded)) + encoded
+
+    def _hash_file(self, filename):
+        """"""
+        file_hash = hashlib.sha1()
+        with open(filename, 'rb') as hashed_file:
+            for chunk in iter(lambda: hashed_file.read(self.chunk_size), b''):
+                file_hash.update(chunk)
+
+        return file_hash.digest()
@@ -0,0 +1,33 @@
+"""
+Writes the build output to the local filesystem.
+
+All paths given to the writer are relative to its root directory.
+"""
+
+import os
+
+class FileWriter:
+    """Synchronous writer of the build output to the local filesystem"""
+
+    def __init__(self, root):
+        """"""
+        self.root = root
+
+    def make_dir(self, path):
+        """Create the directory at path"""
+        os.mkdir(self._full_path(path))
+
+    def write_file(self, path, content):
+        """Write content to the file at path"""
+        try:
+            with open(self._full_path(path), 'w') as output_file:
+                output_file.write(content)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
+    def close(self):
+        """Complete all the pending operations"""
+
+    def _full_path(self, path):
+        """"""
+        return os.path.join(self.root, path)
@@ -0,0 +1,89 @@
+"""
+Persistent cache of rendered fragments.
+
+A fragment is the result of a deterministic render function. It is addressed
+by a hash of the function name and its exact inputs, so a changed input
+simply misses the cache. The cache is stored on disk as a single JSON file
+and is bounded in size by evicting the least recently used fragments.
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+class FragmentCache:
+    """Size-bounded LRU cache of rendered fragments, persisted on disk"""
+
+    def __init__(self, cache_filename, max_size=8 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        cache_filename (str): file holding the persisted cache
+        max_size (int): max total size of the cached fragments, in characters
+        """
+        self.cache_filename = cache_filename
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # fragments by key, least recently used first
+        self.fragments = OrderedDict()
+        self._load()
+
+    def render(self, name, inputs, render_function):
+        """Return the fragment rendered by render_function(*inputs), cached or fresh"""
+        key = self._key(name, inputs)
+        if key in self.fragments:
+            self.hits += 1
+            self.fragments.move_to_end(key)
+            return self.fragments[key][0]
+
+        self.misses += 1
+        fragment = render_function(*inputs)
+        self._store(key, fragment)
+
+        return fragment
+
+    def save(self):
+        """Persist the cache"""
+        temp_filename = self.cache_filename + '.tmp'
+        try:
+            with open(temp_filename, 'w') as cache_file:
+                json.dump([[key, fragment] for key, (fragment, _) in self.fragments.items()],
+                          cache_file)
+            os.replace(temp_filename, self.cache_filename)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
+    def _load(self):
+        """"""
+        if not os.path.exists(self.cache_filename):
+            return
+
+        try:
+            with open(self.cache_filename, 'r') as cache_file:
+                entries = json.load(cache_file)
+        except (IOError, ValueError):
+            # a missing or corrupted cache is just an empty cache
+            return
+
+        for key, fragment in entries:
+            self._store(key, fragment)
+
+    def _store(self, key, fragment):
+        """"""
+        size = len(json.dumps(fragment))
+        self.fragments[key] = (fragment, size)
+        self.size += size
+
+        while self.size > self.max_size and self.fragments:
+            _, (_, evicted_size) = self.fragments.popitem(last=False)
+            self.size -= evicted_size
+
+    @staticmethod
+    def _key(name, inputs):
+        """"""
+        serialized_inputs = json.dumps([name, inputs], sort_keys=True)
+
+        return hashlib.sha1(serialized_inputs.encode('utf-8')).hexdigest()
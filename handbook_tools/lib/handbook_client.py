@@ -0,0 +1,50 @@
+"""
+Client of the daemon answering handbook requests (see HandbookServer).
+"""
+
+import os
+import json
+import socket
+
+class HandbookClient:
+    """Client of the daemon answering handbook requests"""
+
+    # socket file name of the daemon, relative to the site root
+    socket_name = '.handbook.sock'
+
+    def __init__(self, site_root):
+        """"""
+        self.socket_filename = self.socket_full_filename(site_root)
+
+    @classmethod
+    def socket_full_filename(cls, site_root):
+        """Return the socket file of the daemon serving site_root"""
+        return os.path.join(site_root, cls.socket_name)
+
+    def is_available(self):
+        """Return True if a daemon answers requests on the socket"""
+        return self.request({'command': 'ping'}) is not None
+
+    def request(self, request):
+        """Send a request and return the decoded response, or None if no daemon answered"""
+        if not hasattr(socket, 'AF_UNIX') or not os.path.exists(self.socket_filename):
+            return None
+
+        try:
+            with self._connect() as client_socket:
+                client_socket.sendall(json.dumps(request).encode('utf-8') + b'\n')
+                with client_socket.makefile('rb') as response_file:
+                    return json.loads(response_file.readline().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def _connect(self):
+        """"""
+        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client_socket.connect(self.socket_filename)
+        except OSError:
+            client_socket.close()
+            raise
+
+        return client_socket
@@ -0,0 +1,113 @@
+"""
+Daemon answering handbook requests over a local Unix domain socket.
+
+The daemon keeps the imported commands and the loaded site configuration warm
+in memory (see FileCache), so each request only pays for the work that
+depends on changed files.
+
+The protocol is a single JSON object per line. Each connection carries one
+request followed by one response:
+
+  request:  {"command": "toc", "args": ["--depth=2"]}
+            {"command": "status", "args": []}
+            {"command": "render", "node": "<node id or path>"}
+            {"command": "ping"}
+  response: {"ok": true, "output": "<command output>"}
+
+Requests are served one at a time, as commands write their output to the
+redirected standard output.
+"""
+
+import os
+import io
+import json
+import contextlib
+import socketserver
+from handbook_tools.commands.status import Status
+from handbook_tools.commands.toc import Toc
+from handbook_tools.lib.lazy_renderer import LazyRenderer
+
+class HandbookServer:
+    """Daemon answering handbook requests over a local Unix domain socket"""
+
+    # command classes of the forwarded commands
+    commands = {'status': Status, 'toc': Toc}
+
+    def __init__(self, site_root, socket_filename, verbose=False):
+        """"""
+        self.site_root = site_root
+        self.socket_filename = socket_filename
+        self.verbose = verbose
+        self.global_args = {'--verbose': verbose, '--root': site_root}
+        # memoized index files of the rendered nodes
+        self.renderer = LazyRenderer(site_root, verbose)
+        self.server = socketserver.UnixStreamServer(socket_filename, self._handler_class())
+
+    @staticmethod
+    def remove_stale_socket(socket_filename):
+        """Remove the socket file left by a daemon that is no longer running"""
+        if os.path.exists(socket_filename):
+            os.remove(socket_filename)
+
+    def serve_forever(self):
+        """Serve requests until shutdown() is called"""
+        self.server.serve_forever()
+
+    def shutdown(self):
+        """Stop serve_forever() (from another thread)"""
+        self.server.shutdown()
+
+    def close(self):
+        """Release the socket"""
+        self.server.server_close()
+        if os.path.exists(self.socket_filename):
+            os.remove(self.socket_filename)
+
+    def handle_request(self, request):
+        """Return the response to a decoded request"""
+        command = request.get('command')
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                if command == 'ping':
+                    pass
+                elif command == 'render':
+                    contents = self.renderer.render(request.get('node', ''))
+                    if contents is None:
+                        return {'ok': False, 'output': 'Error: Unknown node\n'}
+                    output.write(contents)
+                elif command in self.commands:
+                    self.commands[command](request.get('args', []), self.global_args).execute()
+                else:
+                    return {'ok': False, 'output': 'Error: Unknown command\n'}
+        except SystemExit:
+            # commands terminate on errors, after printing them
+            return {'ok': False, 'output': output.getvalue()}
+
+        return {'ok': True, 'output': output.getvalue()}
+
+    def _handler_class(self):
+        """Return a request handler class bound to this server"""
+        server = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            """Handles a single request per connection"""
+
+            def handle(self):
+                """"""
+                request_line = self.rfile.readline()
+                if not request_line.strip():
+                    # the client disconnected without sending a request
+                    return
+                try:
+                    request = json.loads(request_line.decode('utf-8'))
+                    response = server.handle_request(request)
+                except ValueError:
+                    response = {'ok': False, 'output': 'Error: Invalid request\n'}
+                try:
+                    self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client disconnected without waiting for the response
+                    pass
+
+        return RequestHandler
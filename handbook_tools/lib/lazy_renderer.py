@@ -0,0 +1,67 @@
+"""
+Renders the index files of the navigation nodes on demand, for preview servers.
+
+Nothing is built up front: a node's index file is rendered on the first request
+for it, with the formatting of the 'build' command, and memoized. A memoized
+index file is rendered again only when one of the files it is rendered from
+(the navigation tree configuration, the index template or the node metadata)
+changed since, as told by their modification time and size (see BuildState).
+"""
+
+import os
+from urllib.parse import unquote
+from handbook_tools.commands.build import Build
+from handbook_tools.lib.build_state import BuildState
+
+class LazyRenderer:
+    """Renders and memoizes the index files of the navigation nodes on demand"""
+
+    index_filename = 'index.md'
+
+    def __init__(self, site_root, verbose=False, no_stop=False):
+        """
+        Initialize the renderer.
+
+        site_root (str): the site root
+        no_stop (bool): render the nodes of stopped subtrees too
+        """
+        global_args = {'--verbose': verbose, '--root': site_root}
+        self.build = Build(['--no-stop'] if no_stop else [], global_args)
+        # (dependency stamps, contents) by node path
+        self.memo = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, key):
+        """
+        Return the index file contents of a node, or None if no node matches key.
+
+        key (str): the node id, the node path relative to the site root, or the
+        URL path of the node directory or index file (e.g., '/Handbook/Development/index.md'),
+        the empty path matching the root node
+        """
+        node = self.build.find_node(self.node_key(key) or self.build.root_node_name())
+        if node is None:
+            return None
+
+        root_path = node[0]
+        stamps = [BuildState.file_stamp(filename)
+                  for filename in self.build.index_dependencies(node)]
+        memoized = self.memo.get(root_path)
+        if memoized is not None and memoized[0] == stamps:
+            self.hits += 1
+            return memoized[1]
+
+        self.misses += 1
+        contents = self.build.render_index(node)
+        self.memo[root_path] = (stamps, contents)
+
+        return contents
+
+    def node_key(self, key):
+        """Return the node id or path matching a URL path"""
+        names = [name for name in unquote(key).split('/') if name]
+        if names and names[-1] == self.index_filename:
+            names.pop()
+
+        return os.path.join(*names) if names else ''
@@ -0,0 +1,26 @@
+"""
+Keeps the build output in memory instead of writing it to the filesystem.
+
+All paths given to the writer are relative to the site root.
+"""
+
+class MemoryWriter:
+    """Writer of the build output into an in-memory virtual filesystem"""
+
+    def __init__(self):
+        """"""
+        # created directories in creation order
+        self.dirs = []
+        # file contents by file path
+        self.files = {}
+
+    def make_dir(self, path):
+        """Create the directory at path"""
+        self.dirs.append(path)
+
+    def write_file(self, path, content):
+        """Write content to the file at path"""
+        self.files[path] = content
+
+    def close(self):
+        """Complete all the pending operations"""
@@ -2,17 +2,27 @@
 Represents the configuration navigation tree.
 
 When scanned, an external performer is executed for each visited node.
+
+A scan may be limited to the subtree of a single node, located by its path or
+by its id. Paths are resolved by descending along the path only, and ids are
+resolved with an index of the built nodes, which is reused for as long as the
+configuration file does not change.
 """
 
 import os
-import shutil
-import yaml
 from handbook_tools.lib.navigation_tree_node import NavigationTreeNode
 from handbook_tools.lib.handbook_validation import HandbookValidation
+from handbook_tools.lib.file_cache import FileCache
+from handbook_tools.lib.yaml_backend import YamlBackend
 
 class NavigationTree:
     """Represents the configuration navigation tree"""
 
+    # loaded configuration files, shared by all the instances
+    file_cache = FileCache()
+    # (tree, index of the built nodes by id) by (site root, no_stop), shared by all the instances
+    id_indexes = {}
+
     def __init__(self, site_root, verbose=False, no_stop=False):
         """"""
         self.site_root = site_root
@@ -24,23 +34,73 @@ class NavigationTree:
         # should be save as UTF-8 without BOM (i.e., Byte Order Mark)
         self.tree_config_filename = 'root.yml'
         self.node_performer = None
+        # run statistics of all the scans
+        self.visited_nodes_count = 0
+        self.stopped_subtrees_count = 0
         self.tree = self.load_tree_config_file(self.navigation_path, self.tree_config_filename)
 
-    def scan(self, node_performer):
-        """Entry point for the scan of the configuration navigation tree"""
+    def scan(self, node_performer, subtree=None):
+        """
+        Entry point for the scan of the configuration navigation tree.
+
+        subtree (tuple): optional subtree to scan instead of the whole tree,
+        as returned by find_subtree()
+        """
         self.node_performer = node_performer
-        self._scan_tree(self.site_root, self.tree)
+        path, tree = subtree if subtree is not None else (self.site_root, self.tree)
+        self._scan_tree(path, tree)
+
+    def visit(self, node_performer, subtree):
+        """Execute the performer for the root node of subtree only"""
+        self.node_performer = node_performer
+        path, tree = subtree
+        self._visit_node(path, tree)
+
+    def find_subtree(self, key):
+        """
+        Locate the subtree of a built node.
 
-    def fail_on_existing_root_node_dir(self, overwrite=False):
-        """Make sure the root node directory does not exist already"""
+        key (str): the node path relative to the site root (e.g., 'Handbook/Development'),
+        or the node id
+
+        Return a (path, tree) tuple of the location for the root directory of the
+        subtree and the subtree, or None if no built node matches key.
+        """
+        names = os.path.normpath(key.strip('/')).split(os.sep)
+        subtree = self._find_subtree_by_names(names)
+        if subtree is None:
+            subtree = self._id_index().get(key)
+
+        return subtree
+
+    def subtree_path(self, subtree):
+        """Return the root directory of subtree"""
+        path, tree = subtree
+        root_node, _ = self._get_root_node_and_children_trees(tree)
+
+        return os.path.join(path, root_node.name)
+
+    def root_node_name(self):
+        """Return the name of the root node of the tree"""
         root_node, _ = self._get_root_node_and_children_trees(self.tree)
-        tree_root_path = os.path.join(self.site_root, root_node.name)
 
-        if not overwrite:
-            warning_message = 'Target directory already exists'
-            HandbookValidation.confirm_or_fail_on_existing_path(tree_root_path, warning_message)
+        return root_node.name
+
+    def sibling_names(self, subtree):
+        """Return the names of the root node of subtree and of its siblings, in order"""
+        parent_path, _ = subtree
+        if parent_path == self.site_root:
+            return [self.root_node_name()]
+
+        names = os.path.relpath(parent_path, self.site_root).split(os.sep)
+        _, parent_tree = self._find_subtree_by_names(names)
+        _, forest = self._get_root_node_and_children_trees(parent_tree)
 
-        shutil.rmtree(tree_root_path, ignore_errors=True)
+        return self._forest_to_root_names(forest)
+
+    def tree_config_full_filename(self):
+        """Return the navigation tree configuration file"""
+        return os.path.join(self.site_root, self.navigation_path, self.tree_config_filename)
 
     def load_tree_config_file(self, path, filename):
         """Load navigation tree configuration file"""
@@ -50,13 +110,18 @@ class NavigationTree:
         HandbookValidation.fail_on_nonexisting_path(tree_config_full_filename, error_message)
 
         try:
-            with open(tree_config_full_filename, 'r') as tree_config_file:
-                navigation_tree = yaml.load(tree_config_file, Loader=yaml.FullLoader)
+            navigation_tree = self.file_cache.load(tree_config_full_filename,
+                                                   self._load_tree_config)
         except IOError as err:
             print('Error: operation failed: {}'.format(err.strerror))
 
         return navigation_tree
 
+    @staticmethod
+    def _load_tree_config(filename):
+        """"""
+        return YamlBackend.default().load_file(filename)
+
     def _scan_tree(self, path, tree):
         """
         Scan the provided navigation tree recursively.
@@ -69,20 +134,76 @@ class NavigationTree:
                 For more information and examples see: config/navigation/README.md
         """
 
+        visited = self._visit_node(path, tree)
+        if visited is None:
+            return
+
+        # continue building the navigation tree recursively
+        root_path, root_children_trees = visited
+        for child_tree in root_children_trees:
+            self._scan_tree(root_path, child_tree)
+
+    def _visit_node(self, path, tree):
+        """
+        Execute the performer for the root node of tree.
+
+        Return the root directory and the children trees of the root node, or
+        None if the root node is not built.
+        """
         root_node, root_children_trees = self._get_root_node_and_children_trees(tree)
         root_children_nodes = self._forest_to_root_nodes(root_children_trees)
 
         # bail out if the tree root is marked as a 'stub' with the 'stop' tag
         # and we were not asked to ignore it
         if root_node.options['stop'] and not self.no_stop:
-            return
+            self.stopped_subtrees_count += 1
+            return None
 
+        self.visited_nodes_count += 1
         root_path = os.path.join(path, root_node.name)
         self.node_performer(root_path, root_node.options, root_children_nodes)
 
-        # continue building the navigation tree recursively
-        for child_tree in root_children_trees:
-            self._scan_tree(root_path, child_tree)
+        return root_path, root_children_trees
+
+    def _find_subtree_by_names(self, names):
+        """Locate the subtree of a built node by descending along its path names"""
+        subtree = None
+        path = self.site_root
+        forest = [self.tree]
+        for name in names:
+            forest_names = self._forest_to_root_names(forest)
+            if name not in forest_names:
+                return None
+            tree = forest[forest_names.index(name)]
+            root_node, forest = self._get_root_node_and_children_trees(tree)
+            if root_node.options['stop'] and not self.no_stop:
+                return None
+            subtree = (path, tree)
+            path = os.path.join(path, root_node.name)
+
+        return subtree
+
+    def _id_index(self):
+        """Return the subtree of the first built node (in pre-order) using each id"""
+        index_key = (self.site_root, self.no_stop)
+        cached = self.id_indexes.get(index_key)
+        if cached is not None and cached[0] is self.tree:
+            return cached[1]
+
+        id_index = {}
+        stack = [(self.site_root, self.tree)]
+        while stack:
+            path, tree = stack.pop()
+            root_node, root_children_trees = self._get_root_node_and_children_trees(tree)
+            if root_node.options['stop'] and not self.no_stop:
+                continue
+            id_index.setdefault(root_node.options['id'], (path, tree))
+            root_path = os.path.join(path, root_node.name)
+            stack.extend((root_path, child_tree) for child_tree in reversed(root_children_trees))
+
+        self.id_indexes[index_key] = (self.tree, id_index)
+
+        return id_index
 
     @staticmethod
     def _get_root_node_and_children_trees(tree):
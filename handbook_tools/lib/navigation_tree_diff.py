@@ -0,0 +1,136 @@
+"""
+Computes the changes between two compiled navigation trees.
+
+A compiled navigation tree is an ordered dict of the visited nodes in
+pre-order, mapping the node path (relative to the site root) to a dict with
+the node 'id' and a 'signature' of everything its index file is rendered from.
+
+Nodes of the new tree are matched to nodes of the old tree by path first, and
+otherwise by a unique id, which identifies renamed and moved nodes. Renamed and
+moved directories are relocated with a single rename of their top-most
+directory, carrying along their descendants. The changes are ordered for
+execution: creations and renames in pre-order, followed by deletions.
+"""
+
+import os
+
+class NavigationTreeDiff:
+    """Changes turning the directories of an old navigation tree into a new one"""
+
+    def __init__(self, old_nodes, new_nodes):
+        """
+        Compute the changes.
+
+        old_nodes (OrderedDict of {str: dict}): the previous compiled navigation tree
+        new_nodes (OrderedDict of {str: dict}): the current compiled navigation tree
+        """
+        self.old_nodes = old_nodes
+        self.new_nodes = new_nodes
+        # list of (action, path, target) tuples in execution order, with the
+        # actions 'create', 'rename' and 'delete'
+        self.changes = []
+        # paths of the index files to (re)render
+        self.renders = []
+        # True if the changes could not be computed without clobbering a
+        # directory that is still needed, in which case a full build is required
+        self.conflict = False
+        self._diff()
+
+    def count(self, action):
+        """Return the number of changes of the given action"""
+        return len([change for change in self.changes if change[0] == action])
+
+    def _diff(self):
+        """"""
+        sources = self._match_sources()
+        claimed = set(sources.values())
+        renames = []
+
+        for path, node in self.new_nodes.items():
+            source = sources.get(path)
+            if source is not None:
+                location = self._relocate(source, renames)
+                if location != path:
+                    if self._occupant(path, renames) is not None:
+                        self.conflict = True
+                        return
+                    renames.append((location, path))
+                    self.changes.append(('rename', location, path))
+                if self.old_nodes[source]['signature'] != node['signature']:
+                    self.renders.append(path)
+                continue
+
+            occupant = self._occupant(path, renames)
+            if occupant is None:
+                self.changes.append(('create', path, None))
+            elif occupant in claimed:
+                self.conflict = True
+                return
+            else:
+                # reuse the leftover directory of an unmatched old node
+                claimed.add(occupant)
+            self.renders.append(path)
+
+        deletes = []
+        for path in self.old_nodes:
+            if path in claimed:
+                continue
+            location = self._relocate(path, renames)
+            if not any(self._is_under(location, deleted) for deleted in deletes):
+                deletes.append(location)
+                self.changes.append(('delete', location, None))
+
+    def _match_sources(self):
+        """Return the old node path matching each matched new node path"""
+        old_ids = self._unique_ids(self.old_nodes)
+        new_ids = self._unique_ids(self.new_nodes)
+
+        sources = {}
+        for path, node in self.new_nodes.items():
+            if path in self.old_nodes:
+                sources[path] = path
+                continue
+
+            old_path = old_ids.get(node['id'])
+            if old_path is not None and old_path not in self.new_nodes \
+               and new_ids.get(node['id']) == path:
+                sources[path] = old_path
+
+        return sources
+
+    @staticmethod
+    def _unique_ids(nodes):
+        """Return the path of each id used by exactly one node"""
+        paths = {}
+        duplicates = set()
+        for path, node in nodes.items():
+            if node['id'] in paths:
+                duplicates.add(node['id'])
+            paths[node['id']] = path
+
+        return {node_id: path for node_id, path in paths.items() if node_id not in duplicates}
+
+    def _relocate(self, path, renames):
+        """Return the current location of the directory of an old path"""
+        for source, target in renames:
+            if self._is_under(path, source):
+                path = target + path[len(source):]
+
+        return path
+
+    def _occupant(self, location, renames):
+        """Return the old path whose directory currently is at location, if any"""
+        path = location
+        for source, target in reversed(renames):
+            if self._is_under(path, target):
+                path = source + path[len(target):]
+
+        if path in self.old_nodes and self._relocate(path, renames) == location:
+            return path
+
+        return None
+
+    @staticmethod
+    def _is_under(path, root):
+        """"""
+        return path == root or path.startswith(root + os.sep)
@@ -0,0 +1,110 @@
+"""
+Validates a configuration navigation tree.
+
+The whole tree is validated in a single pass and all the errors are reported
+at once. Duplicate ids and colliding sibling names are detected with hash
+indexes, so validation time is linear in the number of nodes.
+
+The following errors are reported:
+- invalid nodes, which are neither a name nor a one-item dictionary of a name
+  and a list of children trees
+- unknown tags (e.g., '@stpo')
+- names that are blank or not valid directory names
+- sibling names colliding on case-insensitive filesystems
+- nodes of the built tree resolving to the same id, thus sharing a metadata file
+"""
+
+import os
+from handbook_tools.lib.navigation_tree_node import NavigationTreeNode
+
+class NavigationTreeLinter:
+    """Validates a configuration navigation tree"""
+
+    def __init__(self, tree, no_stop=False):
+        """
+        Initialize the linter.
+
+        tree (dict of {str: str} or str): the navigation tree, as loaded from root.yml
+        no_stop (bool): validate the entire tree as built when ignoring 'stop' tags
+        """
+        self.tree = tree
+        self.no_stop = no_stop
+        self.errors = []
+        self.nodes_count = 0
+
+    def lint(self):
+        """Validate the tree and return the list of errors"""
+        self.errors = []
+        self.nodes_count = 0
+        # path of the first node using each id
+        id_paths = {}
+        # stack of (parent path, tree, is built, names of the visited siblings) items,
+        # children are pushed in reverse order to be visited in order
+        stack = [('', self.tree, True, {})]
+        while stack:
+            parent_path, tree, is_parent_built, sibling_names = stack.pop()
+            self.nodes_count += 1
+            node, children_trees = self._split_tree(parent_path, tree)
+            if node is None:
+                continue
+
+            path = parent_path + '/' + node.name
+            for tag in node.unknown_tags:
+                self._error(path, 'Unknown tag: @{}'.format(tag))
+
+            if not is_parent_built:
+                stack.extend((path, child_tree, False, None)
+                             for child_tree in reversed(children_trees))
+                continue
+
+            # siblings colliding on case-insensitive filesystems
+            folded_name = node.name.casefold()
+            if folded_name in sibling_names:
+                self._error(parent_path, 'Colliding names: {} and {}'. \
+                            format(sibling_names[folded_name], node.name))
+            else:
+                sibling_names[folded_name] = node.name
+
+            is_built = self.no_stop or not node.options['stop']
+            if is_built:
+                node_id = node.options['id']
+                if node_id in id_paths:
+                    self._error(path, 'Duplicate id: {} (used by {})'. \
+                                format(node_id, id_paths[node_id]))
+                else:
+                    id_paths[node_id] = path
+
+            children_names = {}
+            stack.extend((path, child_tree, is_built, children_names)
+                         for child_tree in reversed(children_trees))
+
+        return self.errors
+
+    def _split_tree(self, parent_path, tree):
+        """Return the parsed root node and the children trees of tree, or None if invalid"""
+        if isinstance(tree, dict) and len(tree) == 1:
+            root_node, children_trees = next(iter(tree.items()))
+        else:
+            root_node, children_trees = tree, []
+
+        if not isinstance(root_node, str) or not isinstance(children_trees, list):
+            self._error(parent_path, 'Invalid node: {!r}'.format(tree))
+            return None, None
+
+        try:
+            node = NavigationTreeNode(root_node, strict=False)
+        except AttributeError:
+            # the node has no name
+            self._error(parent_path, 'Invalid node: {!r}'.format(root_node))
+            return None, None
+
+        if not node.name.strip() or node.name in ('.', '..') or os.sep in node.name or \
+           '/' in node.name:
+            self._error(parent_path, 'Invalid directory name: {}'.format(node.name))
+            return None, None
+
+        return node, children_trees
+
+    def _error(self, path, message):
+        """"""
+        self.errors.append('{}: {}'.format(path or '/', message))
@@ -17,17 +17,37 @@ import re
 class NavigationTreeNode:
     """Represents a configuration navigation tree node"""
 
-    def __init__(self, node):
-        """"""
+    valid_keys = ['id', 'include', 'stop']
+    # patterns are compiled once, as nodes are parsed in bulk
+    split_pattern = re.compile(r'^(?P<name>[^@]+)(?P<tags>.*)$')
+    options_pattern = re.compile(r'@(?P<k>[a-z]+)=?(?P<v>.*)')
+    invalid_chars_pattern = re.compile(r'[^\w\-. ()]+')
+    dashes_pattern = re.compile('[ -]+')
+
+    def __init__(self, node, strict=True):
+        """
+        Parse the node.
+
+        node (str): node name followed by optional tags
+        strict (bool): terminate on unknown tags rather than collect them in unknown_tags
+        """
+        self.strict = strict
+        self.unknown_tags = []
+        if node and '@' not in node:
+            # fast path for the common case of a node without tags
+            self.name, self.tags = node.strip(), ['']
+            self.default_id = self._node_name_to_node_default_id(self.name)
+            self.options = {'stop': False, 'id': self.default_id}
+            return
+
         self.name, self.tags = self.split_node_name_and_tags(node)
-        self.options = self._get_node_options(self.tags, self.name)
         self.default_id = self._node_name_to_node_default_id(self.name)
+        self.options = self._get_node_options(self.tags, self.name)
 
-    @staticmethod
-    def split_node_name_and_tags(node):
+    @classmethod
+    def split_node_name_and_tags(cls, node):
         """Split configuration navigation tree node into name and optional tags"""
-        split_pattern = re.compile(r'^(?P<name>[^@]+)(?P<tags>.*)$')
-        split_match = split_pattern.match(node)
+        split_match = cls.split_pattern.match(node)
         node_name = split_match.group('name').strip()
         node_tags = split_match.group('tags').strip().split(' ')
 
@@ -43,22 +63,23 @@ class NavigationTreeNode:
     def _get_node_explicit_options(self, tags):
         """"""
         node_options = {}
-        options_pattern = re.compile(r'@(?P<k>[a-z]+)=?(?P<v>.*)')
         for tag in tags:
-            options_match = options_pattern.match(tag)
+            options_match = self.options_pattern.match(tag)
             if options_match is None:
                 continue
 
             key, value = self._get_node_explicit_single_option(options_match, 'k', 'v')
-            node_options.update({key : value})
+            if key is not None:
+                node_options.update({key : value})
 
         return node_options
 
-    @staticmethod
-    def _get_node_explicit_single_option(options_match, key_group_tag, value_group_tag):
+    def _get_node_explicit_single_option(self, options_match, key_group_tag, value_group_tag):
         """"""
-        valid_keys = ['id', 'include', 'stop']
-        if options_match.group('k') not in valid_keys:
+        if options_match.group('k') not in self.valid_keys:
+            if not self.strict:
+                self.unknown_tags.append(options_match.group('k'))
+                return None, None
             print('Error: Unknown node argument: {}'.format(options_match.group('k')))
             sys.exit()
 
@@ -83,25 +104,27 @@ class NavigationTreeNode:
 
     def _set_node_default_id_option(self, node_options, name):
         if 'id' not in node_options or node_options['id'] == '':
-            node_options['id'] = self._node_name_to_node_default_id(name)
+            node_options['id'] = self.default_id
 
         return node_options
 
     def _set_node_default_include_option(self, node_options, name):
         if 'include' in node_options and node_options['include'] == '':
-            node_options['include'] = self._node_name_to_node_default_id(name)
+            node_options['include'] = self.default_id
 
         return node_options
 
-    @staticmethod
-    def _node_name_to_node_default_id(name):
+    @classmethod
+    def _node_name_to_node_default_id(cls, name):
         """"""
+        # fast path for the common case of alphanumeric words separated by single spaces
+        if name.replace(' ', '').isalnum() and '  ' not in name:
+            return name.replace(' ', '-').lower()
+
         # remove invalid characters
-        valid_chars_pattern = re.compile(r'[^\w\-. ()]+')
-        name = valid_chars_pattern.sub('', name)
+        name = cls.invalid_chars_pattern.sub('', name)
 
-        # additional formatting
-        name = re.sub(' ', '-', name)
-        name = re.sub('-+', '-', name)
+        # additional formatting: spaces and runs of dashes become a single dash
+        name = cls.dashes_pattern.sub('-', name)
 
         return name.lower()
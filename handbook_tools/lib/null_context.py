@@ -0,0 +1,16 @@
+"""
+Context manager doing nothing, standing for an optional one.
+
+It replaces contextlib.nullcontext(), which requires Python 3.7.
+"""
+
+class NullContext:
+    """Context manager doing nothing"""
+
+    def __enter__(self):
+        """"""
+        return self
+
+    def __exit__(self, *_):
+        """"""
+        return False
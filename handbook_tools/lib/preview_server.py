@@ -0,0 +1,109 @@
+"""
+Local HTTP server previewing the handbook without building it.
+
+GET requests for a navigation node path (e.g., '/Handbook/Development' or
+'/Handbook/Development/index.md') are answered with the node's index file,
+rendered on the first request and memoized (see LazyRenderer). The root path
+answers with the index file of the root node. Requests for the authored guides
+and topics are answered with their files, or the index file of a directory.
+Everything is served as Markdown text.
+"""
+
+import os
+import io
+import contextlib
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
+from handbook_tools.lib.lazy_renderer import LazyRenderer
+
+class PreviewServer:
+    """Local HTTP server previewing the handbook without building it"""
+
+    content_type = 'text/markdown; charset=utf-8'
+    # authored directories served as files
+    linked_dirs = ['Guides', 'Topics']
+
+    def __init__(self, site_root, address, verbose=False, no_stop=False):
+        """
+        Initialize the server.
+
+        address (tuple): the (host, port) to bind, port 0 picking a free port
+        """
+        self.site_root = site_root
+        self.verbose = verbose
+        self.renderer = LazyRenderer(site_root, verbose, no_stop)
+        self.server = HTTPServer(address, self._handler_class())
+
+    @property
+    def address(self):
+        """The bound (host, port)"""
+        return self.server.server_address[:2]
+
+    def serve_forever(self):
+        """Serve requests until shutdown() is called"""
+        self.server.serve_forever()
+
+    def shutdown(self):
+        """Stop serve_forever() (from another thread)"""
+        self.server.shutdown()
+
+    def close(self):
+        """Release the socket"""
+        self.server.server_close()
+
+    def handle_request(self, url):
+        """Return the (status, contents) response to a GET request for url"""
+        path = urlsplit(url).path
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                contents = self.renderer.render(path)
+                if contents is None:
+                    contents = self._read_linked_file(path)
+        except SystemExit:
+            # rendering terminates on errors, after printing them
+            return 500, output.getvalue()
+
+        if contents is None:
+            return 404, 'Error: Not found: {}\n'.format(path)
+
+        return 200, contents
+
+    def _read_linked_file(self, path):
+        """Return the contents of the authored file at path, or None"""
+        names = [name for name in unquote(path).split('/') if name]
+        if not names or names[0] not in self.linked_dirs or '..' in names:
+            return None
+
+        full_filename = os.path.join(self.site_root, *names)
+        if os.path.isdir(full_filename):
+            full_filename = os.path.join(full_filename, LazyRenderer.index_filename)
+        if not os.path.isfile(full_filename):
+            return None
+
+        with open(full_filename, encoding='utf-8') as linked_file:
+            return linked_file.read()
+
+    def _handler_class(self):
+        """Return a request handler class bound to this server"""
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            """Handles GET requests"""
+
+            def do_GET(self): # pylint: disable=invalid-name
+                """"""
+                status, contents = server.handle_request(self.path)
+                body = contents.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', server.content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args): # pylint: disable=arguments-differ
+                """"""
+                if server.verbose:
+                    super().log_message(*args)
+
+        return RequestHandler
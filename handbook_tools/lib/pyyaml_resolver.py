@@ -0,0 +1,22 @@
+"""
+Resolves the tags of YAML scalars for ruamel.yaml with the rules of PyYAML.
+
+Even when set to YAML 1.1, ruamel.yaml resolves some plain scalars differently
+from PyYAML (e.g., '1e3' is a float rather than a string), so the implicit
+resolvers of PyYAML are used instead of its own, for every YAML version.
+
+Only imported by the ruamel backend, as it requires ruamel.yaml.
+"""
+
+import yaml
+from ruamel.yaml.resolver import VersionedResolver
+
+class PyYamlResolver(VersionedResolver):
+    """ruamel.yaml resolver using the implicit resolvers of PyYAML"""
+
+    @property
+    def versioned_resolver(self):
+        """Return the implicit resolvers of PyYAML by first character"""
+        # a copy, as ruamel.yaml extends the returned lists
+        return {first: list(resolvers)
+                for first, resolvers in yaml.resolver.Resolver.yaml_implicit_resolvers.items()}
@@ -0,0 +1,118 @@
+"""
+Collects the run metrics of a command.
+
+Metrics are named counters (e.g., nodes visited, bytes written) and the wall
+and CPU time of named phases of the run. They are written at the end of the
+run as JSON or in the Prometheus text exposition format, if a metrics file
+was given. Otherwise, nothing is collected and every call returns right away.
+"""
+
+import os
+import json
+import time
+import contextlib
+from collections import OrderedDict
+from handbook_tools.lib.null_context import NullContext
+
+class RunMetrics:
+    """Run metrics of a command"""
+
+    # supported output formats
+    formats = ['json', 'prometheus']
+    # prefix of the Prometheus metric names
+    prometheus_prefix = 'handbook_'
+
+    def __init__(self, command_name, metrics_filename=None, metrics_format='json'):
+        """
+        Initialize the metrics.
+
+        command_name (str): name of the measured command
+        metrics_filename (str): optional file to write the metrics to
+        metrics_format (str): one of the supported output formats
+        """
+        self.command_name = command_name
+        self.metrics_filename = metrics_filename
+        self.metrics_format = metrics_format
+        self.enabled = metrics_filename is not None
+        self.counters = OrderedDict()
+        # [wall seconds, CPU seconds] by phase name
+        self.phases = OrderedDict()
+        self.start_times = (time.perf_counter(), time.process_time())
+
+    def count(self, name, value=1):
+        """Add value to the counter name"""
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def phase(self, name):
+        """Return a context manager adding the time spent in it to the phase name"""
+        if not self.enabled:
+            return NullContext()
+
+        return self._timed_phase(name)
+
+    def save(self):
+        """Write the metrics, if a metrics file was given"""
+        if not self.enabled:
+            return
+
+        wall_time = time.perf_counter() - self.start_times[0]
+        cpu_time = time.process_time() - self.start_times[1]
+        if self.metrics_format == 'json':
+            contents = self._format_json(wall_time, cpu_time)
+        else:
+            contents = self._format_prometheus(wall_time, cpu_time)
+
+        temp_filename = self.metrics_filename + '.tmp'
+        try:
+            with open(temp_filename, 'w') as metrics_file:
+                metrics_file.write(contents)
+            os.replace(temp_filename, self.metrics_filename)
+        except IOError as err:
+            print('Error: Operation failed: {}'.format(err.strerror))
+
+    @contextlib.contextmanager
+    def _timed_phase(self, name):
+        """"""
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+        try:
+            yield
+        finally:
+            times = self.phases.setdefault(name, [0.0, 0.0])
+            times[0] += time.perf_counter() - start_wall_time
+            times[1] += time.process_time() - start_cpu_time
+
+    def _format_json(self, wall_time, cpu_time):
+        """"""
+        metrics = OrderedDict([
+            ('command', self.command_name),
+            ('wall_seconds', wall_time),
+            ('cpu_seconds', cpu_time),
+            ('counters', self.counters),
+            ('phases', OrderedDict((name, {'wall_seconds': times[0], 'cpu_seconds': times[1]})
+                                   for name, times in self.phases.items()))])
+
+        return json.dumps(metrics, indent=2) + '\n'
+
+    def _format_prometheus(self, wall_time, cpu_time):
+        """"""
+        command_label = 'command="{}"'.format(self.command_name)
+        lines = []
+        for name, value in self.counters.items():
+            metric_name = '{}{}_total'.format(self.prometheus_prefix, name)
+            lines.append('# TYPE {} counter'.format(metric_name))
+            lines.append('{}{{{}}} {}'.format(metric_name, command_label, value))
+
+        for clock, total_time, index in (('wall', wall_time, 0), ('cpu', cpu_time, 1)):
+            metric_name = '{}run_{}_seconds'.format(self.prometheus_prefix, clock)
+            lines.append('# TYPE {} gauge'.format(metric_name))
+            lines.append('{}{{{}}} {}'.format(metric_name, command_label, total_time))
+            metric_name = '{}phase_{}_seconds'.format(self.prometheus_prefix, clock)
+            lines.append('# TYPE {} gauge'.format(metric_name))
+            for name, times in self.phases.items():
+                lines.append('{}{{{},phase="{}"}} {}'.format(metric_name, command_label, name,
+                                                             times[index]))
+
+        return '\n'.join(lines) + '\n'
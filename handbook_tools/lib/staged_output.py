@@ -0,0 +1,79 @@
+"""
+Builds an output directory in a staging directory and swaps it in atomically.
+
+The staging directory is a hidden directory at the site root, so the swap is
+a rename within the same filesystem. An existing output directory is exchanged
+with the staged one in a single step where supported (Linux renameat2 with
+RENAME_EXCHANGE), and otherwise moved aside right before the staged one is
+renamed into place. Either way, readers never see a partially built tree.
+
+Staging directories left over by interrupted builds are removed by the next
+build, which must hold the build lock (see BuildLock).
+"""
+
+import os
+import shutil
+import ctypes
+
+class StagedOutput:
+    """Output directory built in a staging directory and swapped in atomically"""
+
+    staging_prefix = '.handbook-staging-'
+    # renameat2() arguments
+    at_fdcwd = -100
+    rename_exchange = 2
+
+    def __init__(self, site_root, path):
+        """
+        Initialize the staged output.
+
+        site_root (str): the site root
+        path (str): the replaced output directory, relative to the site root
+        """
+        self.site_root = site_root
+        self.path = path
+        # root of the staged paths, mirroring the site root
+        self.staging_root = os.path.join(site_root, self.staging_prefix + str(os.getpid()))
+
+    def create(self):
+        """Create the staging directory, removing those left by interrupted builds"""
+        for filename in os.listdir(self.site_root):
+            if filename.startswith(self.staging_prefix):
+                shutil.rmtree(os.path.join(self.site_root, filename), ignore_errors=True)
+
+        os.makedirs(os.path.join(self.staging_root, os.path.dirname(self.path)))
+
+    def commit(self):
+        """Swap the staged output directory in, and remove the staging directory"""
+        staged_path = os.path.join(self.staging_root, self.path)
+        output_path = os.path.join(self.site_root, self.path)
+        if not os.path.exists(staged_path):
+            # nothing was built (e.g., the root node is stopped), so the output is removed
+            if os.path.exists(output_path):
+                os.rename(output_path, os.path.join(self.staging_root, 'replaced'))
+        elif not os.path.exists(output_path):
+            os.rename(staged_path, output_path)
+        elif not self._exchange(staged_path, output_path):
+            os.rename(output_path, os.path.join(self.staging_root, 'replaced'))
+            os.rename(staged_path, output_path)
+
+        shutil.rmtree(self.staging_root)
+
+    def discard(self):
+        """Remove the staging directory, leaving the output untouched"""
+        shutil.rmtree(self.staging_root, ignore_errors=True)
+
+    @classmethod
+    def _exchange(cls, path, other_path):
+        """Atomically exchange two paths. Return False if not supported."""
+        try:
+            renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+        except (OSError, AttributeError):
+            return False
+
+        renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p,
+                              ctypes.c_uint]
+        result = renameat2(cls.at_fdcwd, os.fsencode(path), cls.at_fdcwd,
+                           os.fsencode(other_path), cls.rename_exchange)
+
+        return result == 0
@@ -0,0 +1,112 @@
+"""
+Loads the YAML configuration files with the fastest available parser.
+
+The supported backends, in order of preference:
+- 'libyaml': the PyYAML safe loader implemented in C on top of libyaml
+- 'ruamel': the safe loader of ruamel.yaml, if installed (preferred only with
+  its C extension, as the pure-Python one is slower than PyYAML's)
+- 'pyyaml': the pure-Python PyYAML safe loader, which is always available
+
+The backend may be forced with the HANDBOOK_YAML_BACKEND environment variable.
+All the backends construct plain Python objects only, so loading is safe.
+
+ruamel.yaml implements YAML 1.2 by default, where values like 'yes', 'no' and
+'on' are strings and '0777' is a decimal integer, while PyYAML implements
+YAML 1.1, where they are booleans and an octal integer. The ruamel backend is
+set to YAML 1.1, and resolves plain scalars with the rules of PyYAML, as even
+its YAML 1.1 rules differ on some of them (e.g., '1e3' is a float rather than
+a string), so every backend gives the configuration the same meaning.
+
+Backends are only imported when selected, as the availability of each is
+probed without importing it, so the CLI startup does not pay for them.
+"""
+
+import os
+import sys
+import importlib.util
+import yaml
+
+class YamlBackend:
+    """Loads YAML documents with the selected parser"""
+
+    # supported backends, in order of preference
+    names = ['libyaml', 'ruamel', 'pyyaml']
+    environ_variable = 'HANDBOOK_YAML_BACKEND'
+    # default instance, shared by all the loaders of configuration files
+    default_backend = None
+
+    def __init__(self, name=None):
+        """
+        Initialize the backend.
+
+        name (str): one of the available backends, or None for the preferred one
+        """
+        available_names = self.available_names()
+        if name is None:
+            name = available_names[0]
+        if name not in available_names:
+            print('Error: YAML backend is not available: {}'.format(name))
+            sys.exit()
+
+        self.name = name
+        # exception types raised on invalid documents
+        self.errors = (yaml.YAMLError,)
+        if name == 'ruamel':
+            from ruamel.yaml import YAML
+            from ruamel.yaml.error import YAMLError
+            from handbook_tools.lib.pyyaml_resolver import PyYamlResolver
+            self.errors = (YAMLError,)
+            self.parser = YAML(typ='safe')
+            # the YAML 1.1 rules of PyYAML, rather than the YAML 1.2 default
+            self.parser.version = (1, 1)
+            self.parser.Resolver = PyYamlResolver
+        else:
+            self.parser = None
+
+    @classmethod
+    def default(cls):
+        """Return the backend selected by the environment, or the preferred one"""
+        if cls.default_backend is None:
+            cls.default_backend = cls(os.environ.get(cls.environ_variable))
+
+        return cls.default_backend
+
+    @classmethod
+    def available_names(cls):
+        """Return the names of the installed backends, in order of preference"""
+        available_names = []
+        if hasattr(yaml, 'CSafeLoader'):
+            available_names.append('libyaml')
+        available_names.append('pyyaml')
+        if not cls._is_installed('ruamel.yaml'):
+            return available_names
+        if cls._is_installed('_ruamel_yaml'):
+            available_names.insert(available_names.index('pyyaml'), 'ruamel')
+        else:
+            available_names.append('ruamel')
+
+        return available_names
+
+    @staticmethod
+    def _is_installed(module_name):
+        """Return True if module_name can be imported, without importing it"""
+        try:
+            return importlib.util.find_spec(module_name) is not None
+        except ImportError:
+            # the parent package is missing
+            return False
+
+    def load(self, stream):
+        """Parse the first YAML document in stream (str, bytes or open file)"""
+        if self.name == 'libyaml':
+            return yaml.load(stream, Loader=yaml.CSafeLoader)
+
+        if self.name == 'ruamel':
+            return self.parser.load(stream)
+
+        return yaml.load(stream, Loader=yaml.SafeLoader)
+
+    def load_file(self, filename):
+        """Parse the YAML file filename"""
+        with open(filename, 'r') as yaml_file:
+            return self.load(yaml_file)
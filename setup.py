@@ -25,7 +25,8 @@ setup(
     url='https://github.com/uribench/software-engineering-handbook-tools',
     author_email='uribench@gmail.com',
     license = 'UNLICENSE',
-    packages = find_packages(exclude=['tests', 'build', 'docs']),
+    packages = find_packages(exclude=['tests', 'tests.*', 'build', 'docs', 'benchmarks',
+                                      'benchmarks.*']),
     install_requires=[
         'docopt==0.6.2',
         'PyYAML==5.3.1',
@@ -1,9 +1,229 @@
 """Tests of the 'build' sub-command of the 'handbook' command"""
 
+import os
+import json
+import shutil
 import pytest
 from subprocess import Popen, PIPE
+from handbook_tools.commands.build import Build
+
+FIXTURE_SITE = 'tests/fixtures/site'
+
+@pytest.fixture
+def site_root(tmp_path):
+    site_root = str(tmp_path / 'site')
+    shutil.copytree(FIXTURE_SITE, site_root)
+    return site_root
+
+def read_tree(root):
+    tree = {}
+    for path, _, filenames in os.walk(root):
+        for filename in filenames:
+            full_filename = os.path.join(path, filename)
+            with open(full_filename, 'rb') as tree_file:
+                tree[os.path.relpath(full_filename, root)] = tree_file.read()
+    return tree
+
+def build(site_root, *command_args):
+    Build(command_args=list(command_args),
+          global_args={'--verbose': False, '--root': site_root}).execute()
 
 @pytest.mark.parametrize('option', ['-h', '--help'])
 def test_prints_usage_information(option):
     output = Popen(['handbook_tools/handbook.py', 'build', option], stdout=PIPE).communicate()[0]
     assert b'Usage:' in output
+
+@pytest.mark.parametrize('io_mode', ['sync', 'async'])
+def test_builds_handbook_identical_to_fixture(site_root, io_mode):
+    build(site_root, '-f', '--io=' + io_mode)
+    assert read_tree(os.path.join(site_root, 'Handbook')) == \
+           read_tree(os.path.join(FIXTURE_SITE, 'Handbook'))
+
+def test_exits_on_unknown_io_backend(site_root):
+    with pytest.raises(SystemExit):
+        build(site_root, '-f', '--io=unknown')
+
+@pytest.mark.parametrize('output_format', ['tar', 'zip'])
+def test_builds_handbook_archive_identical_to_fixture(site_root, tmp_path, output_format):
+    shutil.rmtree(os.path.join(site_root, 'Handbook'))
+    build(site_root, '--output-format=' + output_format, '-o', 'handbook.' + output_format)
+    assert not os.path.exists(os.path.join(site_root, 'Handbook'))
+
+    extracted_root = str(tmp_path / 'extracted')
+    shutil.unpack_archive(os.path.join(site_root, 'handbook.' + output_format),
+                          extracted_root, output_format)
+    assert read_tree(os.path.join(extracted_root, 'Handbook')) == \
+           read_tree(os.path.join(FIXTURE_SITE, 'Handbook'))
+
+def test_builds_handbook_in_memory(site_root):
+    command = Build(command_args=['--output-format=memory'],
+                    global_args={'--verbose': False, '--root': site_root})
+    command.execute()
+    files = {path: content.encode() for path, content in command.writer.files.items()}
+    assert files == {os.path.join('Handbook', path): content for path, content in
+                     read_tree(os.path.join(FIXTURE_SITE, 'Handbook')).items()}
+
+def test_rebuilds_from_fragment_cache(site_root, capsys):
+    build(site_root, '-f', '--cache=.cache')
+    build(site_root, '-f', '--cache=.cache')
+    out, err = capsys.readouterr()
+    first_summary, second_summary = out.splitlines()
+    assert 'hits' in first_summary and ', 0 misses' in second_summary
+    assert read_tree(os.path.join(site_root, 'Handbook')) == \
+           read_tree(os.path.join(FIXTURE_SITE, 'Handbook'))
+
+def edit_navigation(site_root):
+    root_config_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+    with open(root_config_filename) as root_config_file:
+        root_config = root_config_file.read()
+    root_config = root_config.replace('- Clean Code and Code Smells:',
+                                      '- Clean Code @id=clean-code-and-code-smells:')
+    root_config = root_config.replace('- Repository Hosting Services:',
+                                      '- Repository Hosting Services @stop:')
+    root_config = root_config.replace('- Tools @stop', '- Tools')
+    with open(root_config_filename, 'w') as root_config_file:
+        root_config_file.write(root_config)
+
+def test_incremental_build_matches_full_build(site_root, tmp_path, capsys):
+    build(site_root, '-f', '--cache=.cache')
+    edit_navigation(site_root)
+    build(site_root, '--incremental', '--cache=.cache')
+    out, err = capsys.readouterr()
+    assert 'Incremental build: 1 created, 1 renamed, 1 deleted' in out
+
+    full_site_root = str(tmp_path / 'full')
+    shutil.copytree(FIXTURE_SITE, full_site_root)
+    edit_navigation(full_site_root)
+    build(full_site_root, '-f')
+    assert read_tree(os.path.join(site_root, 'Handbook')) == \
+           read_tree(os.path.join(full_site_root, 'Handbook'))
+
+def test_uses_titles_of_guides_as_link_text(site_root):
+    guide_filename = os.path.join(site_root, 'Guides', 'Git', 'Git Overview.md')
+    with open(guide_filename) as guide_file:
+        guide = guide_file.read()
+    with open(guide_filename, 'w') as guide_file:
+        guide_file.write('---\ntitle: About Git\n---\n' + guide)
+
+    build(site_root, '-f', '--titles')
+    git_index_filename = os.path.join(site_root, 'Handbook', 'Development',
+                                      'Code Development Lifecycle', 'Version Control', 'Git',
+                                      'index.md')
+    with open(git_index_filename) as git_index_file:
+        git_index = git_index_file.read()
+    assert '- [About Git](/Guides/Git/Git%20Overview)' in git_index
+    assert '- [Git Installation](/Guides/Git/Git%20Installation)' in git_index
+
+@pytest.mark.parametrize('subtree', ['coding', 'Handbook/Coding'])
+def test_builds_single_subtree(site_root, tmp_path, capsys, subtree):
+    build(site_root, '-f', '--cache=.cache')
+    edit_navigation(site_root)
+    build(site_root, '-f', '--cache=.cache', '--subtree=' + subtree)
+
+    full_site_root = str(tmp_path / 'full')
+    shutil.copytree(FIXTURE_SITE, full_site_root)
+    edit_navigation(full_site_root)
+    build(full_site_root, '-f')
+    assert read_tree(os.path.join(site_root, 'Handbook', 'Coding')) == \
+           read_tree(os.path.join(full_site_root, 'Handbook', 'Coding'))
+    # the rest of the tree is left untouched
+    assert read_tree(os.path.join(site_root, 'Handbook', 'Development')) == \
+           read_tree(os.path.join(FIXTURE_SITE, 'Handbook', 'Development'))
+
+    # the built subtree is merged into the state of the last build
+    capsys.readouterr()
+    build(site_root, '--incremental', '--cache=.cache')
+    out, err = capsys.readouterr()
+    assert 'Incremental build: 1 created, 0 renamed, 0 deleted' in out
+    assert read_tree(os.path.join(site_root, 'Handbook')) == \
+           read_tree(os.path.join(full_site_root, 'Handbook'))
+
+def test_merges_new_subtree_into_state_in_pre_order(site_root, tmp_path):
+    def add_subtree(site_root):
+        root_config_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+        with open(root_config_filename) as root_config_file:
+            root_config = root_config_file.read()
+        root_config = root_config.replace('  - Coding:', '  - Testing:\n    - Unit Tests\n'
+                                                      '  - Coding:')
+        with open(root_config_filename, 'w') as root_config_file:
+            root_config_file.write(root_config)
+    def state_paths(site_root):
+        with open(os.path.join(site_root, '.cache', 'navigation.json')) as state_file:
+            return [path for path, _, _ in json.load(state_file)['nodes']]
+
+    build(site_root, '-f', '--cache=.cache')
+    add_subtree(site_root)
+    build(site_root, '-f', '--cache=.cache', '--subtree=testing')
+
+    full_site_root = str(tmp_path / 'full')
+    shutil.copytree(FIXTURE_SITE, full_site_root)
+    add_subtree(full_site_root)
+    build(full_site_root, '-f', '--cache=.cache')
+    assert state_paths(site_root) == state_paths(full_site_root)
+
+def test_exits_on_unknown_subtree(site_root):
+    with pytest.raises(SystemExit):
+        build(site_root, '-f', '--subtree=no-such-node')
+
+def test_sharded_build_matches_serial_build(site_root):
+    shutil.rmtree(os.path.join(site_root, 'Handbook'))
+    build(site_root, '--plan', '--shards=3')
+    workers = [Popen(['handbook_tools/handbook.py', '--root=' + site_root, 'build',
+                      '--shard={}/3'.format(shard_index)]) for shard_index in range(1, 4)]
+    assert [worker.wait() for worker in workers] == [0, 0, 0]
+    build(site_root, '--merge')
+    assert read_tree(os.path.join(site_root, 'Handbook')) == \
+           read_tree(os.path.join(FIXTURE_SITE, 'Handbook'))
+    assert os.listdir(os.path.join(site_root, '.shards')) == ['manifest.json']
+
+def test_merge_fails_on_incomplete_shards(site_root, capsys):
+    build(site_root, '--plan', '--shards=2')
+    build(site_root, '--shard=1/2')
+    with pytest.raises(SystemExit):
+        build(site_root, '-f', '--merge')
+    out, err = capsys.readouterr()
+    assert 'Error: Shard 2 is incomplete' in out
+    assert read_tree(os.path.join(site_root, 'Handbook')) == \
+           read_tree(os.path.join(FIXTURE_SITE, 'Handbook'))
+
+@pytest.mark.parametrize('sharded', [False, True])
+def test_builds_nothing_under_stopped_root(site_root, sharded):
+    root_config_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+    with open(root_config_filename) as root_config_file:
+        root_config = root_config_file.read()
+    with open(root_config_filename, 'w') as root_config_file:
+        root_config_file.write(root_config.replace('Handbook:', 'Handbook @stop:', 1))
+
+    if sharded:
+        build(site_root, '--plan', '--shards=2')
+        build(site_root, '--shard=1/2')
+        build(site_root, '--shard=2/2')
+        build(site_root, '-f', '--merge')
+    else:
+        build(site_root, '-f')
+    assert not os.path.exists(os.path.join(site_root, 'Handbook'))
+
+def test_writes_run_metrics(site_root):
+    command = Build(command_args=['-f'],
+                    global_args={'--verbose': False, '--root': site_root,
+                                 '--metrics-file': 'metrics.json', '--metrics-format': 'json'})
+    command.execute()
+    command.metrics.save()
+    with open(os.path.join(site_root, 'metrics.json')) as metrics_file:
+        metrics = json.load(metrics_file)
+    index_files = read_tree(os.path.join(FIXTURE_SITE, 'Handbook'))
+    assert metrics['counters']['nodes_visited'] == len(index_files)
+    assert metrics['counters']['files_written'] == len(index_files)
+    assert metrics['counters']['bytes_written'] == sum(map(len, index_files.values()))
+    assert metrics['counters']['metadata_hits'] + metrics['counters']['metadata_misses'] == \
+           len(index_files)
+    assert list(metrics['phases']) == ['load', 'build', 'save']
+
+def test_concurrent_builds_queue_and_swap_complete_trees(site_root):
+    builders = [Popen(['handbook_tools/handbook.py', '--root=' + site_root, 'build', '-f',
+                       '--io=async'], stdout=PIPE) for _ in range(3)]
+    assert [builder.wait() for builder in builders] == [0, 0, 0]
+    assert read_tree(os.path.join(site_root, 'Handbook')) == \
+           read_tree(os.path.join(FIXTURE_SITE, 'Handbook'))
+    assert not [filename for filename in os.listdir(site_root)
+                if filename.startswith('.handbook-staging-')]
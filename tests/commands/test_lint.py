@@ -0,0 +1,53 @@
+"""Tests of the 'lint' sub-command of the 'handbook' command"""
+
+import os
+import shutil
+import pytest
+from handbook_tools.commands.lint import Lint
+
+@pytest.fixture
+def site_root(tmp_path):
+    site_root = str(tmp_path / 'site')
+    shutil.copytree('tests/fixtures/site', site_root)
+    return site_root
+
+def lint(site_root, *command_args):
+    Lint(command_args=list(command_args),
+         global_args={'--verbose': True, '--root': site_root}).execute()
+
+def test_validates_fixture_site(capsys):
+    lint('tests/fixtures/site')
+    out, err = capsys.readouterr()
+    assert '0 errors found' in out
+
+def test_reports_all_errors_at_once(site_root, capsys):
+    root_config_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+    with open(root_config_filename, 'a') as root_config_file:
+        root_config_file.write('  - Git @stpo\n  - git\n  - Coding @id=git-bash\n')
+
+    with pytest.raises(SystemExit) as exit_info:
+        lint(site_root)
+    assert exit_info.value.code == 1
+
+    out, err = capsys.readouterr()
+    assert '/Handbook/Git: Unknown tag: @stpo' in out
+    assert '/Handbook: Colliding names: Coding and Coding' in out
+    assert '/Handbook: Colliding names: Git and git' in out
+    assert '/Handbook/git: Duplicate id: git (used by ' in out
+    assert '5 errors found' in out
+
+@pytest.mark.parametrize('node, error', [
+    ('- Empty Section:', "Invalid node: {'Empty Section': None}"),
+    ('- "   "', 'Invalid directory name: ')])
+def test_reports_nodes_crashing_the_build(site_root, capsys, node, error):
+    root_config_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+    with open(root_config_filename, 'a') as root_config_file:
+        root_config_file.write('  {}\n'.format(node))
+
+    with pytest.raises(SystemExit) as exit_info:
+        lint(site_root)
+    assert exit_info.value.code == 1
+
+    out, err = capsys.readouterr()
+    assert '/Handbook: ' + error in out
+    assert '1 errors found' in out
@@ -1,5 +1,7 @@
 """Tests of the 'status' sub-command of the 'handbook' command"""
 
+import os
+import shutil
 import pytest
 from handbook_tools.commands.status import Status
 
@@ -12,3 +14,45 @@ def test_prints_status_report(capsys):
     assert '## Metadata Files' in out
     assert '## Guides Files' in out
     assert '## Topics Files' in out
+
+def test_prints_titles_and_words_counts(capsys):
+    status = Status(command_args=['--stats'],
+                    global_args={'--verbose': True,
+                                 '--root': 'tests/fixtures/site'})
+    status.execute()
+    out, err = capsys.readouterr()
+    assert '/Guides/Git/Git Overview.md "Git Overview" (' in out
+    assert '**Total Authored Words Count: ' in out
+
+def test_prints_sorted_report(capsys):
+    status = Status(global_args={'--verbose': True,
+                                 '--root': 'tests/fixtures/site'})
+    status.execute()
+    out, err = capsys.readouterr()
+    guides = [line for line in out.splitlines() if line.startswith('  - /Guides/Git/')]
+    assert guides == sorted(guides) and len(guides) == 5
+
+def test_prints_changes_since_snapshot(tmp_path, capsys):
+    site_root = str(tmp_path / 'site')
+    shutil.copytree('tests/fixtures/site', site_root)
+    global_args = {'--verbose': False, '--root': site_root}
+    Status(command_args=['--snapshot=status.snapshot', '--hash'],
+           global_args=global_args).execute()
+
+    guide_filename = os.path.join(site_root, 'Guides', 'Git', 'Git Overview.md')
+    with open(guide_filename, 'a') as guide_file:
+        guide_file.write('More about Git.\n')
+    os.utime(os.path.join(site_root, 'Guides', 'Git', 'Git Installation.md'))
+    with open(os.path.join(site_root, 'Topics', 'New Topic.md'), 'w') as topic_file:
+        topic_file.write('# New Topic\n')
+    os.remove(os.path.join(site_root, 'config', 'metadata', 'git.yml'))
+    capsys.readouterr()
+
+    Status(command_args=['--since=status.snapshot'], global_args=global_args).execute()
+    out, err = capsys.readouterr()
+    assert '## Changes Since status.snapshot' in out
+    changes = [line.strip() for line in out.splitlines() if line.startswith('  - ')]
+    assert changes == ['- Added: /Topics/New Topic.md',
+                       '- Removed: /config/metadata/git.yml',
+                       '- Modified: /Guides/Git/Git Overview.md']
+    assert '**Total Changed Files Count: 3**' in out
@@ -9,3 +9,15 @@ def test_prints_toc(capsys):
     toc.execute()
     out, err = capsys.readouterr()
     assert '# Table of Contents' in out
+
+@pytest.mark.parametrize('subtree', ['development', '/Handbook/Development'])
+def test_prints_toc_of_subtree(capsys, subtree):
+    toc = Toc(command_args=['--subtree=' + subtree, '--depth=1'],
+              global_args={'--verbose': False, '--root': 'tests/fixtures/site'})
+    toc.execute()
+    out, err = capsys.readouterr()
+    assert out == '# Table of Contents\n\n' \
+                  '- 1 [Development Environment and Tools]' \
+                  '(/Handbook/Development/Development%20Environment%20and%20Tools)\n' \
+                  '- 2 [Code Development Lifecycle]' \
+                  '(/Handbook/Development/Code%20Development%20Lifecycle)\n'
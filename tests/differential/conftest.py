@@ -0,0 +1,67 @@
+"""
+Fixtures of the differential tests.
+
+Each test runs the frozen reference implementation (see ReferenceEngine) and
+an optimized code path of a command on the same randomized site, timing each
+case. The mean time of each case is reported at the end of the test session,
+with its speedup over the reference case of its group.
+"""
+
+import time
+import pytest
+from tests.differential.harness import TIMINGS, clear_file_caches
+from tests.differential.random_site import RandomSite
+
+SEEDS = [1, 2, 3]
+
+@pytest.fixture(params=SEEDS, ids=lambda seed: 'seed{}'.format(seed))
+def random_site(request):
+    return RandomSite(request.param)
+
+@pytest.fixture
+def new_site_root(tmp_path, random_site):
+    """Return a function writing a copy of the random site and returning its root"""
+    counter = [0]
+    def new_site_root():
+        counter[0] += 1
+        site_root = str(tmp_path / 'site{}'.format(counter[0]))
+        random_site.write(site_root)
+        return site_root
+    return new_site_root
+
+@pytest.fixture
+def timed():
+    """Return a function running a case of a group, timed, and returning its result"""
+    def timed(group, case, function, *args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        TIMINGS.append((group, case, time.perf_counter() - start))
+        return result
+    return timed
+
+@pytest.fixture(autouse=True)
+def cold_file_caches():
+    clear_file_caches()
+    yield
+    clear_file_caches()
+
+def pytest_terminal_summary(terminalreporter):
+    if not TIMINGS:
+        return
+
+    totals = {}
+    for group, case, seconds in TIMINGS:
+        runs, total = totals.get((group, case), (0, 0.0))
+        totals[(group, case)] = (runs + 1, total + seconds)
+
+    terminalreporter.write_sep('-', 'differential timings')
+    terminalreporter.write_line('{:<16}{:<20}{:>6}{:>14}{:>10}'.format(
+        'group', 'case', 'runs', 'mean seconds', 'speedup'))
+    for (group, case), (runs, total) in sorted(totals.items()):
+        mean = total / runs
+        reference = totals.get((group, 'reference'))
+        speedup = '-'
+        if reference is not None and mean > 0:
+            speedup = '{:.2f}x'.format(reference[1] / reference[0] / mean)
+        terminalreporter.write_line('{:<16}{:<20}{:>6}{:>14.4f}{:>10}'.format(
+            group, case, runs, mean, speedup))
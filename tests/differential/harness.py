@@ -0,0 +1,37 @@
+"""Helpers of the differential tests"""
+
+import io
+import os
+import contextlib
+from handbook_tools.commands.build import Build
+from handbook_tools.lib.navigation_tree import NavigationTree
+
+# [(group, case, seconds), ...] of all the timed cases
+TIMINGS = []
+
+def clear_file_caches():
+    Build.file_cache.clear()
+    NavigationTree.file_cache.clear()
+    NavigationTree.id_indexes.clear()
+
+def read_tree(root):
+    tree = {}
+    for path, _, filenames in os.walk(root):
+        for filename in filenames:
+            full_filename = os.path.join(path, filename)
+            with open(full_filename, 'rb') as tree_file:
+                tree[os.path.relpath(full_filename, root)] = tree_file.read()
+    return tree
+
+def run_command(command_class, site_root, *command_args):
+    """Execute a command and return its standard output"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        command_class(command_args=list(command_args),
+                      global_args={'--verbose': False, '--root': site_root}).execute()
+    return output.getvalue()
+
+def build_tree(site_root, root_name, *command_args):
+    """Build the site and return the output tree of the root node"""
+    run_command(Build, site_root, '-f', *command_args)
+    return read_tree(os.path.join(site_root, root_name))
@@ -0,0 +1,258 @@
+"""
+Randomized handbook sites for the differential tests.
+
+A RandomSite is a navigation tree generated from a seed, with unicode names,
+a deep branch, 'stop' tags, explicit ids, and metadata files that are either
+empty or link to generated guides and topics. It can be mutated, as by an
+author editing the site between two builds. The tree is kept as a model of
+nested dictionaries, so the expected outputs can be derived from it
+independently of the code under test.
+"""
+
+import os
+import random
+import shutil
+import yaml
+from urllib.request import pathname2url
+from handbook_tools.lib.navigation_tree_node import NavigationTreeNode
+
+TEMPLATES_PATH = 'tests/fixtures/site/config/templates'
+
+class RandomSite:
+    """Randomized handbook site generated from a seed"""
+
+    letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789' \
+              'éüßçñøåÉÅΩλπДжщ漢字語かなカナ한글'
+    # separators of the words of a name, runs of dashes and spaces included
+    separators = [' ', ' ', ' ', '-', ' - ', '  ', '_']
+    suffixes = ['', '', '', '', ' (Draft)', '.md', ' v2.0', ' (λ)']
+
+    def __init__(self, seed, nodes_count=120, deep_depth=14):
+        """
+        Generate the site model.
+
+        nodes_count (int): approximate number of nodes of the navigation tree
+        deep_depth (int): depth of the deepest branch
+        """
+        self.random = random.Random(seed)
+        self.ids = set()
+        self.guides = self._generate_items(12)
+        self.topics = self._generate_items(8)
+        self.root = self._new_node(set(), allow_stop=False)
+        self.nodes_count = 1
+        self._grow(self.root, nodes_count)
+        self._grow_deep_branch(deep_depth)
+        # metadata file contents by node id
+        self.metadata = {node['id']: self._generate_metadata()
+                         for node, _ in self.nodes() if self.random.random() < 0.4}
+
+    def write(self, site_root):
+        """Write the site configuration, guides and topics under site_root"""
+        navigation_path = os.path.join(site_root, 'config', 'navigation')
+        metadata_path = os.path.join(site_root, 'config', 'metadata')
+        os.makedirs(navigation_path)
+        os.makedirs(metadata_path)
+        shutil.copytree(TEMPLATES_PATH, os.path.join(site_root, 'config', 'templates'))
+        self.write_tree_config(site_root)
+        for node_id, contents in self.metadata.items():
+            with open(os.path.join(metadata_path, node_id + '.yml'), 'w',
+                      encoding='utf-8') as metadata_file:
+                metadata_file.write(contents)
+        for dirname, items in (('Guides', self.guides), ('Topics', self.topics)):
+            for item in items:
+                full_filename = os.path.join(site_root, dirname, item + '.md')
+                os.makedirs(os.path.dirname(full_filename), exist_ok=True)
+                with open(full_filename, 'w', encoding='utf-8') as item_file:
+                    item_file.write('# {}\n\nAbout {}.\n'.format(item.upper(), item))
+
+    def write_tree_config(self, site_root, no_stop=False):
+        """Write root.yml, without the 'stop' tags if no_stop"""
+        tree_config_full_filename = os.path.join(site_root, 'config', 'navigation', 'root.yml')
+        with open(tree_config_full_filename, 'w', encoding='utf-8') as tree_config_file:
+            yaml.safe_dump(self._tree_config(self.root, no_stop), tree_config_file,
+                           allow_unicode=True, default_flow_style=False)
+
+    def nodes(self, node=None, path='', no_stop=False):
+        """Yield the (node, path) of the built nodes in pre-order, relative to the site root"""
+        node = node or self.root
+        path = os.path.join(path, node['name'])
+        yield node, path
+        for child in node['children']:
+            if no_stop or not child['stop']:
+                yield from self.nodes(child, path, no_stop)
+
+    def index_filename(self, path):
+        """Return the index file of the node at path, relative to the root node directory"""
+        return os.path.normpath(os.path.join(os.path.relpath(path, self.root['name']),
+                                             'index.md'))
+
+    def toc(self, max_depth=8, no_stop=False, subtree=None):
+        """Return the expected TOC of the tree, or of the subtree of a (node, path) tuple"""
+        node, path = subtree or (self.root, self.root['name'])
+        lines = ['# Table of Contents\n\n']
+        self._toc_lines(lines, node, '/' + path, [], max_depth, no_stop)
+
+        return ''.join(lines)
+
+    def mutate(self):
+        """Rename, move, add, remove and retag nodes, change explicit ids, and edit metadata"""
+        nodes = [node for node, _ in self.nodes() if node is not self.root]
+        renamed = self.random.choice(nodes)
+        self._rename(renamed, self._parent(renamed)['children'])
+        moved = self.random.choice(nodes)
+        moved_subtree = [node for node, _ in self.nodes(moved, no_stop=True)]
+        self._move(moved, self.random.choice([node for node, _ in self.nodes(no_stop=True)
+                                              if node not in moved_subtree and
+                                              node is not self._parent(moved)]))
+        identified = self.random.choice(nodes)
+        self.ids.discard(identified['id'])
+        identified['explicit_id'] = self._new_id('id {}'.format(self.random.randrange(10 ** 6)))
+        identified['id'] = identified['explicit_id']
+        parent = self.random.choice(nodes)
+        parent['children'].append(self._new_node({child['name'].casefold()
+                                                  for child in parent['children']}))
+        removed = self.random.choice([node for node in nodes if node is not parent])
+        self._parent(removed)['children'].remove(removed)
+        retagged = self.random.choice([node for node in nodes if node not in (removed, parent)])
+        retagged['stop'] = not retagged['stop']
+        if self.metadata:
+            node_id = self.random.choice(sorted(self.metadata))
+            self.metadata[node_id] = self._generate_metadata()
+
+    def _rename(self, node, siblings):
+        """"""
+        node['name'] = self._unique_name({sibling['name'].casefold() for sibling in siblings})
+        if node['explicit_id'] is None:
+            self.ids.discard(node['id'])
+            node['id'] = self._new_id(node['name'])
+
+    def _move(self, node, parent):
+        """Move node (and its subtree) among the children of parent"""
+        self._parent(node)['children'].remove(node)
+        if node['name'].casefold() in {child['name'].casefold() for child in parent['children']}:
+            self._rename(node, parent['children'])
+        parent['children'].insert(self.random.randint(0, len(parent['children'])), node)
+
+    def _toc_lines(self, lines, node, link, index, max_depth, no_stop):
+        """"""
+        depth = len(index) + 1
+        if depth > 1 and depth - 1 <= max_depth:
+            lines.append('{}- {} [{}]({})\n'.format(' ' * 2 * (depth - 2),
+                                                    '.'.join(str(i) for i in index),
+                                                    node['name'], pathname2url(link)))
+        built_children = [child for child in node['children'] if no_stop or not child['stop']]
+        for i, child in enumerate(built_children):
+            self._toc_lines(lines, child, link + '/' + child['name'], index + [i + 1],
+                            max_depth, no_stop)
+
+    def _grow(self, root, nodes_count):
+        """"""
+        queue = [root]
+        while queue and self.nodes_count < nodes_count:
+            node = queue.pop(self.random.randrange(len(queue)))
+            names = set()
+            for _ in range(self.random.randint(1, 6)):
+                child = self._new_node(names)
+                node['children'].append(child)
+                queue.append(child)
+                self.nodes_count += 1
+
+    def _grow_deep_branch(self, depth):
+        """"""
+        node = self.root
+        for _ in range(depth):
+            child = self._new_node({child['name'].casefold() for child in node['children']},
+                                   allow_stop=False)
+            node['children'].append(child)
+            node = child
+
+    def _new_node(self, sibling_names, allow_stop=True):
+        """Return a new leaf node whose name is unique among sibling_names (casefolded)"""
+        name = self._unique_name(sibling_names)
+        explicit_id = None
+        if self.random.random() < 0.15:
+            explicit_id = self._new_id('id {}'.format(self.random.randrange(10 ** 6)))
+        node_id = explicit_id or self._new_id(name)
+
+        return {'name': name, 'id': node_id, 'explicit_id': explicit_id,
+                'stop': allow_stop and self.random.random() < 0.1, 'children': []}
+
+    def _unique_name(self, sibling_names):
+        """"""
+        while True:
+            name = self._generate_name()
+            if name.casefold() not in sibling_names and \
+               NavigationTreeNode(name).default_id not in self.ids:
+                sibling_names.add(name.casefold())
+                return name
+
+    def _new_id(self, name):
+        """"""
+        node_id = NavigationTreeNode(name).default_id
+        while node_id in self.ids:
+            node_id += '-1'
+        self.ids.add(node_id)
+
+        return node_id
+
+    def _generate_name(self):
+        """"""
+        words = [''.join(self.random.choice(self.letters)
+                         for _ in range(self.random.randint(1, 8)))
+                 for _ in range(self.random.randint(1, 4))]
+        name = words[0]
+        for word in words[1:]:
+            name += self.random.choice(self.separators) + word
+
+        return name + self.random.choice(self.suffixes)
+
+    def _generate_items(self, count):
+        """"""
+        items = set()
+        while len(items) < count:
+            name = self._generate_name().strip('.')
+            if self.random.random() < 0.5:
+                name = self._generate_name().strip('.') + '/' + name
+            items.add(name)
+
+        return sorted(items)
+
+    def _generate_metadata(self):
+        """"""
+        kind = self.random.choice(['empty', 'empty document', 'intro', 'links'])
+        if kind == 'empty':
+            return ''
+        if kind == 'empty document':
+            return '{}\n'
+        metadata = {'intro': 'Intro of {} ({}).\n'.format(self._generate_name(),
+                                                         self.random.randrange(100))}
+        if kind == 'links':
+            metadata['guides'] = self.random.sample(self.guides, self.random.randint(1, 4)) + \
+                                 ['Missing Guide']
+            metadata['topics'] = self.random.sample(self.topics, self.random.randint(0, 3))
+
+        return yaml.safe_dump(metadata, allow_unicode=True)
+
+    def _tree_config(self, node, no_stop):
+        """"""
+        node_string = node['name']
+        if node['explicit_id'] is not None:
+            node_string += ' @id=' + node['explicit_id']
+        if node['stop'] and not no_stop:
+            node_string += ' @stop'
+        if not node['children']:
+            return node_string
+
+        return {node_string: [self._tree_config(child, no_stop) for child in node['children']]}
+
+    def _parent(self, node, root=None):
+        """"""
+        root = root or self.root
+        for child in root['children']:
+            if child is node:
+                return root
+            parent = self._parent(node, child)
+            if parent is not None:
+                return parent
+
+        return None
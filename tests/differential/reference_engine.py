@@ -0,0 +1,199 @@
+"""
+Frozen reference implementation of the 'build' and 'toc' sub-commands.
+
+This is a copy of the rendering logic of the baseline commands, kept out of
+the package so that the optimized code paths are compared against the
+original ones rather than against themselves. It parses the nodes without
+fast paths, loads the configuration with the pure-Python PyYAML loader, renders
+the index files with a plain Jinja2 template, and returns the output in
+memory, without caches, writers or staging.
+
+It only departs from the baseline where behavior was deliberately added or
+fixed since: empty metadata files hold no metadata, and guide and topic titles
+may be used as link text.
+"""
+
+import os
+import re
+import sys
+from urllib.request import pathname2url
+from jinja2 import Template
+import yaml
+
+class ReferenceNode:
+    """Configuration navigation tree node, parsed as by the baseline"""
+
+    def __init__(self, node):
+        """"""
+        self.name, self.tags = self.split_node_name_and_tags(node)
+        self.options = self._get_node_options(self.tags, self.name)
+        self.default_id = self._node_name_to_node_default_id(self.name)
+
+    @staticmethod
+    def split_node_name_and_tags(node):
+        """Split configuration navigation tree node into name and optional tags"""
+        split_match = re.match(r'^(?P<name>[^@]+)(?P<tags>.*)$', node)
+        node_name = split_match.group('name').strip()
+        node_tags = split_match.group('tags').strip().split(' ')
+
+        return node_name, node_tags
+
+    def _get_node_options(self, tags, name):
+        """"""
+        node_options = {}
+        for tag in tags:
+            options_match = re.match(r'@(?P<k>[a-z]+)=?(?P<v>.*)', tag)
+            if options_match is None:
+                continue
+            if options_match.group('k') not in ['id', 'include', 'stop']:
+                print('Error: Unknown node argument: {}'.format(options_match.group('k')))
+                sys.exit()
+            node_options[options_match.group('k')] = options_match.group('v')
+
+        node_options['stop'] = 'stop' in node_options
+        if 'id' not in node_options or node_options['id'] == '':
+            node_options['id'] = self._node_name_to_node_default_id(name)
+        if 'include' in node_options and node_options['include'] == '':
+            node_options['include'] = self._node_name_to_node_default_id(name)
+
+        return node_options
+
+    @staticmethod
+    def _node_name_to_node_default_id(name):
+        """"""
+        name = re.sub(r'[^\w\-. ()]+', '', name)
+        name = re.sub(' ', '-', name)
+        name = re.sub('-+', '-', name)
+
+        return name.lower()
+
+class ReferenceEngine:
+    """Frozen reference implementation of the 'build' and 'toc' sub-commands"""
+
+    heading_pattern = re.compile(r'^#{1,6}[ \t]+(?P<title>.+?)[ \t#]*$')
+
+    def __init__(self, site_root, no_stop=False, titles=False):
+        """"""
+        self.site_root = site_root
+        self.no_stop = no_stop
+        self.titles = titles
+        with open(os.path.join(site_root, 'config', 'navigation', 'root.yml')) as tree_file:
+            self.tree = yaml.load(tree_file, Loader=yaml.SafeLoader)
+        with open(os.path.join(site_root, 'config', 'templates',
+                               'navigation-file-template.j2')) as template_file:
+            self.template = Template(template_file.read())
+
+    def build(self):
+        """Return the contents of the index files by path relative to the root node directory"""
+        files = {}
+        root_node = self._split_tree(self.tree)[0]
+        for path, node, children_nodes in self._scan_tree('', self.tree):
+            filename = os.path.normpath(os.path.join(os.path.relpath(path, root_node.name),
+                                                     'index.md'))
+            files[filename] = self._render_index_file(path, node, children_nodes).encode('utf-8')
+
+        return files
+
+    def toc(self, max_depth=8):
+        """Return the TOC of the tree"""
+        lines = ['# Table of Contents\n\n']
+        depth = 0
+        index = []
+        for path, node, _ in self._scan_tree('', self.tree):
+            link = '/' + path
+            link_depth = len(link.split(os.sep)) - 1
+            if link_depth > len(index):
+                index += [1]
+            if link_depth <= depth:
+                index[link_depth - 1] += 1
+                index = index[:link_depth]
+            depth = link_depth
+            if depth > 1 and (depth - 1) <= max_depth:
+                lines.append('{}- {} [{}]({})\n'.format(' ' * 2 * (depth - 2),
+                                                        '.'.join(str(e) for e in index[1:depth]),
+                                                        node.name, pathname2url(link)))
+
+        return ''.join(lines)
+
+    def _scan_tree(self, path, tree):
+        """Yield the (path, node, children nodes) of the built nodes in pre-order"""
+        node, children_trees, _ = self._split_tree(tree)
+        if node.options['stop'] and not self.no_stop:
+            return
+
+        root_path = os.path.join(path, node.name)
+        yield root_path, node, [self._split_tree(child)[2] for child in children_trees]
+        for child_tree in children_trees:
+            yield from self._scan_tree(root_path, child_tree)
+
+    @staticmethod
+    def _split_tree(tree):
+        """"""
+        if isinstance(tree, dict):
+            node_string, children_trees = list(tree.items())[0]
+        else:
+            node_string, children_trees = tree, []
+
+        return ReferenceNode(node_string), children_trees, node_string
+
+    def _render_index_file(self, path, node, children_nodes):
+        """"""
+        metadata_filename = os.path.join(self.site_root, 'config', 'metadata',
+                                         node.options['id'] + '.yml')
+        metadata = {}
+        if os.path.exists(metadata_filename):
+            with open(metadata_filename) as metadata_file:
+                metadata = yaml.load(metadata_file, Loader=yaml.SafeLoader) or {}
+
+        contents = []
+        for child in children_nodes:
+            child_node = ReferenceNode(child)
+            if child_node.options['stop']:
+                contents.append(child_node.name)
+            else:
+                contents.append(self._linked_item(child_node.name,
+                                                  os.path.join('/' + path, child_node.name)))
+
+        return self.template.render(title=node.name, intro=metadata.get('intro', []),
+                                    contents=contents,
+                                    guides=self._metadata_items('Guides',
+                                                                metadata.get('guides', [])),
+                                    topics=self._metadata_items('Topics',
+                                                                metadata.get('topics', [])))
+
+    def _metadata_items(self, dirname, raw_items):
+        """"""
+        items = []
+        for item in raw_items:
+            item_text = os.path.basename(item)
+            if self.titles:
+                item_text = self._title(dirname, item) or item_text
+            items.append(self._linked_item(item_text, os.path.join('/' + dirname, item)))
+
+        return items
+
+    def _title(self, dirname, item):
+        """Return the front matter title or the first heading of a linked file"""
+        for filename in [item + '.md', os.path.join(item, 'index.md')]:
+            full_filename = os.path.join(self.site_root, dirname, filename)
+            if not os.path.isfile(full_filename):
+                continue
+            with open(full_filename, encoding='utf-8') as item_file:
+                lines = item_file.read().split('\n')
+            if lines[0] == '---' and '---' in lines[1:]:
+                end = lines.index('---', 1)
+                front_matter = yaml.load('\n'.join(lines[1:end]), Loader=yaml.SafeLoader)
+                if isinstance(front_matter, dict) and front_matter.get('title') is not None:
+                    return str(front_matter['title'])
+                lines = lines[end + 1:]
+            for line in lines:
+                match = self.heading_pattern.match(line)
+                if match is not None:
+                    return match.group('title').strip()
+
+        return None
+
+    @staticmethod
+    def _linked_item(item, link):
+        """"""
+        return '[{}]({})'.format(item, pathname2url(link))
@@ -0,0 +1,108 @@
+"""Differential tests of the optimized code paths of the 'build' sub-command"""
+
+import os
+import shutil
+import pytest
+from handbook_tools.commands.build import Build
+from handbook_tools.lib.lazy_renderer import LazyRenderer
+from handbook_tools.lib.yaml_backend import YamlBackend
+from tests.differential.harness import build_tree, run_command, read_tree
+from tests.differential.reference_engine import ReferenceEngine
+
+def reference_build(site_root, **options):
+    return ReferenceEngine(site_root, **options).build()
+
+@pytest.fixture
+def reference_tree(new_site_root, timed):
+    return timed('build', 'reference', reference_build, new_site_root())
+
+def test_builds_expected_nodes(random_site, reference_tree):
+    assert sorted(reference_tree) == \
+           sorted(random_site.index_filename(path) for _, path in random_site.nodes())
+
+@pytest.mark.parametrize('args', [[], ['--io=async']], ids=['fast', 'async'])
+def test_fast_build_matches_reference(random_site, new_site_root, reference_tree, timed, args):
+    case = 'fast' if not args else args[0][2:]
+    assert timed('build', case, build_tree, new_site_root(), random_site.root['name'],
+                 *args) == reference_tree
+
+@pytest.mark.parametrize('backend', YamlBackend.available_names())
+def test_yaml_backends_match_reference(random_site, new_site_root, reference_tree, timed,
+                                       monkeypatch, backend):
+    monkeypatch.setattr(YamlBackend, 'default_backend', YamlBackend(backend))
+    assert timed('build', 'yaml-' + backend, build_tree, new_site_root(),
+                 random_site.root['name']) == reference_tree
+
+def test_memory_output_matches_reference(random_site, new_site_root, reference_tree, timed):
+    command = Build(command_args=['--output-format=memory'],
+                    global_args={'--verbose': False, '--root': new_site_root()})
+    timed('build', 'memory', command.execute)
+    files = {os.path.relpath(path, random_site.root['name']): content.encode('utf-8')
+             for path, content in command.writer.files.items()}
+    assert files == reference_tree
+
+def test_fragment_cache_matches_reference(random_site, new_site_root, reference_tree, timed):
+    site_root = new_site_root()
+    build_tree(site_root, random_site.root['name'], '--cache=.cache')
+    assert timed('build', 'fragment-cache', build_tree, site_root, random_site.root['name'],
+                 '--cache=.cache') == reference_tree
+
+def test_sharded_build_matches_reference(random_site, new_site_root, reference_tree, timed):
+    site_root = new_site_root()
+    def sharded_build():
+        run_command(Build, site_root, '--plan', '--shards=3')
+        for shard_index in range(1, 4):
+            run_command(Build, site_root, '--shard={}/3'.format(shard_index))
+        return build_tree(site_root, random_site.root['name'], '--merge')
+    assert timed('build', 'sharded', sharded_build) == reference_tree
+
+def test_subtree_build_matches_reference(random_site, new_site_root, reference_tree, timed):
+    node, path = max(random_site.nodes(), key=lambda node_path: len(node_path[0]['children']))
+    site_root = new_site_root()
+    # the parent directory of a built subtree must exist
+    build_tree(site_root, random_site.root['name'])
+    shutil.rmtree(os.path.join(site_root, path))
+    timed('build', 'subtree', run_command, Build, site_root, '-f', '--subtree=' + node['id'])
+    assert read_tree(os.path.join(site_root, path)) == \
+           {os.path.normpath(os.path.join(os.path.relpath(subtree_path, path), 'index.md')):
+            reference_tree[random_site.index_filename(subtree_path)]
+            for _, subtree_path in random_site.nodes(node, os.path.dirname(path))}
+
+def test_lazy_renderer_matches_reference(random_site, new_site_root, reference_tree, timed):
+    renderer = LazyRenderer(new_site_root())
+    def render_all():
+        return {random_site.index_filename(path): renderer.render('/' + path).encode('utf-8')
+                for _, path in random_site.nodes()}
+    assert timed('build', 'lazy', render_all) == reference_tree
+    assert timed('build', 'lazy-memoized', render_all) == reference_tree
+    assert renderer.hits == renderer.misses
+
+def test_titles_match_reference(random_site, new_site_root, timed):
+    expected = timed('build-titles', 'reference', reference_build, new_site_root(),
+                     titles=True)
+    assert timed('build-titles', 'fast', build_tree, new_site_root(),
+                 random_site.root['name'], '--titles') == expected
+
+def test_no_stop_matches_reference(random_site, new_site_root, timed):
+    expected = timed('build-no-stop', 'reference', reference_build, new_site_root(),
+                     no_stop=True)
+    assert sorted(expected) == \
+           sorted(random_site.index_filename(path)
+                  for _, path in random_site.nodes(no_stop=True))
+    assert timed('build-no-stop', 'fast', build_tree, new_site_root(),
+                 random_site.root['name'], '--no-stop') == expected
+
+def test_incremental_build_matches_reference(random_site, new_site_root, timed):
+    site_root = new_site_root()
+    build_tree(site_root, random_site.root['name'], '--cache=.cache')
+    random_site.mutate()
+    random_site.write_tree_config(site_root)
+    for node_id, contents in random_site.metadata.items():
+        with open(os.path.join(site_root, 'config', 'metadata', node_id + '.yml'), 'w',
+                  encoding='utf-8') as metadata_file:
+            metadata_file.write(contents)
+    expected = timed('rebuild', 'reference', reference_build, new_site_root())
+    output = timed('rebuild', 'incremental', run_command, Build, site_root, '--incremental',
+                   '--cache=.cache')
+    assert 'Incremental build:' in output
+    assert read_tree(os.path.join(site_root, random_site.root['name'])) == expected
@@ -0,0 +1,37 @@
+"""Differential tests of the fast paths parsing and validating the navigation tree"""
+
+import os
+from handbook_tools.commands.lint import Lint
+from handbook_tools.lib.navigation_tree import NavigationTree
+from handbook_tools.lib.navigation_tree_node import NavigationTreeNode
+from tests.differential.harness import run_command
+from tests.differential.reference_engine import ReferenceNode
+
+def test_node_fast_path_matches_general_path(random_site, timed):
+    node_strings = []
+    for node, _ in random_site.nodes(no_stop=True):
+        node_strings += [node['name'], ' {} '.format(node['name'])]
+        if node['explicit_id'] is not None:
+            node_strings.append('{} @id={}'.format(node['name'], node['explicit_id']))
+    def parse(node_class):
+        return [(node.name, node.tags, node.options, node.default_id)
+                for node in map(node_class, node_strings)]
+    expected = timed('node', 'reference', parse, ReferenceNode)
+    assert timed('node', 'fast', parse, NavigationTreeNode) == expected
+
+def test_generated_tree_is_valid(new_site_root, timed):
+    site_root = new_site_root()
+    assert timed('lint', 'lint', run_command, Lint, site_root) == ''
+    assert timed('lint', 'lint-no-stop', run_command, Lint, site_root, '--no-stop') == ''
+
+def test_id_index_matches_paths(random_site, new_site_root, timed):
+    site_root = new_site_root()
+    navigation_tree = NavigationTree(site_root)
+    nodes = list(random_site.nodes())
+    by_paths = timed('find-node', 'reference', lambda: [navigation_tree.find_subtree(path)
+                                                        for _, path in nodes])
+    by_ids = timed('find-node', 'id-index', lambda: [navigation_tree.find_subtree(node['id'])
+                                                     for node, _ in nodes])
+    assert by_ids == by_paths
+    assert [navigation_tree.subtree_path(subtree) for subtree in by_paths] == \
+           [os.path.join(site_root, path) for _, path in nodes]
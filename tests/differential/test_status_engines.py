@@ -0,0 +1,42 @@
+"""Differential tests of the optimized code paths of the 'status' sub-command"""
+
+import os
+import pytest
+from handbook_tools.commands.status import Status
+from tests.differential.harness import run_command
+
+@pytest.mark.parametrize('args', [[], ['--stats']], ids=['plain', 'stats'])
+def test_cached_status_matches_reference(random_site, new_site_root, timed, args):
+    site_root = new_site_root()
+    group = 'status-' + ('stats' if args else 'plain')
+    expected = timed(group, 'reference', run_command, Status, site_root, *args)
+    run_command(Status, site_root, '--cache=.cache', '--snapshot=.snapshot', *args)
+    assert timed(group, 'cache', run_command, Status, site_root, '--cache=.cache',
+                 *args) == expected
+    assert timed(group, 'snapshot', run_command, Status, site_root, '--snapshot=.snapshot',
+                 *args) == expected
+
+@pytest.mark.parametrize('with_hashes', [False, True], ids=['stamps', 'hashes'])
+def test_changes_since_snapshot_match_model(random_site, new_site_root, timed, with_hashes):
+    site_root = new_site_root()
+    run_command(Status, site_root, '--snapshot=.snapshot', *(['--hash'] if with_hashes else []))
+    guides = ['/Guides/{}.md'.format(guide) for guide in random_site.guides]
+    topics = ['/Topics/{}.md'.format(topic) for topic in random_site.topics]
+    os.remove(site_root + guides[0])
+    with open(site_root + guides[1], 'a', encoding='utf-8') as guide_file:
+        guide_file.write('Modified.\n')
+    # touched without changing its contents, so only modified when not hashed
+    stat = os.stat(site_root + topics[0])
+    os.utime(site_root + topics[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    added = '/Topics/Ω new/Ünïcode topic.md'
+    os.makedirs(os.path.dirname(site_root + added))
+    with open(site_root + added, 'w', encoding='utf-8') as topic_file:
+        topic_file.write('# New\n')
+
+    expected = ['  - Added: {}  '.format(added), '  - Removed: {}  '.format(guides[0])]
+    expected += ['  - Modified: {}  '.format(path) for path in
+                 sorted([guides[1]] + ([] if with_hashes else [topics[0]]))]
+    output = timed('status-since', 'hashes' if with_hashes else 'stamps', run_command, Status,
+                   site_root, '--since=.snapshot')
+    changes = output.split('## Changes Since .snapshot\n\n')[1].split('\n\n\n')[0]
+    assert changes.splitlines() == expected
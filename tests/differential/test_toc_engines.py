@@ -0,0 +1,27 @@
+"""Differential tests of the 'toc' sub-command against the reference and the site model"""
+
+import random
+import pytest
+from handbook_tools.commands.toc import Toc
+from tests.differential.harness import run_command
+from tests.differential.reference_engine import ReferenceEngine
+
+@pytest.mark.parametrize('max_depth, no_stop', [(8, False), (3, False), (8, True), (2, True)])
+def test_toc_matches_reference_and_model(random_site, new_site_root, timed, max_depth, no_stop):
+    expected = random_site.toc(max_depth, no_stop)
+    args = ['--depth={}'.format(max_depth)] + (['--no-stop'] if no_stop else [])
+    site_root = new_site_root()
+    assert timed('toc', 'reference', lambda: ReferenceEngine(site_root, no_stop).toc(max_depth)) \
+           == expected
+    assert timed('toc', 'fast', run_command, Toc, site_root, *args) == expected
+    assert timed('toc', 'warm', run_command, Toc, site_root, *args) == expected
+
+def test_subtree_toc_matches_model(random_site, new_site_root, timed):
+    site_root = new_site_root()
+    subtrees = random.Random(0).sample(list(random_site.nodes()), 5)
+    for node, path in subtrees:
+        expected = random_site.toc(subtree=(node, path))
+        assert timed('toc', 'subtree-id', run_command, Toc, site_root,
+                     '--subtree=' + node['id']) == expected
+        assert timed('toc', 'subtree-path', run_command, Toc, site_root,
+                     '--subtree=' + path) == expected
@@ -0,0 +1,48 @@
+"""Tests of the AsyncFileWriter class"""
+
+import os
+import pytest
+from handbook_tools.lib.async_file_writer import AsyncFileWriter
+
+def test_writes_nested_directories_and_files(tmp_path):
+    writer = AsyncFileWriter(str(tmp_path), max_workers=4, max_pending=2)
+    for depth in range(1, 20):
+        path = os.path.join(*['d{}'.format(i) for i in range(depth)])
+        writer.make_dir(path)
+        writer.write_file(os.path.join(path, 'index.md'), path)
+    writer.close()
+
+    for depth in range(1, 20):
+        path = os.path.join(*['d{}'.format(i) for i in range(depth)])
+        assert (tmp_path / path / 'index.md').read_text() == path
+
+def test_reports_errors_in_request_order(tmp_path, capsys):
+    writer = AsyncFileWriter(str(tmp_path))
+    writer.write_file(os.path.join('missing-a', 'index.md'), '')
+    writer.write_file(os.path.join('missing-b', 'index.md'), '')
+    writer.close()
+
+    out, err = capsys.readouterr()
+    assert out.count('Error: Operation failed') == 2
+    assert out.index('missing-a') < out.index('missing-b')
+
+def test_batches_directory_creations_by_tree_level(tmp_path, monkeypatch):
+    batch_sizes = []
+    make_dirs_sync = AsyncFileWriter._make_dirs_sync
+    def recording_make_dirs_sync(dirs):
+        batch_sizes.append(len(dirs))
+        return make_dirs_sync(dirs)
+    monkeypatch.setattr(AsyncFileWriter, '_make_dirs_sync', staticmethod(recording_make_dirs_sync))
+
+    writer = AsyncFileWriter(str(tmp_path))
+    for parent in ['a', 'b', 'c']:
+        writer.make_dir(parent)
+        writer.write_file(os.path.join(parent, 'index.md'), parent)
+        for child in ['x', 'y']:
+            path = os.path.join(parent, child)
+            writer.make_dir(path)
+            writer.write_file(os.path.join(path, 'index.md'), path)
+    writer.close()
+
+    assert batch_sizes == [3, 6]
+    assert (tmp_path / 'c' / 'y' / 'index.md').read_text() == os.path.join('c', 'y')
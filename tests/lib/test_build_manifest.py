@@ -0,0 +1,39 @@
+"""Tests of the BuildManifest class"""
+
+import os
+from handbook_tools.lib.build_manifest import BuildManifest
+
+def make_nodes(fan_out, depth, path='Handbook'):
+    nodes = [path]
+    if depth > 0:
+        for child_index in range(fan_out):
+            nodes += make_nodes(fan_out, depth - 1, os.path.join(path, str(child_index)))
+    return nodes
+
+def test_plans_balanced_shards_covering_all_nodes(tmp_path):
+    nodes = make_nodes(5, 3)
+    manifest = BuildManifest(str(tmp_path / 'manifest.json'))
+    manifest.plan(nodes, 4, 'signature')
+
+    shard_sizes = [len(shard['nodes']) for shard in manifest.shards]
+    # shards differ by less than the size of the largest unit
+    assert max(shard_sizes) - min(shard_sizes) <= len(nodes) // (4 * BuildManifest.unit_fraction)
+    assert sorted(path for shard in manifest.shards for path in shard['nodes']) == sorted(nodes)
+    # nodes of each shard are in pre-order
+    for shard in manifest.shards:
+        assert shard['nodes'] == [path for path in nodes if path in shard['nodes']]
+
+    manifest.save()
+    loaded_manifest = BuildManifest(manifest.manifest_filename)
+    assert loaded_manifest.load()
+    assert (loaded_manifest.signature, loaded_manifest.shards) == ('signature', manifest.shards)
+
+def test_plans_more_shards_than_nodes(tmp_path):
+    manifest = BuildManifest(str(tmp_path / 'manifest.json'))
+    manifest.plan(['Handbook', 'Handbook/A'], 3, 'signature')
+    assert [shard['nodes'] for shard in manifest.shards] == [['Handbook'], ['Handbook/A'], []]
+
+def test_plans_empty_shards_without_nodes(tmp_path):
+    manifest = BuildManifest(str(tmp_path / 'manifest.json'))
+    manifest.plan([], 2, 'signature')
+    assert manifest.shards == [{'units': [], 'nodes': []}, {'units': [], 'nodes': []}]
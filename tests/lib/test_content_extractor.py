@@ -0,0 +1,64 @@
+"""Tests of the ContentExtractor class"""
+
+import pytest
+from handbook_tools.lib.content_extractor import ContentExtractor
+
+@pytest.fixture
+def markdown_file(tmp_path):
+    markdown_file = tmp_path / 'guide.md'
+    markdown_file.write_text('Some intro\n\n## First Heading ##\n\nOne two three.\n# Second\n')
+    return str(markdown_file)
+
+def test_extracts_first_heading_and_words_count(markdown_file):
+    contents = ContentExtractor().extract(markdown_file, count_words=True)
+    assert contents['title'] == 'First Heading'
+    assert contents['words'] == 11
+
+def test_prefers_front_matter_title(tmp_path):
+    markdown_file = tmp_path / 'guide.md'
+    markdown_file.write_text('---\ntitle: Front Title\ntags: [a, b]\n---\n# Heading\nwords\n')
+    contents = ContentExtractor().extract(str(markdown_file), count_words=True)
+    assert contents['title'] == 'Front Title'
+    assert contents['front_matter']['tags'] == ['a', 'b']
+    assert contents['words'] == 3
+
+def test_reads_front_matter_with_crlf_line_endings(tmp_path):
+    markdown_file = tmp_path / 'guide.md'
+    markdown_file.write_bytes(b'---\r\ntitle: Front Title\r\n---\r\n# Heading\r\nwords\r\n')
+    contents = ContentExtractor().extract(str(markdown_file), count_words=True)
+    assert contents['title'] == 'Front Title'
+    assert contents['words'] == 3
+
+def test_counts_words_of_memory_mapped_files(markdown_file):
+    extractor = ContentExtractor()
+    extractor.mmap_threshold = 0
+    assert extractor.extract(markdown_file, count_words=True)['words'] == 11
+
+def test_reuses_persisted_contents_of_unchanged_files(markdown_file, tmp_path):
+    cache_filename = str(tmp_path / 'content.json')
+    extractor = ContentExtractor(cache_filename)
+    extractor.extract_many([markdown_file])
+    extractor.save()
+
+    extractor = ContentExtractor(cache_filename)
+    extractor._read = None
+    assert extractor.extract(markdown_file)['title'] == 'First Heading'
+
+def test_persists_front_matter_dates(tmp_path):
+    markdown_file = tmp_path / 'guide.md'
+    markdown_file.write_text('---\ndate: 2020-01-01\n---\n# Heading\n')
+    cache_filename = str(tmp_path / 'content.json')
+    extractor = ContentExtractor(cache_filename)
+    extractor.extract(str(markdown_file))
+    extractor.save()
+    assert not (tmp_path / 'content.json.tmp').exists()
+
+    extractor = ContentExtractor(cache_filename)
+    assert extractor.extract(str(markdown_file))['front_matter'] == {'date': '2020-01-01'}
+
+def test_does_not_take_comments_of_yaml_files_as_titles(tmp_path):
+    yaml_file = tmp_path / 'node.yml'
+    yaml_file.write_text('# comment\nintro: Some intro\n')
+    contents = ContentExtractor().extract(str(yaml_file), count_words=True)
+    assert contents['title'] is None
+    assert contents['words'] == 5
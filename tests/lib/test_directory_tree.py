@@ -0,0 +1,40 @@
+"""Tests of the DirectoryTree class"""
+
+import os
+import pytest
+from handbook_tools.lib.directory_tree import DirectoryTree
+
+@pytest.fixture
+def site_root(tmp_path):
+    for path in ['b/d', 'a', 'c']:
+        os.makedirs(str(tmp_path / 'site' / path))
+    for filename in ['b/z.md', 'b/a.md', 'b/d/x.md', 'a/y.md']:
+        (tmp_path / 'site' / filename).write_text('')
+    return str(tmp_path / 'site')
+
+def scan(directory_tree, site_root):
+    visited = []
+    directory_tree.scan(site_root, 'group',
+                        lambda path, _, file_list: visited.append((path, file_list)))
+    return [(os.path.relpath(path, site_root), file_list) for path, file_list in visited]
+
+def test_scans_in_sorted_order(site_root):
+    assert scan(DirectoryTree(site_root), site_root) == [
+        ('.', ['a', 'b', 'c']), ('a', ['y.md']), ('b', ['a.md', 'd', 'z.md']),
+        (os.path.join('b', 'd'), ['x.md']), ('c', [])]
+
+def test_reuses_snapshot_of_unchanged_directories(site_root, tmp_path, monkeypatch):
+    snapshot_filename = str(tmp_path / 'listing.json')
+    directory_tree = DirectoryTree(site_root, snapshot_filename)
+    directory_tree.racy_period = -60
+    expected = scan(directory_tree, site_root)
+    directory_tree.save_snapshot()
+
+    listed_paths = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: listed_paths.append(path) or scandir(path))
+    (tmp_path / 'site' / 'c' / 'new.md').write_text('')
+    directory_tree = DirectoryTree(site_root, snapshot_filename)
+    assert scan(directory_tree, site_root) == expected[:-1] + [('c', ['new.md'])]
+    assert listed_paths == [os.path.join(site_root, 'c')]
+    assert directory_tree.is_dir(os.path.join(site_root, 'b'), 'd')
@@ -0,0 +1,43 @@
+"""Tests of the FastTemplate class"""
+
+import pytest
+from jinja2 import Template
+from handbook_tools.lib.fast_template import FastTemplate
+
+NAVIGATION_TEMPLATE_FILENAME = 'tests/fixtures/site/config/templates/navigation-file-template.j2'
+
+@pytest.mark.parametrize('context', [
+    {'title': 'Git', 'intro': 'About Git.\n', 'contents': ['[A](/A)', '[B](/B)'],
+     'guides': ['[Guide](/Guides/Guide)'], 'topics': ['[Topic](/Topics/Topic)']},
+    {'title': 'Empty', 'intro': [], 'contents': [], 'guides': [], 'topics': []},
+    {'title': None, 'contents': ['only contents']},
+    {}])
+def test_renders_navigation_template_identical_to_jinja(context):
+    with open(NAVIGATION_TEMPLATE_FILENAME) as template_file:
+        source = template_file.read()
+    fast_template = FastTemplate(source)
+    assert fast_template.is_compiled
+    assert fast_template.render(**context) == Template(source).render(**context)
+
+@pytest.mark.parametrize('source', [
+    '{% if a %}1{% elif b is undefined %}2{% else %}3{% endif %}\n',
+    '{% for a in b %}{% for a in a %}{{a}} {% endfor %}{{a}}\n{% endfor %}{{a}}',
+    '{% if not c or a and b %}{{ "const" }}{{ 7 }}{% endif %}\n\n',
+    '{% for x in missing %}never{% endfor %}{{ missing }}'])
+def test_compiles_simple_templates(source):
+    fast_template = FastTemplate(source)
+    context = {'a': 0, 'b': [[1, 2], [3]], 'c': 'c'}
+    assert fast_template.is_compiled
+    assert fast_template.render(**context) == Template(source).render(**context)
+
+@pytest.mark.parametrize('source', [
+    '{{ title|upper }}',
+    '{% for c in contents %}{{ loop.index }}{% endfor %}',
+    '{% for c in contents %}{{ c }}{% else %}none{% endfor %}',
+    '{% set x = 1 %}{{ x }}',
+    '{{ item.name }}'])
+def test_falls_back_to_jinja(source):
+    fast_template = FastTemplate(source)
+    context = {'title': 'title', 'contents': ['a', 'b'], 'item': {'name': 'name'}}
+    assert not fast_template.is_compiled
+    assert fast_template.render(**context) == Template(source).render(**context)
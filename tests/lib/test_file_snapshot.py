@@ -0,0 +1,48 @@
+"""Tests of the FileSnapshot class"""
+
+import os
+from handbook_tools.lib.file_snapshot import FileSnapshot
+
+def write_file(filename, content):
+    with open(filename, 'w') as written_file:
+        written_file.write(content)
+
+def test_saves_and_loads_snapshot(tmp_path):
+    write_file(str(tmp_path / 'guide.md'), '# Guide\n')
+    snapshot = FileSnapshot(with_hashes=True)
+    snapshot.add_dir('Guides', 123, [('guide.md', False), ('Git', True)])
+    snapshot.add_file('Guides/guide.md', str(tmp_path / 'guide.md'))
+    snapshot_filename = str(tmp_path / 'status.snapshot')
+    snapshot.save(snapshot_filename)
+
+    loaded_snapshot = FileSnapshot.load(snapshot_filename)
+    assert loaded_snapshot.with_hashes
+    assert loaded_snapshot.dirs == snapshot.dirs
+    assert loaded_snapshot.files == snapshot.files
+
+def test_does_not_trust_recently_modified_directories(tmp_path):
+    snapshot = FileSnapshot()
+    snapshot.add_dir('Guides', os.stat(str(tmp_path)).st_mtime_ns, [])
+    snapshot.save(str(tmp_path / 'status.snapshot'))
+    assert FileSnapshot.load(str(tmp_path / 'status.snapshot')).dirs['Guides'][0] == -1
+
+def test_loads_invalid_snapshot_as_none(tmp_path):
+    write_file(str(tmp_path / 'status.snapshot'), 'not a snapshot')
+    assert FileSnapshot.load(str(tmp_path / 'status.snapshot')) is None
+    assert FileSnapshot.load(str(tmp_path / 'missing.snapshot')) is None
+
+def test_diff_ignores_touched_files_with_hashes(tmp_path):
+    filename = str(tmp_path / 'guide.md')
+    write_file(filename, '# Guide\n')
+    old_snapshot = FileSnapshot(with_hashes=True)
+    old_snapshot.add_file('guide.md', filename)
+
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    new_snapshot = FileSnapshot(with_hashes=True)
+    new_snapshot.add_file('guide.md', filename, old_snapshot)
+    assert old_snapshot.diff(new_snapshot) == ([], [], [])
+
+    unhashed_snapshot = FileSnapshot()
+    unhashed_snapshot.add_file('guide.md', filename)
+    assert old_snapshot.diff(unhashed_snapshot) == ([], [], ['guide.md'])
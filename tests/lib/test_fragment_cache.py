@@ -0,0 +1,30 @@
+"""Tests of the FragmentCache class"""
+
+import pytest
+from handbook_tools.lib.fragment_cache import FragmentCache
+
+def render(*items):
+    return ['[{}]'.format(item) for item in items]
+
+def test_hits_on_same_inputs_across_instances(tmp_path):
+    cache_filename = str(tmp_path / 'fragments.json')
+    cache = FragmentCache(cache_filename)
+    assert cache.render('render', ['a', 'b'], render) == ['[a]', '[b]']
+    cache.save()
+
+    cache = FragmentCache(cache_filename)
+    assert cache.render('render', ['a', 'b'], render) == ['[a]', '[b]']
+    assert cache.render('render', ['a', 'c'], render) == ['[a]', '[c]']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_evicts_least_recently_used_fragments(tmp_path):
+    cache = FragmentCache(str(tmp_path / 'fragments.json'), max_size=20)
+    cache.render('render', ['a'], render)
+    cache.render('render', ['b'], render)
+    cache.render('render', ['a'], render)
+    cache.render('render', ['c'], render)
+    assert cache.size <= 20
+
+    cache.render('render', ['a'], render)
+    cache.render('render', ['b'], render)
+    assert (cache.hits, cache.misses) == (2, 4)
@@ -0,0 +1,70 @@
+"""Tests of the HandbookServer and HandbookClient classes"""
+
+import os
+import shutil
+import threading
+import pytest
+from subprocess import Popen, PIPE
+from handbook_tools.lib.handbook_server import HandbookServer
+from handbook_tools.lib.handbook_client import HandbookClient
+
+@pytest.fixture
+def site_root(tmp_path):
+    site_root = str(tmp_path / 'site')
+    shutil.copytree('tests/fixtures/site', site_root)
+    return site_root
+
+@pytest.fixture
+def client(site_root):
+    server = HandbookServer(site_root, HandbookClient.socket_full_filename(site_root))
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.start()
+    yield HandbookClient(site_root)
+    server.shutdown()
+    server_thread.join()
+    server.close()
+
+def test_answers_toc_and_status_requests(client):
+    assert client.is_available()
+    response = client.request({'command': 'toc', 'args': ['--depth=1']})
+    assert response == {'ok': True, 'output': '# Table of Contents\n\n'
+                                              '- 1 [Development](/Handbook/Development)\n'
+                                              '- 2 [Coding](/Handbook/Coding)\n'}
+    response = client.request({'command': 'status', 'args': []})
+    assert response['ok'] and '## Guides Files' in response['output']
+
+def test_renders_node_and_reloads_changed_metadata(client, site_root):
+    index_filename = os.path.join(site_root, 'Handbook', 'Coding', 'Code Quality',
+                                  'Clean Code and Code Smells', 'Clean Design', 'index.md')
+    with open(index_filename) as index_file:
+        expected = index_file.read()
+    assert client.request({'command': 'render', 'node': 'clean-design'}) == \
+           {'ok': True, 'output': expected}
+
+    with open(os.path.join(site_root, 'config', 'metadata', 'clean-design.yml'), 'a') as metadata:
+        metadata.write('\ntopics:\n  - Technical Debt\n')
+    response = client.request({'command': 'render',
+                               'node': '/Handbook/Coding/Code Quality/Clean Code and Code Smells/'
+                                       'Clean Design'})
+    assert '- [Technical Debt](/Topics/Technical%20Debt)' in response['output']
+
+def test_reports_errors(client):
+    assert not client.request({'command': 'render', 'node': 'no-such-node'})['ok']
+    assert not client.request({'command': 'unknown'})['ok']
+    assert not client.request({'command': 'toc', 'args': ['--no-such-option']})['ok']
+
+def test_dispatcher_forwards_to_daemon(client, site_root):
+    output = Popen(['handbook_tools/handbook.py', '--root=' + site_root, 'toc', '--depth=1'],
+                   stdout=PIPE).communicate()[0]
+    local_output = Popen(['handbook_tools/handbook.py', '--root=' + site_root, '--no-daemon',
+                          'toc', '--depth=1'], stdout=PIPE).communicate()[0]
+    assert output == local_output
+    assert b'- 1 [Development](/Handbook/Development)' in output
+
+def test_ignores_clients_disconnecting_early(client, capsys):
+    client._connect().close()
+    client_socket = client._connect()
+    client_socket.sendall(b'{"command": "ping"}\n')
+    client_socket.close()
+    assert client.request({'command': 'ping'}) == {'ok': True, 'output': ''}
+    assert 'Traceback' not in capsys.readouterr().err
@@ -0,0 +1,45 @@
+"""Tests of the LazyRenderer class"""
+
+import os
+import shutil
+import pytest
+from handbook_tools.lib.lazy_renderer import LazyRenderer
+
+@pytest.fixture
+def site_root(tmp_path):
+    site_root = str(tmp_path / 'site')
+    shutil.copytree('tests/fixtures/site', site_root)
+    return site_root
+
+def read_index_file(site_root, *names):
+    with open(os.path.join(site_root, *names, 'index.md')) as index_file:
+        return index_file.read()
+
+@pytest.mark.parametrize('key', ['', '/', 'Handbook', '/Handbook/index.md'])
+def test_renders_root_node_like_build(site_root, key):
+    renderer = LazyRenderer(site_root)
+    assert renderer.render(key) == read_index_file(site_root, 'Handbook')
+
+def test_memoizes_until_dependencies_change(site_root):
+    renderer = LazyRenderer(site_root)
+    url_path = '/Handbook/Coding/Code%20Quality/Clean%20Code%20and%20Code%20Smells/Clean%20Design/'
+    expected = read_index_file(site_root, 'Handbook', 'Coding', 'Code Quality',
+                               'Clean Code and Code Smells', 'Clean Design')
+    assert renderer.render(url_path) == expected
+    assert renderer.render('clean-design') == expected
+    assert (renderer.hits, renderer.misses) == (1, 1)
+
+    with open(os.path.join(site_root, 'config', 'metadata', 'clean-design.yml'), 'a') as metadata:
+        metadata.write('\ntopics:\n  - Technical Debt\n')
+    assert '- [Technical Debt](/Topics/Technical%20Debt)' in renderer.render('clean-design')
+    assert (renderer.hits, renderer.misses) == (1, 2)
+
+    with open(os.path.join(site_root, 'config', 'navigation', 'root.yml'), 'a') as tree_config:
+        tree_config.write('  - Extra Node\n')
+    assert '- [Extra Node](/Handbook/Extra%20Node)' in renderer.render('Handbook')
+    assert renderer.render('Handbook/Extra Node') is not None
+
+def test_returns_none_for_unknown_nodes(site_root):
+    renderer = LazyRenderer(site_root)
+    assert renderer.render('no-such-node') is None
+    assert renderer.render('/Handbook/No Such Node') is None
@@ -22,3 +22,20 @@ def test_raises_exception_on_non_existing_configuration_file(navigation_tree):
     with pytest.raises(SystemExit):
         navigation_tree.load_tree_config_file(existing_navigation_path,
                                               non_existing_tree_config_filename)
+
+@pytest.mark.parametrize('key', ['git', 'Handbook/Development/Code Development Lifecycle/'
+                                        'Version Control/Git'])
+def test_finds_subtree_by_id_or_path(navigation_tree, key):
+    subtree = navigation_tree.find_subtree(key)
+    assert navigation_tree.subtree_path(subtree) == \
+           'tests/fixtures/site/Handbook/Development/Code Development Lifecycle/' \
+           'Version Control/Git'
+
+    visited_paths = []
+    navigation_tree.scan(lambda root_path, *_: visited_paths.append(root_path), subtree)
+    assert visited_paths == [navigation_tree.subtree_path(subtree)]
+
+@pytest.mark.parametrize('key', ['no-such-node', 'tfs', 'Handbook/Development/Code Development '
+                                                        'Lifecycle/Version Control/TFS'])
+def test_does_not_find_subtree_of_unknown_or_stopped_node(navigation_tree, key):
+    assert navigation_tree.find_subtree(key) is None
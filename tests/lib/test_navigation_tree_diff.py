@@ -0,0 +1,48 @@
+"""Tests of the NavigationTreeDiff class"""
+
+import os
+from collections import OrderedDict
+import pytest
+from handbook_tools.lib.navigation_tree_diff import NavigationTreeDiff
+
+def nodes(*items):
+    """Compile (path, id, signature) items, using '/' as the path separator"""
+    return OrderedDict((path.replace('/', os.sep), {'id': node_id, 'signature': signature})
+                       for path, node_id, signature in items)
+
+def changes(diff):
+    return [(action, path.replace(os.sep, '/'), target and target.replace(os.sep, '/'))
+            for action, path, target in diff.changes]
+
+OLD = nodes(('R', 'r', 'r0'), ('R/A', 'a', 'a0'), ('R/A/X', 'x', 'x0'), ('R/B', 'b', 'b0'))
+
+def test_unchanged_tree_has_no_changes():
+    diff = NavigationTreeDiff(OLD, OLD)
+    assert (diff.changes, diff.renders, diff.conflict) == ([], [], False)
+
+def test_renames_top_most_directory_of_renamed_node():
+    new = nodes(('R', 'r', 'r1'), ('R/A2', 'a', 'a1'), ('R/A2/X', 'x', 'x1'), ('R/B', 'b', 'b0'))
+    diff = NavigationTreeDiff(OLD, new)
+    assert changes(diff) == [('rename', 'R/A', 'R/A2')]
+    assert len(diff.renders) == 3
+
+def test_moves_node_under_another_parent():
+    new = nodes(('R', 'r', 'r0'), ('R/A', 'a', 'a1'), ('R/B', 'b', 'b1'), ('R/B/X', 'x', 'x1'))
+    diff = NavigationTreeDiff(OLD, new)
+    assert changes(diff) == [('rename', 'R/A/X', 'R/B/X')]
+
+def test_deletes_subtree_of_stopped_node_and_creates_new_nodes():
+    new = nodes(('R', 'r', 'r0'), ('R/A', 'a', 'a1'), ('R/B', 'b', 'b1'), ('R/B/Y', 'y', 'y0'))
+    diff = NavigationTreeDiff(OLD, new)
+    assert changes(diff) == [('create', 'R/B/Y', None), ('delete', 'R/A/X', None)]
+
+def test_reuses_directory_of_node_with_changed_id():
+    new = nodes(('R', 'r', 'r0'), ('R/A', 'a2', 'a1'), ('R/A/X', 'x', 'x0'), ('R/B', 'b', 'b0'))
+    diff = NavigationTreeDiff(OLD, new)
+    assert (changes(diff), diff.renders) == ([], [os.path.join('R', 'A')])
+
+def test_reports_conflict_on_clobbered_directory():
+    new = nodes(('R', 'r', 'r0'), ('R/D', 'a', 'a1'), ('R/D/X', 'z', 'z0'), ('R/B', 'b', 'b1'),
+                ('R/B/X', 'x', 'x1'))
+    diff = NavigationTreeDiff(OLD, new)
+    assert diff.conflict
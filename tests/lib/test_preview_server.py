@@ -0,0 +1,44 @@
+"""Tests of the PreviewServer class"""
+
+import os
+import shutil
+import threading
+import pytest
+from urllib.request import urlopen
+from urllib.error import HTTPError
+from handbook_tools.lib.preview_server import PreviewServer
+
+@pytest.fixture
+def site_root(tmp_path):
+    site_root = str(tmp_path / 'site')
+    shutil.copytree('tests/fixtures/site', site_root)
+    return site_root
+
+@pytest.fixture
+def base_url(site_root):
+    server = PreviewServer(site_root, ('127.0.0.1', 0))
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.start()
+    yield 'http://{}:{}'.format(*server.address)
+    server.shutdown()
+    server_thread.join()
+    server.close()
+
+def test_serves_navigation_and_authored_files(site_root, base_url):
+    with open(os.path.join(site_root, 'Handbook', 'Development', 'index.md')) as index_file:
+        expected = index_file.read()
+    with urlopen(base_url + '/Handbook/Development') as response:
+        assert response.headers['Content-Type'].startswith('text/markdown')
+        assert response.read().decode('utf-8') == expected
+
+    with open(os.path.join(site_root, 'Guides', 'index.md')) as index_file:
+        expected = index_file.read()
+    with urlopen(base_url + '/Guides') as response:
+        assert response.read().decode('utf-8') == expected
+
+@pytest.mark.parametrize('path', ['/Handbook/No%20Such%20Node', '/config/navigation/root.yml',
+                                  '/Guides/../config/navigation/root.yml'])
+def test_answers_not_found(base_url, path):
+    with pytest.raises(HTTPError) as error:
+        urlopen(base_url + path)
+    assert error.value.code == 404
@@ -0,0 +1,44 @@
+"""Tests of the RunMetrics class"""
+
+import os
+import json
+from handbook_tools.lib.run_metrics import RunMetrics
+
+def test_collects_nothing_when_disabled():
+    metrics = RunMetrics('build')
+    metrics.count('nodes_visited')
+    with metrics.phase('build'):
+        pass
+    metrics.save()
+    assert not metrics.counters and not metrics.phases
+
+def test_writes_json_metrics(tmp_path):
+    metrics_filename = str(tmp_path / 'metrics.json')
+    metrics = RunMetrics('build', metrics_filename)
+    metrics.count('nodes_visited')
+    metrics.count('nodes_visited', 2)
+    with metrics.phase('build'):
+        pass
+    metrics.save()
+
+    with open(metrics_filename) as metrics_file:
+        written_metrics = json.load(metrics_file)
+    assert written_metrics['command'] == 'build'
+    assert written_metrics['counters'] == {'nodes_visited': 3}
+    assert set(written_metrics['phases']['build']) == {'wall_seconds', 'cpu_seconds'}
+
+def test_writes_prometheus_metrics(tmp_path):
+    metrics_filename = str(tmp_path / 'metrics.prom')
+    metrics = RunMetrics('toc', metrics_filename, 'prometheus')
+    metrics.count('items_written', 5)
+    with metrics.phase('scan'):
+        pass
+    metrics.save()
+
+    with open(metrics_filename) as metrics_file:
+        lines = metrics_file.read().splitlines()
+    assert '# TYPE handbook_items_written_total counter' in lines
+    assert 'handbook_items_written_total{command="toc"} 5' in lines
+    assert any(line.startswith('handbook_phase_wall_seconds{command="toc",phase="scan"} ')
+               for line in lines)
+    assert not os.path.exists(metrics_filename + '.tmp')
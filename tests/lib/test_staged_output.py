@@ -0,0 +1,45 @@
+"""Tests of the StagedOutput class"""
+
+import os
+import pytest
+from handbook_tools.lib.staged_output import StagedOutput
+
+def write_file(filename, content):
+    with open(filename, 'w') as written_file:
+        written_file.write(content)
+
+@pytest.mark.parametrize('exchange_supported', [True, False])
+def test_swaps_staged_directory_in(tmp_path, monkeypatch, exchange_supported):
+    site_root = str(tmp_path)
+    os.makedirs(os.path.join(site_root, 'Handbook', 'Old'))
+    if not exchange_supported:
+        monkeypatch.setattr(StagedOutput, '_exchange', classmethod(lambda *_: False))
+
+    staged_output = StagedOutput(site_root, 'Handbook')
+    staged_output.create()
+    os.mkdir(os.path.join(staged_output.staging_root, 'Handbook'))
+    write_file(os.path.join(staged_output.staging_root, 'Handbook', 'index.md'), '# Handbook\n')
+    # the output is untouched until the commit
+    assert os.listdir(os.path.join(site_root, 'Handbook')) == ['Old']
+    staged_output.commit()
+
+    assert os.listdir(os.path.join(site_root, 'Handbook')) == ['index.md']
+    assert os.listdir(site_root) == ['Handbook']
+
+def test_removes_staging_directories_of_interrupted_builds(tmp_path):
+    site_root = str(tmp_path)
+    os.makedirs(os.path.join(site_root, StagedOutput.staging_prefix + '0', 'Handbook'))
+    staged_output = StagedOutput(site_root, 'Handbook/Coding')
+    staged_output.create()
+    assert os.listdir(site_root) == [os.path.basename(staged_output.staging_root)]
+    assert os.listdir(staged_output.staging_root) == ['Handbook']
+    staged_output.discard()
+    assert not os.listdir(site_root)
+
+def test_removes_output_when_nothing_was_staged(tmp_path):
+    site_root = str(tmp_path)
+    os.makedirs(os.path.join(site_root, 'Handbook', 'Old'))
+    staged_output = StagedOutput(site_root, 'Handbook')
+    staged_output.create()
+    staged_output.commit()
+    assert not os.listdir(site_root)
@@ -0,0 +1,35 @@
+"""Tests of the YamlBackend class"""
+
+import pytest
+from handbook_tools.lib.yaml_backend import YamlBackend
+
+ROOT_CONFIG_FILENAME = 'tests/fixtures/site/config/navigation/root.yml'
+
+@pytest.mark.parametrize('name', YamlBackend.available_names())
+def test_backends_load_identical_trees(name):
+    assert YamlBackend(name).load_file(ROOT_CONFIG_FILENAME) == \
+           YamlBackend('pyyaml').load_file(ROOT_CONFIG_FILENAME)
+
+@pytest.mark.parametrize('name', YamlBackend.available_names())
+def test_backends_do_not_construct_arbitrary_objects(name):
+    yaml_backend = YamlBackend(name)
+    with pytest.raises(yaml_backend.errors):
+        yaml_backend.load('!!python/object/apply:os.getcwd []')
+
+def test_prefers_first_available_backend():
+    available_names = YamlBackend.available_names()
+    assert YamlBackend().name == available_names[0]
+    assert 'pyyaml' in available_names
+
+def test_exits_on_unavailable_backend():
+    with pytest.raises(SystemExit):
+        YamlBackend('unknown')
+
+@pytest.mark.parametrize('name', YamlBackend.available_names())
+def test_backends_load_yaml_1_1_values(name):
+    assert YamlBackend(name).load('a: yes\nb: off\nc: 0777\n') == {'a': True, 'b': False, 'c': 511}
+
+@pytest.mark.parametrize('name', YamlBackend.available_names())
+def test_backends_load_floats_without_dot_as_strings(name, recwarn):
+    assert YamlBackend(name).load('a: 1e3\nb: 1.0e+3\n') == {'a': '1e3', 'b': 1000.0}
+    assert not recwarn.list